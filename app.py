@@ -1,5 +1,5 @@
 # app.py - CORRIGER la section des blueprints
-from flask import Flask, render_template
+from flask import Flask, render_template, current_app, request, jsonify, make_response
 from flask_login import LoginManager, current_user
 from config import Config
 from models import db, User, Comment, PFAProject, GuideStage, ProjectComment, ProjectDocument, Notification
@@ -25,7 +25,7 @@ def init_default_data():
             last_name='System',
             role='admin'
         )
-        admin.set_password('admin123')
+        admin.set_password('admin123', current_app.config['SEED_PASSWORD_HASH_METHOD'])
         db.session.add(admin)
         
         # Créer d'autres utilisateurs de test...
@@ -39,9 +39,31 @@ def create_app():
                 static_folder=os.path.join(os.path.dirname(__file__), 'static'))
     app.config.from_object(Config)
     
+    # Derrière un reverse proxy: remote_addr = IP ajoutée par le proxy de confiance,
+    # pas la valeur la plus à gauche de X-Forwarded-For (fournie par le client)
+    if app.config.get('TRUSTED_PROXY_HOPS'):
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXY_HOPS'])
+    
     # Initialisation de la base de données
     db.init_app(app)
     
+    # Compteurs de vues/likes en écriture différée
+    from utils.counters import counter_buffer
+    counter_buffer.init_app(app)
+    
+    # Instrumentation: requêtes SQL et temps par route (/admin/perf)
+    from utils.perf import perf_recorder
+    perf_recorder.init_app(app)
+    
+    # Limitation de débit des routes coûteuses (analyses, uploads, autocomplétion)
+    from utils.rate_limit import rate_limiter
+    rate_limiter.init_app(app)
+    
+    # Index d'autocomplétion (reconstruction périodique en arrière-plan)
+    from utils.typeahead import typeahead_index
+    typeahead_index.init_app(app)
+    
     # Configuration de Flask-Login
     login_manager = LoginManager()
     login_manager.init_app(app)
@@ -50,9 +72,9 @@ def create_app():
 
     login_manager.login_message_category = 'info'
     
-    @login_manager.user_loader
-    def load_user(user_id):
-        return User.query.get(int(user_id))
+    # Identité de l'utilisateur connecté servie depuis un cache (pas de requête par page)
+    from utils.identity_cache import load_user_snapshot
+    login_manager.user_loader(load_user_snapshot)
     
     # Import des blueprints - IMPORTANT: faire les imports APRÈS db.init_app()
     from routes.auth import auth_bp
@@ -74,6 +96,11 @@ def create_app():
     
     print("✓ Blueprints chargés avec succès")
     
+    # Analyseur IA: construit à la demande, sauf préchauffage explicite
+    if app.config.get('AI_ANALYZER_WARM_UP'):
+        from utils.ai_analyzer import warm_up
+        warm_up()
+    
     # Route de base
     @app.route('/')
     def index():
@@ -125,6 +152,17 @@ def create_app():
     def forbidden(error):
         return render_template('errors/403.html'), 403
     
+    @app.errorhandler(429)
+    def too_many_requests(error):
+        if request.is_json or request.accept_mimetypes.best == 'application/json':
+            response = jsonify({'error': error.description, 'retry_after': error.retry_after})
+        else:
+            response = make_response(render_template('errors/429.html', error=error))
+        response.status_code = 429
+        if error.retry_after:
+            response.headers['Retry-After'] = str(error.retry_after)
+        return response
+    
     return app
 
 # Création de l'application
@@ -151,7 +189,7 @@ if __name__ == '__main__':
 
 
 # app.py - CORRECTION
-from flask import Flask, render_template
+from flask import Flask, render_template, current_app
 from flask_login import LoginManager, current_user
 from config import Config
 from models import db, User, Comment, PFAProject, GuideStage, ProjectComment, ProjectDocument, Notification
@@ -177,7 +215,7 @@ def init_default_data():
             last_name='System',
             role='admin'
         )
-        admin.set_password('admin123')
+        admin.set_password('admin123', current_app.config['SEED_PASSWORD_HASH_METHOD'])
         db.session.add(admin)
         
         # Créer utilisateur jury
@@ -188,7 +226,7 @@ def init_default_data():
             last_name='Member',
             role='jury'
         )
-        jury.set_password('jury123')
+        jury.set_password('jury123', current_app.config['SEED_PASSWORD_HASH_METHOD'])
         db.session.add(jury)
         
         # Créer utilisateur étudiant
@@ -199,7 +237,7 @@ def init_default_data():
             last_name='Test',
             role='student'
         )
-        student.set_password('student123')
+        student.set_password('student123', current_app.config['SEED_PASSWORD_HASH_METHOD'])
         db.session.add(student)
         
         # Créer des guides par défaut
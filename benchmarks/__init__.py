@@ -0,0 +1 @@
+# benchmarks/ - MESURES DE PERFORMANCE (lancer depuis la racine: python -m benchmarks.<script>)
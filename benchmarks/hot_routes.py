@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# benchmarks/hot_routes.py - LATENCE, REQUÊTES SQL ET MÉMOIRE DES ROUTES CHAUDES
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+
+# Métriques comparées à la référence: une hausse au-delà du seuil est une régression
+COMPARED_METRICS = ('p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request')
+
+
+class Scenario:
+    """Une route appelée via le client de test, sous l'identité d'un rôle"""
+
+    def __init__(self, name, role, path):
+        self.name = name
+        self.role = role
+        self.path = path  # path(iteration, dataset) -> (url, id de l'utilisateur connecté)
+
+
+def _anonymous(url):
+    return lambda iteration, dataset: (url, None)
+
+
+def _as_first(role, url):
+    return lambda iteration, dataset: (url, dataset[role][0])
+
+
+def _real_analysis(iteration, dataset):
+    # Un projet différent à chaque appel: un job actif est réutilisé, pas recréé
+    student_id, project_id = dataset['projects'][iteration % len(dataset['projects'])]
+    return f'/ai/real-analysis/{project_id}', student_id
+
+
+SCENARIOS = [
+    Scenario('public.home', None, _anonymous('/')),
+    Scenario('public.explore', None, _anonymous('/explorer')),
+    Scenario('public.ranking', None, _anonymous('/classement')),
+    Scenario('jury.dashboard', 'jury', _as_first('jury', '/jury/dashboard')),
+    Scenario('student.dashboard', 'student', _as_first('student', '/student/dashboard')),
+    Scenario('ai.real_analysis', 'student', _real_analysis),
+]
+
+
+# ----- Mesures -----
+
+def current_rss_mb():
+    """Mémoire résidente du processus (Linux: /proc, sinon pic via resource)"""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(samples, rank):
+    """Percentile par rang le plus proche (samples triés)"""
+    if not samples:
+        return 0.0
+    index = max(0, min(len(samples) - 1, round(rank / 100 * len(samples) + 0.5) - 1))
+    return samples[index]
+
+
+class QueryCounter:
+    """Compte les requêtes SQL émises par le moteur pendant une mesure"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+
+def run_scenario(app, scenario, dataset, requests, warmup, queries):
+    client = app.test_client()
+    durations, statement_counts, statuses = [], [], Counter()
+    rss_before = current_rss_mb()
+
+    for iteration in range(warmup + requests):
+        url, user_id = scenario.path(iteration, dataset)
+        with client.session_transaction() as session:
+            session.clear()
+            if user_id is not None:
+                session['_user_id'] = str(user_id)
+                session['_fresh'] = True
+
+        queries.count = 0
+        start = time.perf_counter()
+        response = client.get(url)
+        elapsed = time.perf_counter() - start
+        response.close()
+
+        if iteration < warmup:
+            continue
+        durations.append(elapsed * 1000)
+        statement_counts.append(queries.count)
+        statuses[response.status_code] += 1
+
+    durations.sort()
+    return {
+        'requests': requests,
+        'p50_ms': round(percentile(durations, 50), 2),
+        'p95_ms': round(percentile(durations, 95), 2),
+        'p99_ms': round(percentile(durations, 99), 2),
+        'mean_ms': round(sum(durations) / len(durations), 2),
+        'queries_per_request': round(sum(statement_counts) / len(statement_counts), 1),
+        'max_queries': max(statement_counts),
+        'rss_mb': round(current_rss_mb(), 1),
+        'rss_delta_mb': round(current_rss_mb() - rss_before, 1),
+        'statuses': {str(code): count for code, count in sorted(statuses.items())}
+    }
+
+
+# ----- Jeu de données -----
+
+def load_dataset():
+    """Utilisateurs connectés par les scénarios (ids triés, reproductibles)"""
+    from models import db, User, PFAProject, ProjectDocument
+
+    def ids(role):
+        return [user_id for (user_id,) in db.session.query(User.id)
+                .filter(User.role == role).order_by(User.id)]
+
+    projects = db.session.query(PFAProject.student_id, PFAProject.id)\
+        .filter(PFAProject.id.in_(db.session.query(ProjectDocument.project_id)))\
+        .order_by(PFAProject.id).all()
+    return {'student': ids('student'), 'jury': ids('jury'), 'admin': ids('admin'),
+            'projects': [tuple(row) for row in projects]}
+
+
+# ----- Rapport et comparaison -----
+
+def print_report(results):
+    print(f"\n{'Scénario':<20} {'p50':>8} {'p95':>8} {'p99':>8} {'SQL/req':>8} {'RSS Mo':>8}  statuts")
+    for name, result in results.items():
+        statuses = ', '.join(f"{code}×{count}" for code, count in result['statuses'].items())
+        print(f"{name:<20} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} "
+              f"{result['queries_per_request']:>8.1f} {result['rss_mb']:>8.1f}  {statuses}")
+
+
+def compare(results, baseline, threshold):
+    """Afficher l'écart avec la référence; retourne le nombre de régressions"""
+    regressions = 0
+    print(f"\nComparaison avec la référence (seuil +{threshold:.0%})")
+    for name, result in results.items():
+        reference = baseline.get('scenarios', {}).get(name)
+        if reference is None:
+            print(f"   {name}: absent de la référence")
+            continue
+        for metric in COMPARED_METRICS:
+            before, after = reference.get(metric), result[metric]
+            if not before:
+                continue
+            change = (after - before) / before
+            marker = '❌' if change > threshold else '✅'
+            regressions += change > threshold
+            print(f"   {marker} {name:<20} {metric:<20} {before:>9.1f} -> {after:>9.1f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des routes chaudes sur un jeu de données synthétique")
+    parser.add_argument('--users', type=int, default=1000, help="Utilisateurs générés (base vide uniquement)")
+    parser.add_argument('--requests', type=int, default=50, help="Requêtes mesurées par scénario")
+    parser.add_argument('--warmup', type=int, default=3, help="Requêtes de chauffe non mesurées")
+    parser.add_argument('--database-url', help="Base jetable (défaut: fichier SQLite temporaire)")
+    parser.add_argument('--scenario', action='append', choices=[s.name for s in SCENARIOS],
+                        help="Limiter aux scénarios indiqués (répétable)")
+    parser.add_argument('--output', help="Enregistrer les résultats en JSON (référence)")
+    parser.add_argument('--compare', help="Référence JSON à comparer")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Hausse tolérée avant régression")
+    args = parser.parse_args()
+
+    temp_dir = None
+    if args.database_url is None:
+        temp_dir = tempfile.mkdtemp(prefix='remarqpfa-bench-')
+        args.database_url = f"sqlite:///{os.path.join(temp_dir, 'bench.db')}"
+
+    # La configuration lit ces variables à l'import de app
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ.setdefault('ANALYSIS_WORKERS', '1')
+    from app import create_app
+    from models import db, User
+    from benchmarks.seed import seed
+    from utils.analysis_jobs import shutdown_executor
+
+    app = create_app()
+    # Pas d'avertissement de budget à chaque requête: le rapport donne les mêmes chiffres
+    app.config.update(PERF_DEFAULT_STATEMENT_BUDGET=None, PERF_DEFAULT_TIME_BUDGET_MS=None, PERF_BUDGETS={})
+    # Un même utilisateur rejoue ai.real_analysis: mesurer la route, pas les limites de débit
+    app.config.update(RATE_LIMIT_ENABLED=False, ANALYSIS_MAX_CONCURRENT=0)
+    try:
+        with app.app_context():
+            db.create_all()
+            if User.query.first() is None:
+                print(f"🌱 Génération de {args.users} utilisateurs...")
+                counts = seed(args.users)
+            else:
+                print("🌱 Base existante réutilisée")
+                counts = None
+            dataset = load_dataset()
+            queries = QueryCounter(db.engine)
+            dialect = db.engine.dialect.name
+
+        scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+        results = {}
+        for scenario in scenarios:
+            if scenario.role and not dataset[scenario.role] or not dataset['projects']:
+                print(f"   ⏭️  {scenario.name}: jeu de données insuffisant")
+                continue
+            print(f"   ⏱️  {scenario.name}...")
+            results[scenario.name] = run_scenario(app, scenario, dataset, args.requests, args.warmup, queries)
+    finally:
+        # Laisser les jobs d'analyse créés par ai.real_analysis se terminer avant de supprimer la base
+        shutdown_executor()
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print_report(results)
+
+    report = {
+        'meta': {
+            'date': datetime.utcnow().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'database': dialect,
+            'requests': args.requests,
+            'dataset': counts
+        },
+        'scenarios': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2, ensure_ascii=False)
+        print(f"\n💾 Résultats enregistrés dans {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# benchmarks/import_time.py - TEMPS D'IMPORT DES BLUEPRINTS (python -X importtime)
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    'routes.auth',
+    'routes.jury',
+    'routes.student',
+    'routes.admin',
+    'routes.public',
+    'routes.student_projects',
+    'routes.ai_routes',
+    'routes.guide_routes',
+    'app',
+]
+
+
+def measure_import(module):
+    """(temps cumulé du module en µs, part de reportlab en µs) pour un import à froid"""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else module)
+
+    total = reportlab = 0
+    for line in proc.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        try:
+            self_time, cumulative = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # ligne d'en-tête
+        name = parts[2].strip()
+        if name == module:
+            total = cumulative
+        # Somme des temps propres de tous les sous-modules reportlab
+        if name.split('.')[0] == 'reportlab':
+            reportlab += self_time
+    return total, reportlab
+
+
+def run(modules, repeat):
+    print(f"{'Module':<26} {'médiane (ms)':>13} {'min (ms)':>10} {'reportlab (ms)':>15}")
+    for module in modules:
+        try:
+            samples = [measure_import(module) for _ in range(repeat)]
+        except RuntimeError as e:
+            print(f"{module:<26} ❌ {e}")
+            continue
+        totals = [total for total, _ in samples]
+        reportlab = statistics.median(share for _, share in samples)
+        print(f"{module:<26} {statistics.median(totals) / 1000:>13.1f} "
+              f"{min(totals) / 1000:>10.1f} {reportlab / 1000:>15.1f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Temps d'import à froid de chaque blueprint")
+    parser.add_argument('modules', nargs='*', default=MODULES, help="Modules à mesurer")
+    parser.add_argument('--repeat', type=int, default=5, help="Nombre d'imports par module")
+    args = parser.parse_args()
+    run(args.modules, args.repeat)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# benchmarks/passwords.py - DÉBIT DE CONNEXION PAR POLITIQUE DE HACHAGE
+#
+#   python -m benchmarks.passwords
+#   python -m benchmarks.passwords --policy scrypt:16384:8:1 --policy pbkdf2:sha256:600000 --output passwords.json
+#
+# Pour chaque politique: vérification seule (connexions/s par cœur), débit multi-processus
+# et connexion complète via POST /auth/login (Flask + base + vérification).
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+PASSWORD = 'benchmark-password'
+EMAIL = 'bench@example.com'
+DEFAULT_POLICIES = ('scrypt:32768:8:1', 'scrypt:16384:8:1', 'pbkdf2:sha256:600000', 'pbkdf2:sha256:260000')
+
+
+def scrypt_memory_mb(policy):
+    """Mémoire d'un calcul scrypt (128 * r * N octets), None pour PBKDF2"""
+    parts = policy.split(':')
+    if parts[0] != 'scrypt':
+        return None
+    n, r = (int(parts[1]), int(parts[2])) if len(parts) >= 3 else (32768, 8)
+    return 128 * r * n / (1024 * 1024)
+
+
+def time_verify(password_hash, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        check_password_hash(password_hash, PASSWORD)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _verify_batch(args):
+    password_hash, count = args
+    for _ in range(count):
+        check_password_hash(password_hash, PASSWORD)
+    return count
+
+
+def parallel_rate(password_hash, processes, repeat):
+    """Vérifications par seconde avec un processus par cœur"""
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        list(pool.map(_verify_batch, [(password_hash, 1)] * processes))  # démarrage des processus
+        start = time.perf_counter()
+        done = sum(pool.map(_verify_batch, [(password_hash, repeat)] * processes))
+        return done / (time.perf_counter() - start)
+
+
+def login_latencies(app, policy, repeat):
+    """Latences de POST /auth/login (un client neuf par connexion: pas de session existante)"""
+    from models import db, User
+
+    with app.app_context():
+        app.config['PASSWORD_HASH_METHOD'] = policy
+        user = User.query.filter_by(email=EMAIL).first()
+        user.set_password(PASSWORD)
+        db.session.commit()
+
+    samples = []
+    for _ in range(repeat):
+        client = app.test_client()
+        start = time.perf_counter()
+        response = client.post('/auth/login', data={'email': EMAIL, 'password': PASSWORD})
+        samples.append(time.perf_counter() - start)
+        if response.status_code != 302 or '/auth/login' in response.headers.get('Location', ''):
+            raise RuntimeError(f"Connexion refusée avec la politique {policy}")
+    return samples
+
+
+def create_login_app(database_url):
+    os.environ['DATABASE_URL'] = database_url
+    from app import create_app
+    from models import db, User
+
+    app = create_app()
+    app.config.update(PERF_DEFAULT_STATEMENT_BUDGET=None, PERF_DEFAULT_TIME_BUDGET_MS=None, PERF_BUDGETS={})
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email=EMAIL, role='student', is_active=True)
+        user.set_password(PASSWORD)
+        db.session.add(user)
+        db.session.commit()
+    return app
+
+
+def run(policies, repeat, processes, login_repeat, app):
+    results = {}
+    for policy in policies:
+        print(f"   ⏱️  {policy}...")
+        start = time.perf_counter()
+        password_hash = generate_password_hash(PASSWORD, method=policy)
+        hash_ms = (time.perf_counter() - start) * 1000
+
+        verify = time_verify(password_hash, repeat)
+        verify_ms = statistics.median(verify) * 1000
+        result = {
+            'hash_ms': round(hash_ms, 1),
+            'verify_ms': round(verify_ms, 1),
+            'logins_per_second_per_core': round(1000 / verify_ms, 1),
+            'memory_mb': scrypt_memory_mb(policy),
+        }
+        if processes > 1:
+            rate = parallel_rate(password_hash, processes, repeat)
+            result['logins_per_second'] = round(rate, 1)
+            result['logins_per_second_per_core_parallel'] = round(rate / processes, 1)
+        if app is not None:
+            login = sorted(login_latencies(app, policy, login_repeat))
+            result['login_route_p50_ms'] = round(statistics.median(login) * 1000, 1)
+            result['login_route_per_second'] = round(len(login) / sum(login), 1)
+        results[policy] = result
+    return results
+
+
+def print_table(results, processes):
+    print()
+    header = f"{'Politique':24} {'hash ms':>8} {'vérif ms':>9} {'conn/s/cœur':>12} {'Mo/calcul':>10}"
+    if processes > 1:
+        header += f" {f'conn/s ×{processes}':>12}"
+    if any('login_route_p50_ms' in result for result in results.values()):
+        header += f" {'/auth/login p50':>16} {'conn/s':>8}"
+    print(header)
+    for policy, result in results.items():
+        memory = f"{result['memory_mb']:.0f}" if result['memory_mb'] else '-'
+        line = (f"{policy:24} {result['hash_ms']:8.1f} {result['verify_ms']:9.1f} "
+                f"{result['logins_per_second_per_core']:12.1f} {memory:>10}")
+        if processes > 1:
+            line += f" {result['logins_per_second']:12.1f}"
+        if 'login_route_p50_ms' in result:
+            line += f" {result['login_route_p50_ms']:16.1f} {result['login_route_per_second']:8.1f}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connexions par seconde et par cœur pour chaque politique de hachage")
+    parser.add_argument('--policy', action='append', dest='policies',
+                        help="Méthode Werkzeug à mesurer (répétable, défaut: une sélection scrypt/PBKDF2)")
+    parser.add_argument('--repeat', type=int, default=10, help="Vérifications mesurées par politique")
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                        help="Processus pour le débit parallèle (1 = mesure par cœur seulement)")
+    parser.add_argument('--login-requests', type=int, default=10, help="Connexions via /auth/login par politique")
+    parser.add_argument('--no-login', action='store_true', help="Ne pas mesurer la route /auth/login")
+    parser.add_argument('--output', help="Enregistrer les résultats en JSON")
+    args = parser.parse_args()
+
+    policies = args.policies or list(DEFAULT_POLICIES)
+    print(f"🔐 {len(policies)} politique(s), {args.repeat} vérifications, {args.processes} processus")
+
+    with tempfile.TemporaryDirectory() as folder:
+        app = None if args.no_login else create_login_app(f"sqlite:///{os.path.join(folder, 'passwords.db')}")
+        results = run(policies, args.repeat, args.processes, args.login_requests, app)
+
+    print_table(results, args.processes)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump({'processes': args.processes, 'results': results}, output, indent=2)
+        print(f"\n💾 Résultats enregistrés dans {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+# benchmarks/scoring.py - MICRO-BENCHMARKS DES FONCTIONS DE SCORING TEXTUEL
+import argparse
+import glob
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+from routes.ai_routes import (
+    analyze_with_mathematical_models, analyze_with_uploaded_guide, load_guide_data,
+    calculate_readability_index, calculate_coherence_score, count_mathematical_elements,
+    extract_technical_terms, detect_sections_math, calculate_structure_complexity,
+    calculate_structural_score_math, calculate_technical_score_math, calculate_mathematical_complexity,
+    calculate_quality_score_math, calculate_overall_score_math, get_complexity_level,
+    generate_mathematical_recommendations, calculate_guide_structure_score, calculate_guide_compliance,
+    detect_sections_with_guide, find_missing_sections, generate_guided_recommendations
+)
+from utils.text_metrics import TextMetrics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOCUMENTS_FOLDER = os.path.join(ROOT, 'static', 'uploads', 'documents')
+
+SIZES = (10_000, 100_000, 1_000_000)
+DOMAIN = 'Développement Web'
+GUIDE_ID = 0
+# Exposant t ~ n^k au-delà duquel une fonction est signalée comme super-linéaire
+MAX_EXPONENT = 1.3
+
+GUIDE_DATA = load_guide_data('', 'guide.pdf')  # guide par défaut (fichier non JSON)
+
+
+# ----- Corpus -----
+
+HEADINGS = ('Introduction et contexte', 'Problématique', 'Méthodologie', 'Approche proposée',
+            'Implémentation', 'Expérimentation', 'Résultats', 'Performance', 'Conclusion',
+            'Perspectives', 'Bibliographie')
+SENTENCES = (
+    "Le système repose sur une API REST développée avec Flask et une base de données SQL.",
+    "L'interface utilisateur est réalisée en React avec une gestion d'état centralisée.",
+    "Premièrement, nous avons collecté les données puis nettoyé les valeurs aberrantes avec pandas.",
+    "Ensuite, le modèle de deep learning est entraîné avec TensorFlow sur un jeu de validation.",
+    "Par conséquent, la précision obtenue dépasse celle de la méthode de référence.",
+    "La fonction de coût est définie par $L = \\sum_i (y_i - \\hat{y}_i)^2$ sur l'ensemble d'apprentissage.",
+    "Le temps de réponse moyen vérifie t = 120 ms sous une charge de cent utilisateurs.",
+    "Les tests unitaires couvrent les services critiques et la couche d'accès aux données.",
+    "Cette section décrit les choix d'architecture et les compromis retenus.",
+    "En conclusion, la solution répond aux objectifs fixés dans le cahier des charges.",
+)
+
+
+def synthetic_report(size, seed=42):
+    """Rapport de PFA synthétique: titres de sections, paragraphes, équations, termes techniques"""
+    rng = random.Random(seed)
+    parts, length = [], 0
+    while length < size:
+        paragraph = ' '.join(rng.choice(SENTENCES) for _ in range(rng.randint(3, 8)))
+        block = f"{rng.choice(HEADINGS)}\n\n{paragraph}\n\n" if rng.random() < 0.2 else f"{paragraph}\n\n"
+        parts.append(block)
+        length += len(block)
+    return ''.join(parts)[:size]
+
+
+def real_report(size, pdf_path):
+    """Texte extrait d'un vrai rapport, répété jusqu'à la taille demandée"""
+    from utils.pdf_text import extract_pdf_text
+    text = extract_pdf_text(pdf_path) or ''
+    if not text:
+        return None
+    return (text * (size // len(text) + 1))[:size]
+
+
+def build_corpus(sizes, pdf_path):
+    corpus = {'synthétique': {size: synthetic_report(size) for size in sizes}}
+    if pdf_path:
+        texts = {size: real_report(size, pdf_path) for size in sizes}
+        if all(texts.values()):
+            corpus[f'réel ({os.path.basename(pdf_path)})'] = texts
+    return corpus
+
+
+def default_pdf():
+    pdfs = sorted(glob.glob(os.path.join(DOCUMENTS_FOLDER, '*.pdf')))
+    return pdfs[0] if pdfs else None
+
+
+# ----- Implémentations de référence (une fonction par métrique, avant TextMetrics) -----
+
+def legacy_mathematical_analysis(content, domain):
+    """Pipeline historique: chaque score recalcule ses mesures sur le texte complet"""
+    structure_score = calculate_structural_score_math(content)
+    technical_score = calculate_technical_score_math(content, domain)
+    math_complexity = calculate_mathematical_complexity(content)
+    quality_score = calculate_quality_score_math(content)
+    overall_score = calculate_overall_score_math(structure_score, technical_score, math_complexity, quality_score)
+    technical_terms = extract_technical_terms(content)
+    return {
+        'overall_score': round(overall_score, 2),
+        'structure': {
+            'score': round(structure_score, 2),
+            'sections_detected': detect_sections_math(content),
+            'complexity': round(calculate_structure_complexity(content), 2)
+        },
+        'technical': {
+            'score': round(technical_score, 2),
+            'terms_found': technical_terms,
+            'terms_count': len(technical_terms)
+        },
+        'mathematical': {
+            'score': round(math_complexity, 2),
+            'equations_count': count_mathematical_elements(content),
+            'complexity_level': get_complexity_level(math_complexity)
+        },
+        'quality': {
+            'score': round(quality_score, 2),
+            'readability': round(calculate_readability_index(content), 2),
+            'coherence': round(calculate_coherence_score(content), 2)
+        },
+        'recommendations': generate_mathematical_recommendations(
+            structure_score, technical_score, math_complexity, quality_score
+        )
+    }
+
+
+def legacy_guided_analysis(content, domain, guide_data, guide_title, guide_id=None):
+    """Pipeline guidé historique: un appel par mesure du guide"""
+    structure_score = calculate_guide_structure_score(content, guide_data)
+    technical_score = calculate_technical_score_math(content, domain)
+    math_complexity = calculate_mathematical_complexity(content)
+    quality_score = calculate_quality_score_math(content)
+    overall_score = calculate_overall_score_math(structure_score, technical_score, math_complexity, quality_score)
+    technical_terms = extract_technical_terms(content)
+    return {
+        'overall_score': round(overall_score, 2),
+        'structure': {
+            'score': round(structure_score, 2),
+            'sections_detected': detect_sections_with_guide(content, guide_data),
+            'sections_missing': find_missing_sections(content, guide_data),
+            'compliance': f"{calculate_guide_compliance(content, guide_data)}%",
+            'guide_used': guide_title
+        },
+        'technical': {
+            'score': round(technical_score, 2),
+            'terms_found': technical_terms,
+            'terms_count': len(technical_terms)
+        },
+        'mathematical': {
+            'score': round(math_complexity, 2),
+            'equations_count': count_mathematical_elements(content),
+            'complexity_level': get_complexity_level(math_complexity)
+        },
+        'quality': {
+            'score': round(quality_score, 2),
+            'readability': round(calculate_readability_index(content), 2),
+            'coherence': round(calculate_coherence_score(content), 2)
+        },
+        'recommendations': generate_guided_recommendations(content, guide_data, structure_score, technical_score)
+    }
+
+
+# Fonctions mesurées: nom -> appel sur un texte
+FUNCTIONS = {
+    'calculate_readability_index': calculate_readability_index,
+    'calculate_coherence_score': calculate_coherence_score,
+    'count_mathematical_elements': count_mathematical_elements,
+    'extract_technical_terms': extract_technical_terms,
+    'detect_sections_math': detect_sections_math,
+    'calculate_structure_complexity': calculate_structure_complexity,
+    'detect_sections_with_guide': lambda content: detect_sections_with_guide(content, GUIDE_DATA),
+    'find_missing_sections': lambda content: find_missing_sections(content, GUIDE_DATA),
+    'TextMetrics': TextMetrics,
+    'analyze_with_mathematical_models': lambda content: analyze_with_mathematical_models(content, DOMAIN),
+    'legacy_mathematical_analysis': lambda content: legacy_mathematical_analysis(content, DOMAIN),
+    'analyze_with_uploaded_guide': lambda content: analyze_with_uploaded_guide(
+        content, DOMAIN, GUIDE_DATA, 'Guide', GUIDE_ID),
+    'legacy_guided_analysis': lambda content: legacy_guided_analysis(
+        content, DOMAIN, GUIDE_DATA, 'Guide', GUIDE_ID),
+}
+
+# Pipelines dont le résultat doit rester identique entre implémentations
+EQUIVALENT_PIPELINES = (
+    ('analyze_with_mathematical_models', 'legacy_mathematical_analysis'),
+    ('analyze_with_uploaded_guide', 'legacy_guided_analysis'),
+)
+
+
+# ----- Mesures -----
+
+def _normalized(result):
+    """Résultat comparable: listes issues d'un set() triées"""
+    if isinstance(result, dict):
+        return {key: _normalized(value) for key, value in result.items()}
+    if isinstance(result, list) and all(isinstance(item, str) for item in result):
+        return sorted(result)
+    return result
+
+
+def time_function(function, content, repeat, min_time=0.05):
+    """Médiane du temps par appel (s); chaque échantillon dure au moins min_time"""
+    start = time.perf_counter()
+    function(content)
+    single = time.perf_counter() - start
+    number = max(1, int(min_time / single)) if single > 0 else 1000
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function(content)
+        samples.append((time.perf_counter() - start) / number)
+    return statistics.median(samples)
+
+
+def scaling_exponent(timings):
+    """Pente log-log entre la plus petite et la plus grande taille (1 = linéaire)"""
+    sizes = sorted(timings)
+    smallest, largest = sizes[0], sizes[-1]
+    if smallest == largest or timings[smallest] <= 0:
+        return None
+    return math.log(timings[largest] / timings[smallest]) / math.log(largest / smallest)
+
+
+def check_equivalence(corpus):
+    mismatches = []
+    for name, texts in corpus.items():
+        for size, content in texts.items():
+            for current, legacy in EQUIVALENT_PIPELINES:
+                if _normalized(FUNCTIONS[current](content)) != _normalized(FUNCTIONS[legacy](content)):
+                    mismatches.append(f"{current} != {legacy} ({name}, {size} caractères)")
+    return mismatches
+
+
+def run(corpus, functions, repeat, max_exponent):
+    results = {}
+    flagged = []
+    for corpus_name, texts in corpus.items():
+        print(f"\nCorpus {corpus_name}")
+        header = ''.join(f"{size // 1000:>10}k" for size in texts)
+        print(f"{'Fonction (ms)':<34}{header}   exposant")
+        results[corpus_name] = {}
+        for name in functions:
+            timings = {size: time_function(FUNCTIONS[name], content, repeat) for size, content in texts.items()}
+            exponent = scaling_exponent(timings)
+            super_linear = exponent is not None and exponent > max_exponent
+            if super_linear:
+                flagged.append(f"{name} ({corpus_name}): n^{exponent:.2f}")
+            row = ''.join(f"{timings[size] * 1000:>11.3f}" for size in texts)
+            marker = '❌' if super_linear else '  '
+            exponent_text = f"{exponent:.2f}" if exponent is not None else '-'
+            print(f"{name:<34}{row}   {exponent_text:>5} {marker}")
+            results[corpus_name][name] = {
+                'ms': {str(size): round(timings[size] * 1000, 4) for size in texts},
+                'exponent': round(exponent, 3) if exponent is not None else None
+            }
+    return results, flagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temps et passage à l'échelle des fonctions de scoring")
+    parser.add_argument('functions', nargs='*', default=list(FUNCTIONS), help="Fonctions à mesurer")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help="Tailles des textes (caractères)")
+    parser.add_argument('--repeat', type=int, default=5, help="Échantillons par mesure")
+    parser.add_argument('--pdf', default=default_pdf(), help="Rapport réel à répéter jusqu'aux tailles demandées")
+    parser.add_argument('--max-exponent', type=float, default=MAX_EXPONENT,
+                        help="Exposant de croissance au-delà duquel une fonction est signalée")
+    parser.add_argument('--output', help="Enregistrer les résultats en JSON")
+    args = parser.parse_args()
+
+    unknown = set(args.functions) - set(FUNCTIONS)
+    if unknown:
+        parser.error(f"fonction(s) inconnue(s): {', '.join(sorted(unknown))}")
+
+    corpus = build_corpus(sorted(args.sizes), args.pdf)
+
+    mismatches = check_equivalence(corpus)
+    for mismatch in mismatches:
+        print(f"❌ Résultats différents: {mismatch}")
+    if not mismatches:
+        print("✅ Résultats identiques entre implémentations")
+
+    results, flagged = run(corpus, args.functions, args.repeat, args.max_exponent)
+    for item in flagged:
+        print(f"⚠️ Croissance super-linéaire: {item}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump({'sizes': sorted(args.sizes), 'mismatches': mismatches, 'super_linear': flagged,
+                       'results': results}, output, indent=2, ensure_ascii=False)
+        print(f"\n💾 Résultats enregistrés dans {args.output}")
+
+    if mismatches or flagged:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
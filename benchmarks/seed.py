@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# benchmarks/seed.py - JEU DE DONNÉES SYNTHÉTIQUE POUR LES BENCHMARKS
+import argparse
+import os
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+from werkzeug.security import generate_password_hash
+
+from models import db, User, PFAProject, Comment, ProjectComment, ProjectDocument, Notification
+
+# Rapport PDF fourni dans static/uploads/documents (file_path = nom du fichier)
+SAMPLE_DOCUMENT = '20251122_175325_hadoop.pdf'
+PASSWORD = 'benchmark'
+
+# Répartition des rôles et volumes par utilisateur (ordre de grandeur d'une promotion réelle)
+ROLE_WEIGHTS = (('student', 0.80), ('jury', 0.15), ('admin', 0.05))
+PROJECTS_PER_STUDENT = 1.5
+PUBLISHED_RATIO = 0.8
+EVALUATIONS_PER_PROJECT = 2
+COMMENTS_PER_PROJECT = 2
+NOTIFICATIONS_PER_USER = 3
+BATCH_SIZE = 1000
+
+DOMAINS = ('Développement Web', 'Intelligence Artificielle', 'Data Science', 'Cybersécurité',
+           'Mobile', 'Cloud Computing', 'IoT', 'Big Data')
+TECHNOLOGIES = ('Python', 'Flask', 'Django', 'React', 'Vue.js', 'Angular', 'Node.js', 'Java',
+                'Spring Boot', 'PostgreSQL', 'MongoDB', 'Docker', 'Kubernetes', 'TensorFlow',
+                'PyTorch', 'Hadoop', 'Spark', 'Flutter', 'Kotlin', 'AWS')
+SUBJECTS = ('Plateforme', 'Application', 'Système', 'Outil', 'Tableau de bord', 'Assistant')
+PURPOSES = ('de gestion des stages', 'de détection de fraudes', 'de recommandation de cours',
+            'de suivi énergétique', 'd\'analyse de sentiments', 'de réservation de salles',
+            'de prédiction des ventes', 'de surveillance réseau', 'de covoiturage universitaire')
+FIRST_NAMES = ('Yassine', 'Salma', 'Omar', 'Imane', 'Mehdi', 'Khadija', 'Amine', 'Nour', 'Hamza', 'Sara')
+LAST_NAMES = ('Benali', 'El Idrissi', 'Alaoui', 'Tazi', 'Bennani', 'Chraibi', 'Fassi', 'Berrada')
+EVALUATIONS = ('Travail solide, architecture claire et bien documentée.',
+               'Bonne maîtrise technique, la partie tests mériterait d\'être approfondie.',
+               'Projet ambitieux; la présentation des résultats peut être améliorée.',
+               'Excellent rapport, démarche rigoureuse et résultats convaincants.')
+
+
+def _batched(connection, table, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        connection.execute(insert(table), rows[start:start + BATCH_SIZE])
+
+
+def _ids(connection, column, **filters):
+    query = select(column)
+    for name, value in filters.items():
+        query = query.where(column.table.c[name] == value)
+    return [row[0] for row in connection.execute(query.order_by(column))]
+
+
+def seed(n_users, seed_value=42):
+    """Remplir une base vide; retourne {table: nombre de lignes insérées}.
+
+    Insertions par lots via le Core (pas d'objets ORM): les événements des
+    modèles ne sont pas déclenchés, les index dérivés sont reconstruits à la fin.
+    """
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    password_hash = generate_password_hash(PASSWORD)
+    connection = db.session.connection()
+
+    def past(days):
+        return now - timedelta(days=rng.uniform(0, days), seconds=rng.randint(0, 86400))
+
+    roles, weights = zip(*ROLE_WEIGHTS)
+    users = []
+    for index in range(n_users):
+        # Au moins un utilisateur de chaque rôle, même sur un petit jeu de données
+        role = roles[index] if index < len(roles) else rng.choices(roles, weights)[0]
+        created_at = past(365)
+        users.append({
+            'username': f'{role}{index}', 'email': f'{role}{index}@bench.local',
+            'password_hash': password_hash, 'role': role, 'is_active': True,
+            'first_name': rng.choice(FIRST_NAMES), 'last_name': rng.choice(LAST_NAMES),
+            'created_at': created_at, 'updated_at': created_at
+        })
+    _batched(connection, User.__table__, users)
+
+    user_ids = _ids(connection, User.__table__.c.id)
+    student_ids = _ids(connection, User.__table__.c.id, role='student')
+    jury_ids = _ids(connection, User.__table__.c.id, role='jury') or user_ids[:1]
+
+    projects = []
+    for student_id in student_ids:
+        count = int(PROJECTS_PER_STUDENT) + (rng.random() < PROJECTS_PER_STUDENT % 1)
+        for _ in range(count):
+            created_at = past(365)
+            title = f"{rng.choice(SUBJECTS)} {rng.choice(PURPOSES)}"
+            technologies = ', '.join(rng.sample(TECHNOLOGIES, rng.randint(2, 5)))
+            projects.append({
+                'student_id': student_id, 'title': title,
+                'description': f"{title} réalisée avec {technologies}. " * rng.randint(2, 6),
+                'domain': rng.choice(DOMAINS), 'technologies': technologies,
+                'status': 'published' if rng.random() < PUBLISHED_RATIO else 'draft',
+                'is_public': True, 'views_count': int(rng.paretovariate(1.2) * 10),
+                'likes_count': int(rng.paretovariate(1.5) * 2), 'ai_adaptability_score': rng.randint(0, 100),
+                'has_ai_analysis': False, 'created_at': created_at, 'updated_at': created_at
+            })
+    _batched(connection, PFAProject.__table__, projects)
+    project_rows = connection.execute(
+        select(PFAProject.id, PFAProject.student_id, PFAProject.title).order_by(PFAProject.id)
+    ).all()
+
+    evaluations, project_comments, documents = [], [], []
+    for project_id, student_id, title in project_rows:
+        for jury_id in rng.sample(jury_ids, min(EVALUATIONS_PER_PROJECT, len(jury_ids))):
+            created_at = past(180)
+            evaluations.append({
+                'student_id': student_id, 'jury_id': jury_id, 'project_id': project_id,
+                'project_title': title, 'content': rng.choice(EVALUATIONS),
+                'recommendations': int(rng.paretovariate(1.5)) - 1, 'is_public': rng.random() < 0.9,
+                'created_at': created_at, 'updated_at': created_at
+            })
+        for _ in range(COMMENTS_PER_PROJECT):
+            created_at = past(180)
+            project_comments.append({
+                'project_id': project_id, 'user_id': rng.choice(user_ids),
+                'content': 'Très intéressant, merci pour le partage du code.', 'is_helpful': True,
+                'likes_count': rng.randint(0, 5), 'created_at': created_at, 'updated_at': created_at
+            })
+        documents.append({
+            'project_id': project_id, 'title': f'Rapport - {title}', 'file_type': 'pdf',
+            'file_path': SAMPLE_DOCUMENT, 'file_size': 1024 * rng.randint(200, 4000),
+            'downloads_count': rng.randint(0, 50), 'is_public': True, 'uploaded_at': past(180)
+        })
+
+    notifications = [{
+        'user_id': user_id, 'title': 'Nouvelle évaluation', 'message': 'Un jury a évalué votre projet.',
+        'is_read': rng.random() < 0.6, 'type': 'info', 'created_at': past(30)
+    } for user_id in user_ids for _ in range(NOTIFICATIONS_PER_USER)]
+
+    _batched(connection, Comment.__table__, evaluations)
+    _batched(connection, ProjectComment.__table__, project_comments)
+    _batched(connection, ProjectDocument.__table__, documents)
+    _batched(connection, Notification.__table__, notifications)
+    db.session.commit()
+
+    from utils.technology_index import rebuild_technology_index
+    from utils.search import rebuild_search_index
+    rebuild_technology_index()
+    rebuild_search_index()
+
+    return {
+        'users': len(users), 'students': len(student_ids), 'juries': len(jury_ids),
+        'projects': len(project_rows), 'evaluations': len(evaluations),
+        'project_comments': len(project_comments), 'documents': len(documents),
+        'notifications': len(notifications)
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Remplir une base jetable avec des données synthétiques")
+    parser.add_argument('--users', type=int, default=1000, help="Nombre d'utilisateurs")
+    parser.add_argument('--seed', type=int, default=42, help="Graine du générateur aléatoire")
+    parser.add_argument('--database-url', required=True,
+                        help="Base cible (ex: sqlite:////tmp/bench.db) - ne jamais viser la base de production")
+    args = parser.parse_args()
+
+    # La configuration lit DATABASE_URL à l'import
+    os.environ['DATABASE_URL'] = args.database_url
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        if User.query.first() is not None:
+            parser.error("la base cible contient déjà des utilisateurs")
+        for table, count in seed(args.users, args.seed).items():
+            print(f"   ✅ {count} {table}")
@@ -1,9 +1,50 @@
+import json
 import os
 from datetime import timedelta
 from dotenv import load_dotenv
 
 load_dotenv()
 
+RATE_LIMIT_SCOPES = ('user', 'ip')
+RATE_LIMIT_KEYS = ('limit', 'period', 'burst')
+
+
+def merge_rate_limits(defaults, overrides):
+    """Fusionner les surcharges de RATE_LIMITS limite par limite et portée par portée.
+
+    {"analysis": {"user": {"limit": 5}}} ne change que la limite par utilisateur
+    des analyses; une portée à null la désactive. Noms de limites, portées et clés
+    inconnus ou valeurs non entières positives: ValueError au démarrage.
+    """
+    merged = {name: {scope: dict(bucket) for scope, bucket in limit.items()} for name, limit in defaults.items()}
+    if not isinstance(overrides, dict):
+        raise ValueError("RATE_LIMITS: objet JSON attendu")
+    for name, limit in overrides.items():
+        if name not in merged:
+            raise ValueError(f"RATE_LIMITS: limite inconnue '{name}' (connues: {', '.join(merged)})")
+        if not isinstance(limit, dict):
+            raise ValueError(f"RATE_LIMITS.{name}: objet attendu")
+        for scope, bucket in limit.items():
+            if scope not in RATE_LIMIT_SCOPES:
+                raise ValueError(f"RATE_LIMITS.{name}: portée inconnue '{scope}' (user ou ip)")
+            if bucket is None:
+                merged[name].pop(scope, None)
+                continue
+            if not isinstance(bucket, dict):
+                raise ValueError(f"RATE_LIMITS.{name}.{scope}: objet ou null attendu")
+            for key, value in bucket.items():
+                if key not in RATE_LIMIT_KEYS:
+                    raise ValueError(f"RATE_LIMITS.{name}.{scope}: clé inconnue '{key}' (limit, period, burst)")
+                if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+                    raise ValueError(f"RATE_LIMITS.{name}.{scope}.{key}: entier positif attendu")
+            merged_bucket = {**merged[name].get(scope, {}), **bucket}
+            missing = [key for key in RATE_LIMIT_KEYS if key not in merged_bucket]
+            if missing:
+                raise ValueError(f"RATE_LIMITS.{name}.{scope}: clé(s) manquante(s) {', '.join(missing)}")
+            merged[name][scope] = merged_bucket
+    return merged
+
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     
@@ -28,12 +69,83 @@ class Config:
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
     
+    # Hachage des mots de passe (méthode Werkzeug, ex: "scrypt:32768:8:1", "pbkdf2:sha256:600000").
+    # Les hachages d'une autre méthode sont recalculés à la connexion suivante.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'scrypt:32768:8:1'
+    PASSWORD_SALT_LENGTH = int(os.environ.get('PASSWORD_SALT_LENGTH', 16))
+    # Comptes de démonstration créés au démarrage: hachage rapide, remis à la politique à la première connexion
+    SEED_PASSWORD_HASH_METHOD = os.environ.get('SEED_PASSWORD_HASH_METHOD') or 'pbkdf2:sha256:1000'
+    # Hachage dans le pool de threads natifs sous gevent/eventlet
+    PASSWORD_HASH_OFFLOAD = os.environ.get('PASSWORD_HASH_OFFLOAD', '1').lower() in ('1', 'true', 'yes')
+    
     # App
     APP_NAME = "RemarqPFA"
     VERSION = "2.0.0"
     
     # Pagination
     ITEMS_PER_PAGE = 10
+    
+    # Analyse IA en arrière-plan
+    ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', 2))
+    ANALYSIS_JOB_TIMEOUT = int(os.environ.get('ANALYSIS_JOB_TIMEOUT', 600))
+    # Nombre maximal de caractères analysés par rapport (0 = texte complet)
+    ANALYSIS_MAX_CHARS = int(os.environ.get('ANALYSIS_MAX_CHARS', 10000))
+    # Nombre maximal de pages extraites par PDF (0 = toutes les pages)
+    ANALYSIS_MAX_PAGES = int(os.environ.get('ANALYSIS_MAX_PAGES', 0))
+    # Construire l'analyseur IA au démarrage plutôt qu'à la première analyse
+    AI_ANALYZER_WARM_UP = os.environ.get('AI_ANALYZER_WARM_UP', '').lower() in ('1', 'true', 'yes')
+    
+    # Analyses en file ou en cours sur toute la plateforme (0 = sans limite), au-delà: 429
+    ANALYSIS_MAX_CONCURRENT = int(os.environ.get('ANALYSIS_MAX_CONCURRENT', 8))
+    ANALYSIS_RETRY_AFTER = int(os.environ.get('ANALYSIS_RETRY_AFTER', 30))
+    
+    # Cache du texte extrait des PDF (clé: SHA-256 du fichier)
+    TEXT_CACHE_DIR = os.environ.get('TEXT_CACHE_DIR') or os.path.join(os.path.dirname(__file__), 'instance', 'text_cache')
+    TEXT_CACHE_MAX_BYTES = int(os.environ.get('TEXT_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+    
+    # Statistiques globales mises en cache (secondes)
+    STATS_CACHE_TTL = int(os.environ.get('STATS_CACHE_TTL', 300))
+    
+    # Autocomplétion: reconstruction complète de l'index en arrière-plan (secondes, 0 = désactivée) et cache HTTP des réponses
+    TYPEAHEAD_REBUILD_INTERVAL = int(os.environ.get('TYPEAHEAD_REBUILD_INTERVAL', 300))
+    TYPEAHEAD_MAX_AGE = int(os.environ.get('TYPEAHEAD_MAX_AGE', 30))
+    
+    # Compteurs (vues, likes, téléchargements) écrits par lots toutes les N secondes (0 = immédiatement)
+    COUNTER_FLUSH_INTERVAL = float(os.environ.get('COUNTER_FLUSH_INTERVAL', 5))
+    
+    # Cache des identités chargées à chaque requête authentifiée (secondes, 0 = désactivé)
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 1024))
+    
+    # Instrumentation des routes (requêtes SQL, temps base/rendu) et budgets par endpoint
+    PERF_INSTRUMENTATION = os.environ.get('PERF_INSTRUMENTATION', '1').lower() in ('1', 'true', 'yes')
+    PERF_DEFAULT_STATEMENT_BUDGET = int(os.environ.get('PERF_DEFAULT_STATEMENT_BUDGET', 20))
+    PERF_DEFAULT_TIME_BUDGET_MS = int(os.environ.get('PERF_DEFAULT_TIME_BUDGET_MS', 500))
+    # Budgets spécifiques, ex: {"public.home": {"statements": 8, "ms": 200}}
+    PERF_BUDGETS = json.loads(os.environ.get('PERF_BUDGETS') or '{}')
+    # Jeton Bearer pour /admin/perf/metrics (sinon session administrateur requise)
+    PERF_METRICS_TOKEN = os.environ.get('PERF_METRICS_TOKEN')
+
+    # Limitation de débit des routes coûteuses: seau à jetons par utilisateur et par IP
+    # ("limit" requêtes par "period" secondes, rafale de "burst")
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', '1').lower() in ('1', 'true', 'yes')
+    # "memory": par processus; "sqlite": partagé entre les workers de la machine
+    RATE_LIMIT_STORAGE = os.environ.get('RATE_LIMIT_STORAGE', 'memory')
+    RATE_LIMIT_SQLITE_PATH = os.environ.get('RATE_LIMIT_SQLITE_PATH') or os.path.join(os.path.dirname(__file__), 'instance', 'rate_limits.db')
+    # Nombre de proxys de confiance devant l'application (X-Forwarded-For lu par ProxyFix);
+    # 0: IP du client = adresse de la connexion, en-tête ignoré
+    TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', 0))
+    RATE_LIMITS = merge_rate_limits({
+        'analysis': {'user': {'limit': 10, 'period': 3600, 'burst': 3},
+                     'ip': {'limit': 60, 'period': 3600, 'burst': 10}},
+        'analysis_report': {'user': {'limit': 30, 'period': 600, 'burst': 5},
+                            'ip': {'limit': 120, 'period': 600, 'burst': 20}},
+        'upload': {'user': {'limit': 20, 'period': 3600, 'burst': 5},
+                   'ip': {'limit': 100, 'period': 3600, 'burst': 20}},
+        'autocomplete': {'user': {'limit': 60, 'period': 60, 'burst': 20},
+                         'ip': {'limit': 300, 'period': 60, 'burst': 60}},
+    # Surcharges partielles, ex: {"analysis": {"user": {"limit": 5}, "ip": null}}
+    }, json.loads(os.environ.get('RATE_LIMITS') or '{}'))
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -48,6 +160,7 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    COUNTER_FLUSH_INTERVAL = 0
 
 config = {
     'development': DevelopmentConfig,
@@ -1,69 +1,70 @@
-# migrate_database.py
-import sqlite3
-import os
+#!/usr/bin/env python3
+# migrate_database.py - MIGRATIONS DU SCHÉMA (SQLite et PostgreSQL)
+#
+#   python migrate_database.py status          versions appliquées et en attente
+#   python migrate_database.py upgrade [--to N] appliquer les migrations en attente
+#   python migrate_database.py stamp [--to N]   marquer comme appliquées sans exécuter
+#
+# Une migration interrompue est rejouée au prochain upgrade: les copies par lots
+# repartent de leur dernier point de reprise.
+import argparse
+
+from sqlalchemy import inspect
+
 from app import create_app
 from models import db
+from migrations import applied_versions, discover, migration_metadata, run_migrations, stamp
+
+
+def show_status():
+    with db.engine.connect() as connection:
+        applied = applied_versions(connection)
+    for migration in discover():
+        applied_at = applied.get(migration.version)
+        state = f"✅ {applied_at:%Y-%m-%d %H:%M}" if applied_at else "⏳ en attente"
+        print(f"v{migration.version:03d} {state:20} {migration.description}")
+
+
+def upgrade(target=None):
+    application_tables = set(db.metadata.tables) - set(migration_metadata.tables)
+    existing = set(inspect(db.engine).get_table_names())
+
+    if not existing & application_tables:
+        # Base vide: le schéma courant contient déjà toutes les migrations
+        db.create_all()
+        stamped = stamp(db.engine, target)
+        print(f"✅ Schéma créé, {len(stamped)} migration(s) marquée(s) comme appliquée(s)")
+        return
+
+    # Tables ajoutées depuis la création de la base: créées directement au schéma courant
+    db.create_all()
+    applied = run_migrations(db.engine, target)
+    if applied:
+        print(f"🎉 {len(applied)} migration(s) appliquée(s)")
+    else:
+        print("✅ Base déjà à jour")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrations du schéma de la base")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('status', help="versions appliquées et en attente")
+    for name, help_text in (('upgrade', "appliquer les migrations en attente"),
+                            ('stamp', "marquer les migrations comme appliquées sans les exécuter")):
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.add_argument('--to', type=int, default=None, help="version cible (incluse)")
+    args = parser.parse_args()
 
-def migrate_database():
     app = create_app()
-    
     with app.app_context():
-        # Chemin vers la base de données
-        db_path = 'remarqpfa.db'
-        
-        if os.path.exists(db_path):
-            # Sauvegarder l'ancienne base
-            backup_path = 'remarqpfa_backup.db'
-            os.rename(db_path, backup_path)
-            print(f"📦 Ancienne base sauvegardée comme {backup_path}")
-            
-            # Créer une nouvelle base avec le bon schéma
-            db.create_all()
-            print("✅ Nouvelle base créée avec le bon schéma")
-            
-            # Migrer les données depuis la sauvegarde
-            old_conn = sqlite3.connect(backup_path)
-            new_conn = sqlite3.connect(db_path)
-            
-            # Migrer les tables une par une
-            tables = ['users', 'comments', 'pfaprojects', 'project_comments', 'project_documents', 'notifications']
-            
-            for table in tables:
-                old_conn.row_factory = sqlite3.Row
-                old_data = old_conn.execute(f'SELECT * FROM {table}').fetchall()
-                
-                if old_data:
-                    columns = ', '.join(old_data[0].keys())
-                    placeholders = ', '.join(['?' for _ in old_data[0].keys()])
-                    
-                    for row in old_data:
-                        new_conn.execute(f'INSERT INTO {table} ({columns}) VALUES ({placeholders})', tuple(row))
-                    
-                    print(f"✅ Données migrées pour {table}: {len(old_data)} lignes")
-            
-            # Migrer guide_stages avec la nouvelle colonne domain
-            try:
-                old_guides = old_conn.execute('SELECT * FROM guide_stages').fetchall()
-                for guide in old_guides:
-                    # Ajouter une valeur par défaut pour domain
-                    new_conn.execute('''
-                        INSERT INTO guide_stages (id, title, description, content, file_path, domain, is_active, created_by, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        guide['id'], guide['title'], guide['description'], guide['content'], 
-                        guide['file_path'], 'web', guide['is_active'], guide['created_by'], guide['created_at']
-                    ))
-                print(f"✅ Guides migrés avec domaine par défaut: {len(old_guides)} guides")
-            except Exception as e:
-                print(f"⚠️  Aucun guide à migrer: {e}")
-            
-            new_conn.commit()
-            old_conn.close()
-            new_conn.close()
-            
-            print("🎉 Migration terminée avec succès!")
+        if args.command == 'status':
+            show_status()
+        elif args.command == 'upgrade':
+            upgrade(args.to)
         else:
-            print("❌ Fichier de base de données non trouvé")
+            stamped = stamp(db.engine, args.to)
+            print(f"✅ {len(stamped)} migration(s) marquée(s) comme appliquée(s)")
+
 
 if __name__ == '__main__':
-    migrate_database()
\ No newline at end of file
+    main()
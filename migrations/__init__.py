@@ -0,0 +1,398 @@
+# migrations/ - MIGRATIONS DU SCHÉMA VERSIONNÉES (une fonction upgrade(connection) par version)
+#
+# Chaque module vNNN_nom.py définit DESCRIPTION et upgrade(connection), et doit
+# pouvoir être relancé sans effet de bord (une migration interrompue est rejouée).
+# Par défaut upgrade() s'exécute dans une transaction enregistrant aussi la
+# version; TRANSACTIONAL = False lui confie ses propres commits (index construits
+# en ligne, copies par lots reprises là où elles s'étaient arrêtées).
+#
+# Point d'entrée unique: python migrate_database.py upgrade (table des versions,
+# verrou consultatif PostgreSQL). Les modules vNNN ne s'exécutent pas seuls: une
+# migration lancée hors du moteur ne serait pas enregistrée et serait rejouée.
+import importlib
+import os
+import re
+import time
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.schema import CreateIndex
+
+MODULE_PATTERN = re.compile(r'^v(\d{3})_(\w+)\.py$')
+PROGRESS_INTERVAL = 2.0
+COPY_CHUNK_SIZE = 5000
+# Verrou consultatif PostgreSQL: un seul processus migre à la fois
+ADVISORY_LOCK_ID = 7261001
+
+migration_metadata = MetaData()
+
+schema_migrations = Table(
+    'schema_migrations', migration_metadata,
+    Column('version', Integer, primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+    Column('duration_ms', Integer, nullable=False),
+)
+
+# Points de reprise des copies par lots (effacés quand la migration aboutit)
+migration_progress = Table(
+    'schema_migration_progress', migration_metadata,
+    Column('version', Integer, primary_key=True),
+    Column('step', String(100), primary_key=True),
+    Column('last_key', Integer, nullable=True),
+    Column('rows_done', Integer, nullable=False, default=0),
+    Column('updated_at', DateTime, nullable=False),
+)
+
+
+class Migration:
+    """Un module de migration découvert dans ce paquet"""
+
+    def __init__(self, version, name):
+        self.version = version
+        self.name = name
+        self._module = None
+
+    @property
+    def module(self):
+        if self._module is None:
+            self._module = importlib.import_module(f'migrations.v{self.version:03d}_{self.name}')
+        return self._module
+
+    @property
+    def description(self):
+        return getattr(self.module, 'DESCRIPTION', self.name)
+
+    @property
+    def transactional(self):
+        return getattr(self.module, 'TRANSACTIONAL', True)
+
+    def __repr__(self):
+        return f'<Migration v{self.version:03d} {self.name}>'
+
+
+def discover():
+    """Migrations du paquet, triées par version"""
+    folder = os.path.dirname(os.path.abspath(__file__))
+    migrations = []
+    for file_name in os.listdir(folder):
+        match = MODULE_PATTERN.match(file_name)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2)))
+    migrations.sort(key=lambda migration: migration.version)
+
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError("Deux migrations portent le même numéro de version")
+    return migrations
+
+
+# ----- Registre des versions appliquées -----
+
+def applied_versions(connection):
+    """{version: date d'application}"""
+    if not inspect(connection).has_table(schema_migrations.name):
+        return {}
+    return dict(connection.execute(select(schema_migrations.c.version, schema_migrations.c.applied_at)).all())
+
+
+def _record(connection, migration, duration):
+    connection.execute(schema_migrations.insert().values(
+        version=migration.version, name=migration.name,
+        applied_at=datetime.utcnow(), duration_ms=int(duration * 1000)
+    ))
+    connection.execute(migration_progress.delete().where(migration_progress.c.version == migration.version))
+
+
+def stamp(engine, target=None):
+    """Marquer comme appliquées les migrations jusqu'à target (toutes par défaut)
+    sans les exécuter: base créée par db.create_all() avec le schéma courant"""
+    migration_metadata.create_all(engine)
+    with engine.begin() as connection:
+        applied = applied_versions(connection)
+        stamped = [migration for migration in discover()
+                   if migration.version not in applied and (target is None or migration.version <= target)]
+        for migration in stamped:
+            _record(connection, migration, 0)
+    return stamped
+
+
+def pending(engine, target=None):
+    with engine.connect() as connection:
+        applied = applied_versions(connection)
+    return [migration for migration in discover()
+            if migration.version not in applied and (target is None or migration.version <= target)]
+
+
+def run_migrations(engine, target=None):
+    """Appliquer les migrations en attente, dans l'ordre; retourne celles appliquées"""
+    migration_metadata.create_all(engine)
+    lock = _acquire_lock(engine)
+    try:
+        done = []
+        for migration in pending(engine, target):
+            print(f"⏳ v{migration.version:03d} {migration.description}")
+            start = time.perf_counter()
+            if migration.transactional:
+                with engine.begin() as connection:
+                    _prepare(connection, migration)
+                    migration.module.upgrade(connection)
+                    _record(connection, migration, time.perf_counter() - start)
+            else:
+                with engine.connect() as connection:
+                    _prepare(connection, migration)
+                    migration.module.upgrade(connection)
+                    connection.commit()
+                    _record(connection, migration, time.perf_counter() - start)
+                    connection.commit()
+            print(f"✅ v{migration.version:03d} appliquée en {time.perf_counter() - start:.1f} s")
+            done.append(migration)
+        return done
+    finally:
+        _release_lock(lock)
+
+
+def _prepare(connection, migration):
+    # Les helpers (copy_rows...) retrouvent la migration en cours via connection.info
+    connection.info['migration'] = migration
+
+
+def _acquire_lock(engine):
+    if engine.dialect.name != 'postgresql':
+        return None
+    connection = engine.connect()
+    connection.execute(text("SELECT pg_advisory_lock(:id)"), {'id': ADVISORY_LOCK_ID})
+    return connection
+
+
+def _release_lock(connection):
+    if connection is not None:
+        connection.execute(text("SELECT pg_advisory_unlock(:id)"), {'id': ADVISORY_LOCK_ID})
+        connection.close()
+
+
+# ----- Helpers pour les migrations -----
+
+def existing_indexes(connection, table_name):
+    """Noms des index d'une table, y compris les index sur expression
+    (que l'inspecteur SQLAlchemy ignore sous SQLite)"""
+    if connection.dialect.name == 'sqlite':
+        query = "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"
+    elif connection.dialect.name == 'postgresql':
+        query = "SELECT indexname FROM pg_indexes WHERE tablename = :table"
+    else:
+        return {index['name'] for index in inspect(connection).get_indexes(table_name)}
+    return {name for (name,) in connection.execute(text(query), {'table': table_name})}
+
+
+def _invalid_postgres_indexes(connection):
+    """Index laissés invalides par un CREATE INDEX CONCURRENTLY interrompu"""
+    return {name for (name,) in connection.execute(text(
+        "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE NOT i.indisvalid"
+    ))}
+
+
+def build_indexes_online(connection, indexes_by_table):
+    """Créer les index manquants ({table: (noms des index du modèle)}) sans bloquer
+    les écritures plus que nécessaire.
+
+    Appelée hors transaction (connexion en autocommit ou validée index par index):
+    PostgreSQL construit chaque index avec CREATE INDEX CONCURRENTLY, les écritures
+    continuent pendant la construction; SQLite crée un index par transaction et
+    rend le verrou d'écriture entre deux index.
+    """
+    from models import db
+
+    postgres = connection.dialect.name == 'postgresql'
+    connection.commit()
+    if postgres:
+        connection = connection.execution_options(isolation_level='AUTOCOMMIT')
+    invalid = _invalid_postgres_indexes(connection) if postgres else set()
+    concurrently = ' CONCURRENTLY' if postgres else ''
+
+    for table_name, index_names in indexes_by_table.items():
+        existing = existing_indexes(connection, table_name)
+        indexes = {index.name: index for index in db.metadata.tables[table_name].indexes}
+        built = 0
+        for name in index_names:
+            if name in existing and name not in invalid:
+                continue
+            if name in invalid:
+                connection.execute(text(f"DROP INDEX{concurrently} IF EXISTS {name}"))
+            statement = str(CreateIndex(indexes[name], if_not_exists=True).compile(dialect=connection.dialect))
+            start = time.perf_counter()
+            connection.execute(text(statement.replace('CREATE INDEX', f'CREATE INDEX{concurrently}', 1)))
+            connection.commit()
+            built += 1
+            print(f"   ✅ {name} créé sur {table_name} en {time.perf_counter() - start:.1f} s")
+
+        if built:
+            # Statistiques à jour pour que le planificateur choisisse les nouveaux index
+            connection.execute(text(f"ANALYZE {table_name}"))
+            connection.commit()
+
+
+def add_column(connection, table_name, column_name, definition):
+    """ALTER TABLE ... ADD COLUMN en place si la colonne manque; retourne True si ajoutée.
+
+    Une valeur DEFAULT constante est appliquée aux lignes existantes sans les
+    réécrire (SQLite, PostgreSQL 11+): l'opération est instantanée.
+    """
+    columns = {column['name'] for column in inspect(connection).get_columns(table_name)}
+    if column_name in columns:
+        return False
+    connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {definition}"))
+    return True
+
+
+class Progress:
+    """Avancement et débit d'une copie, affichés au plus toutes les PROGRESS_INTERVAL secondes"""
+
+    def __init__(self, label, total, done=0):
+        self.label = label
+        self.total = total
+        self.done = done
+        self._start_done = done
+        self._start = self._last = time.perf_counter()
+
+    def advance(self, rows):
+        self.done += rows
+        now = time.perf_counter()
+        if now - self._last >= PROGRESS_INTERVAL or self.done >= self.total:
+            self._last = now
+            self.report()
+
+    def report(self):
+        elapsed = time.perf_counter() - self._start
+        rate = (self.done - self._start_done) / elapsed if elapsed > 0 else 0
+        percent = 100 * self.done / self.total if self.total else 100
+        print(f"   {self.label}: {self.done}/{self.total} lignes ({percent:.0f} %) - {rate:.0f} lignes/s")
+
+
+def _key_chunks(connection, table, key, step, label, chunk_size):
+    """Parcourir table par intervalles de clé (last_key, upper], en reprenant au dernier point validé.
+
+    Pour chaque lot, l'appelant exécute son instruction; le point de reprise est
+    ensuite enregistré (schema_migration_progress) et validé avec elle.
+    Réservé aux migrations TRANSACTIONAL = False.
+    """
+    migration = connection.info.get('migration')
+    if migration is not None and migration.transactional:
+        raise RuntimeError(f"{step} exige une migration TRANSACTIONAL = False")
+    version = migration.version if migration is not None else 0
+
+    checkpoint = connection.execute(
+        select(migration_progress.c.last_key, migration_progress.c.rows_done)
+        .where(migration_progress.c.version == version, migration_progress.c.step == step)
+    ).first()
+    last_key, rows_done = checkpoint if checkpoint else (None, 0)
+    if checkpoint:
+        print(f"   ↻ Reprise de {step} après {key} = {last_key} ({rows_done} lignes déjà traitées)")
+
+    after = f"WHERE {key} > :last_key" if last_key is not None else ""
+    remaining = connection.execute(text(f"SELECT COUNT(*) FROM {table} {after}"),
+                                   {'last_key': last_key}).scalar()
+    progress = Progress(label, rows_done + remaining, rows_done)
+
+    while True:
+        # Borne haute du lot: parcours d'index sur la clé, pas d'OFFSET sur la table entière
+        bounds = connection.execute(text(
+            f"SELECT MAX({key}), COUNT(*) FROM (SELECT {key} FROM {table} {after} ORDER BY {key} LIMIT :limit) chunk"
+        ), {'last_key': last_key, 'limit': chunk_size}).first()
+        upper, count = bounds
+        if not count:
+            break
+
+        condition = f"{key} <= :upper" + (f" AND {key} > :last_key" if last_key is not None else "")
+        yield condition, {'upper': upper, 'last_key': last_key}
+
+        rows_done += count
+        last_key = upper
+        after = f"WHERE {key} > :last_key"
+        _save_checkpoint(connection, version, step, last_key, rows_done)
+        connection.commit()
+        progress.advance(count)
+
+    return rows_done
+
+
+def copy_rows(connection, source, target, columns, key='id', chunk_size=COPY_CHUNK_SIZE):
+    """Copier source -> target par lots de INSERT ... SELECT, en reprenant au dernier lot validé.
+
+    Chaque lot est validé avec son point de reprise (schema_migration_progress):
+    une copie interrompue repart du dernier lot validé. Réservé aux migrations
+    TRANSACTIONAL = False.
+    """
+    column_list = ', '.join(columns)
+    rows = 0
+    for condition, params in _key_chunks(connection, source, key, f'copy:{source}->{target}',
+                                         f'{source} -> {target}', chunk_size):
+        rows += connection.execute(text(
+            f"INSERT INTO {target} ({column_list}) SELECT {column_list} FROM {source} WHERE {condition}"
+        ), params).rowcount
+    return rows
+
+
+def update_rows(connection, table, assignments, where=None, key='id', chunk_size=COPY_CHUNK_SIZE):
+    """UPDATE table SET assignments par lots d'intervalles de clé, en reprenant au dernier lot validé.
+
+    Chaque lot ne verrouille que ses lignes le temps de sa transaction; where
+    (SQL) restreint les lignes modifiées dans chaque lot. Retourne le nombre de
+    lignes modifiées. Réservé aux migrations TRANSACTIONAL = False.
+    """
+    filter_sql = f" AND ({where})" if where else ""
+    updated = 0
+    for condition, params in _key_chunks(connection, table, key, f'update:{table}', table, chunk_size):
+        updated += connection.execute(text(
+            f"UPDATE {table} SET {assignments} WHERE {condition}{filter_sql}"
+        ), params).rowcount
+    return updated
+
+
+def _save_checkpoint(connection, version, step, last_key, rows_done):
+    values = {'last_key': last_key, 'rows_done': rows_done, 'updated_at': datetime.utcnow()}
+    updated = connection.execute(
+        migration_progress.update()
+        .where(migration_progress.c.version == version, migration_progress.c.step == step)
+        .values(**values)
+    ).rowcount
+    if not updated:
+        connection.execute(migration_progress.insert().values(version=version, step=step, **values))
+
+
+def rebuild_table(connection, table_name, chunk_size=COPY_CHUNK_SIZE):
+    """Reconstruire une table SQLite selon le modèle courant quand ALTER ne suffit pas
+    (type ou contrainte de colonne modifiés, colonne supprimée).
+
+    Nouvelle table créée à côté, copie par lots reprenable, puis échange des
+    noms et recréation des index. Sous PostgreSQL, ALTER TABLE couvre ces cas.
+    """
+    if connection.dialect.name != 'sqlite':
+        raise RuntimeError("rebuild_table est réservé à SQLite: utiliser ALTER TABLE sous PostgreSQL")
+    from models import db
+
+    model_table = db.metadata.tables[table_name]
+    rebuilt_name = f'{table_name}__rebuild'
+    # Les tables référencées doivent figurer dans la même MetaData pour résoudre les clés étrangères
+    metadata = MetaData()
+    for table in db.metadata.tables.values():
+        if table.name != table_name:
+            table.to_metadata(metadata)
+    rebuilt = model_table.to_metadata(metadata, name=rebuilt_name)
+    rebuilt.indexes.clear()  # noms d'index globaux sous SQLite: recréés après l'échange
+
+    database = inspect(connection)
+    if database.has_table(table_name):
+        if not database.has_table(rebuilt_name):
+            rebuilt.create(connection)
+            connection.commit()
+        current = {column['name'] for column in database.get_columns(table_name)}
+        columns = [column.name for column in model_table.columns if column.name in current]
+        copy_rows(connection, table_name, rebuilt_name, columns, chunk_size=chunk_size)
+        connection.execute(text(f"DROP TABLE {table_name}"))
+
+    # Reprise possible après le DROP: seul l'échange des noms reste à faire
+    connection.execute(text(f"ALTER TABLE {rebuilt_name} RENAME TO {table_name}"))
+    for index in model_table.indexes:
+        connection.execute(CreateIndex(index, if_not_exists=True))
+    connection.commit()
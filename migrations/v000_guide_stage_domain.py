@@ -0,0 +1,10 @@
+# migrations/v000_guide_stage_domain.py - COLONNE guide_stages.domain (EN PLACE)
+from migrations import add_column
+
+DESCRIPTION = "Ajouter le domaine des guides de stage (valeur par défaut 'web')"
+
+
+def upgrade(connection):
+    # Ancien migrate_database.py: copie complète de la base pour cette seule colonne
+    if add_column(connection, 'guide_stages', 'domain', "VARCHAR(100) NOT NULL DEFAULT 'web'"):
+        print("   ✅ guide_stages.domain ajoutée")
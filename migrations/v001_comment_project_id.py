@@ -0,0 +1,34 @@
+# migrations/v001_comment_project_id.py - CLÉ ÉTRANGÈRE comments.project_id + BACKFILL
+from sqlalchemy import text
+
+from migrations import add_column, build_indexes_online, update_rows
+
+DESCRIPTION = "Lier les évaluations (comments) aux projets par project_id"
+# Backfill par lots et index construits en ligne: upgrade() gère ses propres transactions
+TRANSACTIONAL = False
+
+INDEXES = {
+    'comments': ('ix_comments_project_id', 'idx_jury_project'),
+}
+
+# Même titre et même étudiant d'abord, puis titre seul (ancienne correspondance)
+PROJECT_ID = """COALESCE(
+    (SELECT MIN(p.id) FROM pfaprojects p
+     WHERE p.title = comments.project_title AND p.student_id = comments.student_id),
+    (SELECT MIN(p.id) FROM pfaprojects p WHERE p.title = comments.project_title)
+)"""
+
+
+def upgrade(connection):
+    add_column(connection, 'comments', 'project_id', 'INTEGER REFERENCES pfaprojects(id)')
+    connection.commit()
+
+    # Lignes sans projet correspondant ignorées: elles restent NULL
+    updated = update_rows(connection, 'comments', f"project_id = {PROJECT_ID}",
+                          where="project_id IS NULL AND project_title IN (SELECT title FROM pfaprojects)")
+    orphans = connection.execute(text("SELECT COUNT(*) FROM comments WHERE project_id IS NULL")).scalar()
+    connection.commit()
+    print(f"   ✅ comments.project_id renseigné pour {updated} évaluation(s), {orphans} sans projet")
+
+    # Index après le backfill: pas de maintenance d'index pendant les mises à jour
+    build_indexes_online(connection, INDEXES)
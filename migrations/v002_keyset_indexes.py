@@ -0,0 +1,15 @@
+# migrations/v002_keyset_indexes.py - INDEX COMPOSITES DE LA PAGINATION PAR CLÉ (CONSTRUCTION EN LIGNE)
+from migrations import build_indexes_online
+
+DESCRIPTION = "Index (filtre, clé de tri, id) pour la pagination par clé du classement, de l'exploration et des évaluations"
+# Construction en ligne: upgrade() gère ses propres transactions
+TRANSACTIONAL = False
+
+INDEXES = {
+    'comments': ('idx_public_recommendations_id', 'idx_jury_recommendations_id', 'idx_jury_created_id'),
+    'pfaprojects': ('idx_status_created_id', 'idx_status_popularity_id'),
+}
+
+
+def upgrade(connection):
+    build_indexes_online(connection, INDEXES)
@@ -0,0 +1,17 @@
+# migrations/v003_hot_query_indexes.py - INDEX COMPOSITES DES REQUÊTES CHAUDES (CONSTRUCTION EN LIGNE)
+from migrations import build_indexes_online
+
+DESCRIPTION = "Index (status, tri) des projets publiés et (is_public, recommendations, created_at) des évaluations"
+# Construction en ligne: upgrade() gère ses propres transactions
+TRANSACTIONAL = False
+
+INDEXES = {
+    'pfaprojects': ('idx_status_likes_id', 'idx_status_views_id', 'idx_status_domain_likes',
+                    'idx_status_created_id', 'idx_status_popularity_id'),
+    'comments': ('idx_public_recommendations_created', 'idx_public_recommendations_id',
+                 'idx_jury_recommendations_id', 'idx_jury_created_id'),
+}
+
+
+def upgrade(connection):
+    build_indexes_online(connection, INDEXES)
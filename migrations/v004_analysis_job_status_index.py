@@ -0,0 +1,17 @@
+# migrations/v004_analysis_job_status_index.py - INDEX DU PLAFOND GLOBAL DES ANALYSES
+from migrations import existing_indexes
+
+DESCRIPTION = "Index (status, created_at) des jobs d'analyse pour compter les analyses en cours"
+
+INDEX_NAME = 'idx_job_status_created'
+
+
+def upgrade(connection):
+    from models import db
+
+    if INDEX_NAME in existing_indexes(connection, 'analysis_jobs'):
+        return
+    for index in db.metadata.tables['analysis_jobs'].indexes:
+        if index.name == INDEX_NAME:
+            index.create(connection)
+            print(f"   ✅ {INDEX_NAME} créé sur analysis_jobs")
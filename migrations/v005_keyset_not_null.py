@@ -0,0 +1,43 @@
+# migrations/v005_keyset_not_null.py - CLÉS DE PAGINATION NOT NULL (BACKFILL + CONTRAINTE)
+from sqlalchemy import inspect, text
+
+from migrations import rebuild_table
+
+DESCRIPTION = "Renseigner puis passer en NOT NULL les colonnes servant de clés de pagination"
+# Reconstruction SQLite par lots: upgrade() gère ses propres transactions
+TRANSACTIONAL = False
+
+# {table: {colonne: valeur des lignes NULL}}
+COLUMNS = {
+    'comments': {'recommendations': '0', 'created_at': 'COALESCE(updated_at, CURRENT_TIMESTAMP)'},
+    'pfaprojects': {'likes_count': '0', 'views_count': '0',
+                    'created_at': 'COALESCE(updated_at, CURRENT_TIMESTAMP)'},
+}
+
+
+def upgrade(connection):
+    postgres = connection.dialect.name == 'postgresql'
+
+    for table_name, columns in COLUMNS.items():
+        for column, value in columns.items():
+            updated = connection.execute(text(
+                f"UPDATE {table_name} SET {column} = {value} WHERE {column} IS NULL"
+            )).rowcount
+            if updated:
+                print(f"   ✅ {table_name}.{column}: {updated} ligne(s) NULL renseignée(s)")
+        connection.commit()
+
+        nullable = {column['name'] for column in inspect(connection).get_columns(table_name)
+                    if column['nullable']}
+        pending = [column for column in columns if column in nullable]
+        if not pending:
+            continue
+
+        if postgres:
+            for column in pending:
+                connection.execute(text(f"ALTER TABLE {table_name} ALTER COLUMN {column} SET NOT NULL"))
+            connection.commit()
+        else:
+            # SQLite ne sait pas modifier la contrainte d'une colonne: table reconstruite
+            rebuild_table(connection, table_name)
+        print(f"   ✅ {table_name}: {', '.join(pending)} NOT NULL")
@@ -0,0 +1,17 @@
+# migrations/v006_technology_slug_prefix_index.py - INDEX DE PRÉFIXE DES TECHNOLOGIES (POSTGRESQL)
+from migrations import build_indexes_online
+
+DESCRIPTION = "Index (slug COLLATE \"C\", project_id) de project_technologies pour le filtre par préfixe (PostgreSQL)"
+# Construction en ligne: upgrade() gère ses propres transactions
+TRANSACTIONAL = False
+
+INDEXES = {
+    'project_technologies': ('idx_project_technologies_slug_c',),
+}
+
+
+def upgrade(connection):
+    # SQLite: l'index (slug, project_id) sert déjà l'intervalle, rien à créer
+    if connection.dialect.name != 'postgresql':
+        return
+    build_indexes_online(connection, INDEXES)
@@ -0,0 +1,14 @@
+# migrations/v007_status_likes_views_index.py - INDEX (STATUS, LIKES, VUES) DES PROJETS À ÉVALUER
+from migrations import build_indexes_online
+
+DESCRIPTION = "Index (status, likes_count, views_count, id) des projets proposés aux jurys"
+# Construction en ligne: upgrade() gère ses propres transactions
+TRANSACTIONAL = False
+
+INDEXES = {
+    'pfaprojects': ('idx_status_likes_views_id',),
+}
+
+
+def upgrade(connection):
+    build_indexes_online(connection, INDEXES)
@@ -0,0 +1,10 @@
+# migrations/v008_technology_index_backfill.py - REMPLISSAGE DE L'INDEX DES TECHNOLOGIES
+DESCRIPTION = "Remplissage de project_technologies et technology_counts depuis les projets existants"
+
+
+def upgrade(connection):
+    from utils.technology_index import rebuild_technology_index
+
+    # Reconstruction complète: rejouable sans effet de bord
+    rows = rebuild_technology_index(connection)
+    print(f"   ✅ {rows} technologie(s) de projet indexée(s)")
@@ -1,7 +1,7 @@
 # models.py - VERSION CORRIGÉE SANS WARNINGS
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from utils.passwords import hash_password, verify_password, needs_rehash
 from datetime import datetime
 import json
 
@@ -49,11 +49,14 @@ class User(UserMixin, db.Model):
                                    backref='user', 
                                    lazy='dynamic')
 
-    def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+    def set_password(self, password, method=None):
+        self.password_hash = hash_password(password, method)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        return needs_rehash(self.password_hash)
     
     def get_full_name(self):
         if self.first_name and self.last_name:
@@ -80,11 +83,13 @@ class Comment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     jury_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('pfaprojects.id'), nullable=True, index=True)
     project_title = db.Column(db.String(200), nullable=False)
     content = db.Column(db.Text, nullable=False)
-    recommendations = db.Column(db.Integer, default=0)
+    # Clés de pagination (utils/pagination.py): jamais NULL
+    recommendations = db.Column(db.Integer, nullable=False, default=0)
     is_public = db.Column(db.Boolean, default=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Index composites
@@ -92,12 +97,17 @@ class Comment(db.Model):
         db.Index('idx_student_created', 'student_id', 'created_at'),
         db.Index('idx_jury_created', 'jury_id', 'created_at'),
         db.Index('idx_recommendations', 'recommendations', 'created_at'),
+        db.Index('idx_jury_project', 'jury_id', 'project_id'),
+        # Pagination par clé (utils/pagination.py): classement public et évaluations d'un jury
+        db.Index('idx_public_recommendations_id', 'is_public', 'recommendations', 'id'),
+        # Classement filtré par période: created_at lu dans l'index pendant le parcours
+        db.Index('idx_public_recommendations_created', 'is_public', 'recommendations', 'created_at'),
+        db.Index('idx_jury_recommendations_id', 'jury_id', 'recommendations', 'id'),
+        db.Index('idx_jury_created_id', 'jury_id', 'created_at', 'id'),
     )
-
-    def increment_recommendations(self):
-        self.recommendations += 1
-        db.session.commit()
     
+    project = db.relationship('PFAProject', foreign_keys=[project_id], backref=db.backref('evaluations', lazy='dynamic'))
+
     def get_truncated_content(self, length=150):
         if len(self.content) <= length:
             return self.content
@@ -121,15 +131,26 @@ class PFAProject(db.Model):
     demo_url = db.Column(db.String(500), nullable=True)
     status = db.Column(db.String(20), default='draft')
     is_public = db.Column(db.Boolean, default=True)
-    views_count = db.Column(db.Integer, default=0)
-    likes_count = db.Column(db.Integer, default=0)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Clés de pagination (utils/pagination.py): jamais NULL
+    views_count = db.Column(db.Integer, nullable=False, default=0)
+    likes_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     ai_analysis_data = db.Column(db.JSON, nullable=True)
     ai_adaptability_score = db.Column(db.Integer, default=0)
     ai_analysis_date = db.Column(db.DateTime, nullable=True)
     has_ai_analysis = db.Column(db.Boolean, default=False)
     
+    # Listes de projets publiés: filtre sur status puis tri (départage par id)
+    __table_args__ = (
+        db.Index('idx_status_created_id', status, created_at, id),
+        db.Index('idx_status_popularity_id', status, likes_count + views_count, id),
+        db.Index('idx_status_likes_id', status, likes_count, id),
+        db.Index('idx_status_likes_views_id', status, likes_count, views_count, id),
+        db.Index('idx_status_views_id', status, views_count, id),
+        db.Index('idx_status_domain_likes', status, domain, likes_count),
+    )
+    
     # Relations CORRIGÉES
     documents = db.relationship('ProjectDocument', 
                                backref='project', 
@@ -142,12 +163,14 @@ class PFAProject(db.Model):
                               cascade='all, delete-orphan')
     
     def increment_views(self):
-        self.views_count += 1
-        db.session.commit()
+        # Écriture différée par lots (utils/counters.py)
+        from utils.counters import counter_buffer
+        counter_buffer.increment(self, 'views_count')
     
     def increment_likes(self):
-        self.likes_count += 1
-        db.session.commit()
+        # Écriture différée par lots (utils/counters.py)
+        from utils.counters import counter_buffer
+        counter_buffer.increment(self, 'likes_count')
     
     def get_documents_count(self):
         return self.documents.count()
@@ -155,9 +178,66 @@ class PFAProject(db.Model):
     def get_comments_count(self):
         return self.comments.count()
     
+    @staticmethod
+    def get_comment_counts(projects):
+        """{id: nombre de commentaires} d'une liste de projets, en une requête groupée"""
+        project_ids = [p.id for p in projects]
+        if not project_ids:
+            return {}
+        return dict(db.session.query(ProjectComment.project_id, db.func.count(ProjectComment.id))
+                    .filter(ProjectComment.project_id.in_(project_ids))
+                    .group_by(ProjectComment.project_id).all())
+    
     def __repr__(self):
         return f'<PFAProject {self.id} - {self.title}>'
 
+class UserLike(db.Model):
+    """Like ou recommandation donné par un utilisateur (au plus un par cible)"""
+    
+    __tablename__ = 'user_likes'
+    
+    TARGET_COMMENT = 'comment'
+    TARGET_PROJECT_COMMENT = 'project_comment'
+    
+    target_type = db.Column(db.String(20), primary_key=True)
+    target_id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    
+    def __repr__(self):
+        return f'<UserLike {self.user_id} -> {self.target_type} {self.target_id}>'
+
+class ProjectTechnology(db.Model):
+    """Technologies d'un projet (une ligne par technologie, maintenue par utils/technology_index.py)"""
+    
+    __tablename__ = 'project_technologies'
+    
+    project_id = db.Column(db.Integer, db.ForeignKey('pfaprojects.id', ondelete='CASCADE'), primary_key=True)
+    slug = db.Column(db.String(100), primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    # Copie du statut du projet: les compteurs ne comptent que les projets publiés
+    published = db.Column(db.Boolean, nullable=False, default=False)
+    
+    __table_args__ = (
+        db.Index('idx_project_technologies_slug', 'slug', 'project_id'),
+        # Intervalle de préfixe sous PostgreSQL: comparaisons octet par octet (collation "C")
+        db.Index('idx_project_technologies_slug_c', slug.collate('C'), project_id).ddl_if(dialect='postgresql'),
+    )
+    
+    def __repr__(self):
+        return f'<ProjectTechnology {self.project_id} - {self.name}>'
+
+class TechnologyCount(db.Model):
+    """Nombre de projets publiés par technologie (nuage de l'explorateur)"""
+    
+    __tablename__ = 'technology_counts'
+    
+    slug = db.Column(db.String(100), primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    projects_count = db.Column(db.Integer, nullable=False, default=0, index=True)
+    
+    def __repr__(self):
+        return f'<TechnologyCount {self.name}: {self.projects_count}>'
+
 class GuideStage(db.Model):
     """Modèle pour les guides de structure des rapports"""
     
@@ -191,8 +271,9 @@ class ProjectComment(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def increment_likes(self):
-        self.likes_count += 1
-        db.session.commit()
+        # Écriture différée par lots (utils/counters.py)
+        from utils.counters import counter_buffer
+        counter_buffer.increment(self, 'likes_count')
     
     def __repr__(self):
         return f'<ProjectComment {self.id} - Projet {self.project_id}>'
@@ -214,8 +295,9 @@ class ProjectDocument(db.Model):
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def increment_downloads(self):
-        self.downloads_count += 1
-        db.session.commit()
+        # Écriture différée par lots (utils/counters.py)
+        from utils.counters import counter_buffer
+        counter_buffer.increment(self, 'downloads_count')
     
     def __repr__(self):
         return f'<ProjectDocument {self.id} - {self.title}>'
@@ -269,4 +351,51 @@ class UploadedGuide(db.Model):
     user = db.relationship('User', foreign_keys=[user_id])
     
     def __repr__(self):
-        return f'<UploadedGuide {self.id} - {self.title}>'
\ No newline at end of file
+        return f'<UploadedGuide {self.id} - {self.title}>'
+
+class AnalysisJob(db.Model):
+    """Modèle pour les analyses de rapports exécutées en arrière-plan"""
+    
+    __tablename__ = 'analysis_jobs'
+    
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('pfaprojects.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    document_id = db.Column(db.Integer, db.ForeignKey('project_documents.id'), nullable=False)
+    guide_id = db.Column(db.Integer, db.ForeignKey('uploaded_guides.id'), nullable=True)
+    kind = db.Column(db.String(20), nullable=False, default='real')
+    status = db.Column(db.String(20), nullable=False, default=STATUS_QUEUED)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    __table_args__ = (
+        db.Index('idx_job_project_status', 'project_id', 'status'),
+        # Plafond global des analyses (utils/analysis_jobs.check_analysis_capacity)
+        db.Index('idx_job_status_created', 'status', 'created_at'),
+    )
+    
+    def is_active(self):
+        return self.status in self.ACTIVE_STATUSES
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'project_id': self.project_id,
+            'kind': self.kind,
+            'status': self.status,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+    
+    def __repr__(self):
+        return f'<AnalysisJob {self.id} - Projet {self.project_id} ({self.status})>'
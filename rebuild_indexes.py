@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+# rebuild_indexes.py - RECONSTRUIRE LES INDEX DÉRIVÉS DES PROJETS
+#
+# Le remplissage initial est fait par les migrations (migrate_database.py upgrade, v008);
+# ce script reconstruit les index après une modification hors application.
+from app import create_app
+from models import db
+from utils.technology_index import rebuild_technology_index
+from utils.search import rebuild_search_index
+
+
+def rebuild_indexes():
+    db.create_all()
+
+    print("🔧 Reconstruction de l'index des technologies...")
+    rows = rebuild_technology_index()
+    print(f"   ✅ {rows} technologie(s) indexée(s)")
+
+    print("🔧 Reconstruction de l'index de recherche plein texte...")
+    projects = rebuild_search_index()
+    print(f"   ✅ {projects} projet(s) indexé(s)")
+
+    print("🎉 Index reconstruits")
+
+
+if __name__ == '__main__':
+    app = create_app()
+    with app.app_context():
+        rebuild_indexes()
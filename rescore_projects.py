@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# rescore_projects.py - RE-SCORER TOUS LES PROJETS AYANT DES DOCUMENTS
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import update
+
+from app import create_app
+from models import db, PFAProject, ProjectDocument, UploadedGuide
+from utils.analysis_jobs import compute_analysis, DOCUMENTS_FOLDER, GUIDES_FOLDER
+
+DEFAULT_CHECKPOINT = os.path.join('instance', 'rescore_checkpoint.json')
+
+
+def _rescore(task):
+    """Exécuté dans un processus du pool: (project_id, résultat, erreur)"""
+    project_id, file_path, domain, guide_data, guide_title, guide_id = task
+    try:
+        result = compute_analysis(file_path, domain, guide_data, guide_title, guide_id)
+        return project_id, result, None
+    except Exception as e:
+        return project_id, None, str(e)
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_checkpoint(path, data):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def get_projects_to_rescore(after_id=0):
+    """(id, domaine, dernier document) des projets ayant au moins un document"""
+    rows = db.session.query(PFAProject.id, PFAProject.domain, ProjectDocument.file_path)\
+        .join(ProjectDocument, ProjectDocument.project_id == PFAProject.id)\
+        .filter(PFAProject.id > after_id)\
+        .order_by(PFAProject.id, ProjectDocument.uploaded_at.desc(), ProjectDocument.id.desc())\
+        .all()
+
+    projects = []
+    seen = set()
+    for project_id, domain, file_path in rows:
+        if project_id in seen:
+            continue
+        seen.add(project_id)
+        projects.append((project_id, domain, file_path))
+    return projects
+
+
+def write_results(results, analysis_date):
+    """UPDATE groupé (executemany) des résultats d'un lot"""
+    rows = [{
+        'id': project_id,
+        'has_ai_analysis': True,
+        'ai_analysis_data': result,
+        'ai_analysis_date': analysis_date,
+        'ai_adaptability_score': result['overall_score']
+    } for project_id, result in results]
+
+    if rows:
+        db.session.execute(update(PFAProject), rows)
+    db.session.commit()
+
+
+def rescore_projects(workers=None, chunk_size=50, guide_id=None, checkpoint_path=DEFAULT_CHECKPOINT, resume=False):
+    guide_data = guide_title = None
+    if guide_id:
+        from routes.ai_routes import load_guide_data
+
+        guide = UploadedGuide.query.get(guide_id)
+        if not guide:
+            print(f"❌ Guide {guide_id} introuvable")
+            return
+        guide_data = load_guide_data(os.path.join(GUIDES_FOLDER, guide.file_path), guide.file_name)
+        if not guide_data:
+            print(f"❌ Erreur chargement guide {guide_id}")
+            return
+        guide_title = guide.title
+
+    checkpoint = load_checkpoint(checkpoint_path) if resume else {}
+    if checkpoint and checkpoint.get('guide_id') != guide_id:
+        print("⚠️ Checkpoint créé avec un autre guide, reprise depuis le début")
+        checkpoint = {}
+
+    last_id = checkpoint.get('last_project_id', 0)
+    processed = checkpoint.get('processed', 0)
+    failed = checkpoint.get('failed', 0)
+
+    projects = get_projects_to_rescore(last_id)
+    total = len(projects)
+    if last_id:
+        print(f"🔁 Reprise après le projet {last_id} ({processed} déjà traités)")
+    print(f"📊 {total} projet(s) à re-scorer avec {workers or os.cpu_count()} worker(s)")
+
+    started = time.perf_counter()
+    done = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, total, chunk_size):
+            chunk = projects[start:start + chunk_size]
+            tasks = [
+                (project_id, os.path.join(DOCUMENTS_FOLDER, file_path), domain, guide_data, guide_title, guide_id)
+                for project_id, domain, file_path in chunk
+            ]
+
+            results = []
+            for project_id, result, error in executor.map(_rescore, tasks):
+                if error:
+                    failed += 1
+                    print(f"   ❌ Projet {project_id}: {error}")
+                else:
+                    results.append((project_id, result))
+
+            write_results(results, datetime.now())
+
+            done += len(chunk)
+            processed += len(chunk)
+            elapsed = time.perf_counter() - started
+            save_checkpoint(checkpoint_path, {
+                'guide_id': guide_id,
+                'last_project_id': chunk[-1][0],
+                'processed': processed,
+                'failed': failed
+            })
+            print(f"   ✅ {done}/{total} documents - {done / elapsed:.1f} documents/s")
+
+    elapsed = time.perf_counter() - started
+    rate = done / elapsed if elapsed > 0 else 0
+    print(f"🎉 {done} document(s) re-scorés en {elapsed:.1f}s ({rate:.1f} documents/s), {failed} échec(s)")
+
+    # Exécution terminée: le prochain lancement repart de zéro
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Re-scorer tous les projets PFA ayant des documents")
+    parser.add_argument('--workers', type=int, default=None, help="Nombre de processus (défaut: nombre de CPU)")
+    parser.add_argument('--chunk-size', type=int, default=50, help="Projets par lot d'UPDATE")
+    parser.add_argument('--guide-id', type=int, default=None, help="Guide uploadé à utiliser (analyse guidée)")
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT, help="Fichier de checkpoint")
+    parser.add_argument('--resume', action='store_true', help="Reprendre après le dernier lot validé")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        rescore_projects(
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            guide_id=args.guide_id,
+            checkpoint_path=args.checkpoint,
+            resume=args.resume
+        )
@@ -1,8 +1,11 @@
-from flask import Blueprint, render_template, redirect, url_for, request, flash
+import hmac
+
+from flask import Blueprint, render_template, redirect, url_for, request, flash, current_app, abort
 from flask_login import login_required, current_user
 from models import User, db
 from werkzeug.security import generate_password_hash
 from utils.validators import validate_email, validate_password, validate_username, validate_name
+from utils.perf import perf_recorder
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -148,3 +151,41 @@ def delete_user(user_id):
 
     flash(f'Utilisateur {user.username} supprimé avec succès.', 'success')
     return redirect(url_for('admin.dashboard'))
+
+@admin_bp.route('/perf')
+@login_required
+def perf():
+    if current_user.role != 'admin':
+        flash('Accès non autorisé.', 'danger')
+        return redirect(url_for('public.home'))
+    
+    return render_template('admin/perf.html',
+                           endpoints=perf_recorder.snapshot(),
+                           budgets=current_app.config.get('PERF_BUDGETS', {}),
+                           default_statements=current_app.config.get('PERF_DEFAULT_STATEMENT_BUDGET'),
+                           default_ms=current_app.config.get('PERF_DEFAULT_TIME_BUDGET_MS'))
+
+@admin_bp.route('/perf/reset', methods=['POST'])
+@login_required
+def perf_reset():
+    if current_user.role != 'admin':
+        flash('Accès non autorisé.', 'danger')
+        return redirect(url_for('public.home'))
+    
+    perf_recorder.reset()
+    flash('Mesures de performance réinitialisées.', 'success')
+    return redirect(url_for('admin.perf'))
+
+@admin_bp.route('/perf/metrics')
+def perf_metrics():
+    """Métriques au format Prometheus (jeton Bearer ou session administrateur)"""
+    token = current_app.config.get('PERF_METRICS_TOKEN')
+    # Comparaison en temps constant: la durée ne révèle pas le préfixe correct du jeton
+    authorized = bool(token) and hmac.compare_digest(
+        request.headers.get('Authorization', '').encode('utf-8'), f'Bearer {token}'.encode('utf-8')
+    )
+    if not authorized and not (current_user.is_authenticated and current_user.role == 'admin'):
+        abort(403)
+    
+    return current_app.response_class(perf_recorder.prometheus(),
+                                      mimetype='text/plain; version=0.0.4')
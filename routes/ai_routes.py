@@ -5,14 +5,17 @@ import json
 import math
 from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, send_file
 from flask_login import login_required, current_user
+from werkzeug.exceptions import HTTPException
 from datetime import datetime
-from models import db, PFAProject, ProjectDocument, GuideStage, UploadedGuide
-import io
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import cm
+from models import db, PFAProject, ProjectDocument, GuideStage, UploadedGuide, AnalysisJob
+from utils.analysis_jobs import enqueue_analysis, get_latest_job
+from utils.pdf_text import extract_pdf_text
+from utils.guide_matcher import get_guide_matcher
+from utils.text_metrics import (TextMetrics, SECTIONS, SECTION_PATTERNS, TECHNICAL_TERMS_PATTERN,
+                                INLINE_MATH_PATTERN, EQUATION_PATTERN, TRANSITION_WORDS)
+from utils.pdf_export import render_analysis_report
+from utils.rate_limit import rate_limit
+from config import Config
 
 ai_bp = Blueprint('ai', __name__)
 
@@ -21,6 +24,7 @@ ai_bp = Blueprint('ai', __name__)
 @ai_bp.route('/upload-guide', methods=['GET', 'POST'])
 @ai_bp.route('/upload-guide/<int:project_id>', methods=['GET', 'POST'])
 @login_required
+@rate_limit('upload', methods=('POST',))
 def upload_guide(project_id=None):
     """Uploader un guide personnalisé"""
     if request.method == 'POST':
@@ -160,33 +164,15 @@ def guided_analysis(project_id):
                 flash('❌ Guide non trouvé', 'error')
                 return redirect(url_for('ai.guided_analysis', project_id=project_id))
             
-            # Charger le guide
-            guide_file_path = os.path.join('static', 'uploads', 'guides', guide.file_path)
-            guide_data = load_guide_data(guide_file_path, guide.file_name)
+            # Analyser en arrière-plan
+            job = enqueue_analysis(project, document, current_user.id, guide=guide)
             
-            if not guide_data:
-                flash('❌ Erreur chargement guide', 'error')
-                return redirect(url_for('ai.guided_analysis', project_id=project_id))
-            
-            # Analyser
-            file_path = os.path.join('static', 'uploads', 'documents', document.file_path)
-            content = extract_text_from_pdf(file_path)
-            analysis_result = analyze_with_uploaded_guide(content, project.domain, guide_data, guide.title)
-            
-            # Sauvegarder
-            project.has_ai_analysis = True
-            project.ai_analysis_data = analysis_result
-            project.ai_analysis_date = datetime.now()
-            project.ai_adaptability_score = analysis_result['overall_score']
-            db.session.commit()
-            
-            return render_template('student/guided_analysis_results.html',
-                                 project=project,
-                                 analysis=analysis_result,
-                                 document=document,
-                                 guide=guide)
+            return redirect(url_for('ai.real_analysis_results', project_id=project_id, job_id=job.id))
             
+        except HTTPException:
+            raise
         except Exception as e:
+            db.session.rollback()
             flash(f'❌ Erreur analyse: {str(e)}', 'error')
             return redirect(url_for('ai.analysis_page', project_id=project_id))
 
@@ -202,18 +188,12 @@ def real_analysis(project_id):
             flash('❌ Uploader un PDF d\'abord', 'error')
             return redirect(url_for('ai.analysis_page', project_id=project_id))
         
-        file_path = os.path.join('static', 'uploads', 'documents', document.file_path)
-        content = extract_text_from_pdf(file_path)
-        analysis_result = analyze_with_mathematical_models(content, project.domain)
+        job = enqueue_analysis(project, document, current_user.id)
         
-        project.has_ai_analysis = True
-        project.ai_analysis_data = analysis_result
-        project.ai_analysis_date = datetime.now()
-        project.ai_adaptability_score = analysis_result['overall_score']
-        db.session.commit()
-        
-        return redirect(url_for('ai.real_analysis_results', project_id=project_id))
+        return redirect(url_for('ai.real_analysis_results', project_id=project_id, job_id=job.id))
         
+    except HTTPException:
+        raise
     except Exception as e:
         db.session.rollback()
         flash(f'❌ Erreur analyse: {str(e)}', 'error')
@@ -225,16 +205,42 @@ def real_analysis_results(project_id):
     """Résultats analyse réelle"""
     project = PFAProject.query.filter_by(id=project_id, student_id=current_user.id).first_or_404()
     
+    # Analyse en cours: afficher la progression jusqu'à l'arrivée du résultat
+    job = get_latest_job(project_id)
+    if job and job.is_active():
+        return render_template('student/analysis_progress.html', project=project, job=job)
+    
+    requested_job_id = request.args.get('job_id', type=int)
+    if job and job.id == requested_job_id and job.status == AnalysisJob.STATUS_FAILED:
+        flash(f'❌ Erreur analyse: {job.error}', 'error')
+        return redirect(url_for('ai.analysis_page', project_id=project_id))
+    
     if not project.has_ai_analysis:
         flash('ℹ️ Aucune analyse disponible', 'info')
         return redirect(url_for('ai.analysis_page', project_id=project_id))
     
+    if project.ai_analysis_data['structure'].get('guide_used'):
+        return render_template('student/guided_analysis_results.html',
+                             project=project,
+                             analysis=project.ai_analysis_data)
+    
     return render_template('student/real_analysis_results.html',
                          project=project,
                          analysis=project.ai_analysis_data)
 
+@ai_bp.route('/jobs/<int:job_id>')
+@login_required
+def job_status(job_id):
+    """Statut d'un job d'analyse (polling)"""
+    job = AnalysisJob.query.filter_by(id=job_id, user_id=current_user.id).first_or_404()
+    
+    data = job.to_dict()
+    data['results_url'] = url_for('ai.real_analysis_results', project_id=job.project_id, job_id=job.id)
+    return jsonify(data)
+
 @ai_bp.route('/download-real-analysis/<int:project_id>')
 @login_required
+@rate_limit('analysis_report')
 def download_real_analysis(project_id):
     """Télécharger PDF analyse"""
     try:
@@ -244,65 +250,7 @@ def download_real_analysis(project_id):
             flash('❌ Aucune analyse disponible', 'error')
             return redirect(url_for('ai.analysis_page', project_id=project_id))
         
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-        styles = getSampleStyleSheet()
-        story = []
-        
-        # Titre
-        title_style = ParagraphStyle(
-            'TitleStyle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#2C3E50'),
-            spaceAfter=30,
-            alignment=1
-        )
-        story.append(Paragraph("ANALYSE DU RAPPORT PFA", title_style))
-        
-        # Informations
-        story.append(Paragraph(f"<b>Projet:</b> {project.title}", styles['Normal']))
-        story.append(Paragraph(f"<b>Domaine:</b> {project.domain}", styles['Normal']))
-        story.append(Paragraph(f"<b>Score global:</b> {project.ai_analysis_data['overall_score']}/100", styles['Normal']))
-        story.append(Paragraph(f"<b>Date:</b> {project.ai_analysis_date.strftime('%d/%m/%Y à %H:%M')}", styles['Normal']))
-        story.append(Spacer(1, 20))
-        
-        # Scores
-        story.append(Paragraph("SCORES DÉTAILLÉS:", styles['Heading2']))
-        
-        scores_data = [
-            ['Catégorie', 'Score', 'Détails'],
-            ['Structure', f"{project.ai_analysis_data['structure']['score']}/100", 
-             f"{len(project.ai_analysis_data['structure']['sections_detected'])} sections"],
-            ['Technique', f"{project.ai_analysis_data['technical']['score']}/100", 
-             f"{project.ai_analysis_data['technical']['terms_count']} termes"],
-            ['Mathématique', f"{project.ai_analysis_data['mathematical']['score']}/100", 
-             f"{project.ai_analysis_data['mathematical']['complexity_level']}"],
-            ['Qualité', f"{project.ai_analysis_data['quality']['score']}/100", 
-             f"{project.ai_analysis_data['quality']['readability']} lisibilité"]
-        ]
-        
-        scores_table = Table(scores_data, colWidths=[4*cm, 2*cm, 4*cm])
-        scores_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2C3E50')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-        ]))
-        
-        story.append(scores_table)
-        story.append(Spacer(1, 20))
-        
-        # Recommandations
-        if project.ai_analysis_data['recommendations']:
-            story.append(Paragraph("RECOMMANDATIONS:", styles['Heading2']))
-            for rec in project.ai_analysis_data['recommendations']:
-                story.append(Paragraph(f"• {rec}", styles['Normal']))
-        
-        doc.build(story)
-        buffer.seek(0)
+        buffer = render_analysis_report(project)
         
         filename = f"analyse_{project.title.replace(' ', '_')}.pdf"
         return send_file(buffer, as_attachment=True, download_name=filename, mimetype='application/pdf')
@@ -334,108 +282,70 @@ def load_guide_data(file_path, file_name):
     except:
         return None
 
-def analyze_with_uploaded_guide(content, domain, guide_data, guide_title):
+def analyze_with_uploaded_guide(content, domain, guide_data, guide_title, guide_id=None):
     """Analyser avec guide uploadé"""
-    structure_score = calculate_guide_structure_score(content, guide_data)
-    technical_score = calculate_technical_score_math(content, domain)
-    math_complexity = calculate_mathematical_complexity(content)
-    quality_score = calculate_quality_score_math(content)
+    guide_match = get_guide_matcher(guide_data, guide_id).match(content)
+    metrics = TextMetrics(content)
+    structure_score = guide_match.structure_score
+    technical_score = metrics.technical_score
+    math_complexity = metrics.mathematical_complexity
+    quality_score = metrics.quality_score
     
     overall_score = calculate_overall_score_math(
         structure_score, technical_score, math_complexity, quality_score
     )
     
-    compliance = calculate_guide_compliance(content, guide_data)
+    compliance = guide_match.compliance
     
     return {
         'overall_score': round(overall_score, 2),
         'structure': {
             'score': round(structure_score, 2),
-            'sections_detected': detect_sections_with_guide(content, guide_data),
-            'sections_missing': find_missing_sections(content, guide_data),
+            'sections_detected': guide_match.detected,
+            'sections_missing': guide_match.missing,
             'compliance': f"{compliance}%",
             'guide_used': guide_title
         },
         'technical': {
             'score': round(technical_score, 2),
-            'terms_found': extract_technical_terms(content),
-            'terms_count': len(extract_technical_terms(content))
+            'terms_found': metrics.technical_terms,
+            'terms_count': len(metrics.technical_terms)
         },
         'mathematical': {
             'score': round(math_complexity, 2),
-            'equations_count': count_mathematical_elements(content),
+            'equations_count': metrics.math_elements,
             'complexity_level': get_complexity_level(math_complexity)
         },
         'quality': {
             'score': round(quality_score, 2),
-            'readability': round(calculate_readability_index(content), 2),
-            'coherence': round(calculate_coherence_score(content), 2)
+            'readability': round(metrics.readability, 2),
+            'coherence': round(metrics.coherence, 2)
         },
-        'recommendations': generate_guided_recommendations(content, guide_data, structure_score, technical_score)
+        'recommendations': generate_guided_recommendations(
+            content, guide_data, structure_score, technical_score, missing_sections=guide_match.missing
+        )
     }
 
 # ========== FONCTIONS D'ANALYSE (GARDER CELLES EXISTANTES) ==========
 
 def calculate_guide_structure_score(content, guide_data):
-    required_sections = guide_data.get('required_sections', [])
-    section_patterns = guide_data.get('section_patterns', {})
-    
-    if not required_sections:
-        return 50
-    
-    detected_count = 0
-    for section in required_sections:
-        pattern = section_patterns.get(section, f'\\b{section}\\b')
-        if re.search(pattern, content.lower(), re.IGNORECASE):
-            detected_count += 1
-    
-    score = (detected_count / len(required_sections)) * 100
-    return min(100, score)
+    return get_guide_matcher(guide_data).match(content).structure_score
 
 def calculate_guide_compliance(content, guide_data):
-    required_sections = guide_data.get('required_sections', [])
-    section_patterns = guide_data.get('section_patterns', {})
-    
-    if not required_sections:
-        return 0
-    
-    detected_count = 0
-    for section in required_sections:
-        pattern = section_patterns.get(section, f'\\b{section}\\b')
-        if re.search(pattern, content.lower(), re.IGNORECASE):
-            detected_count += 1
-    
-    return round((detected_count / len(required_sections)) * 100, 1)
+    return get_guide_matcher(guide_data).match(content).compliance
 
 def detect_sections_with_guide(content, guide_data):
-    sections = []
-    section_patterns = guide_data.get('section_patterns', {})
-    all_sections = guide_data.get('required_sections', []) + guide_data.get('optional_sections', [])
-    
-    for section in all_sections:
-        pattern = section_patterns.get(section, f'\\b{section}\\b')
-        if re.search(pattern, content.lower(), re.IGNORECASE):
-            sections.append(section)
-    
-    return sections
+    return get_guide_matcher(guide_data).match(content).detected
 
 def find_missing_sections(content, guide_data):
-    required_sections = guide_data.get('required_sections', [])
-    section_patterns = guide_data.get('section_patterns', {})
-    missing = []
-    
-    for section in required_sections:
-        pattern = section_patterns.get(section, f'\\b{section}\\b')
-        if not re.search(pattern, content.lower(), re.IGNORECASE):
-            missing.append(section)
-    
-    return missing
+    return get_guide_matcher(guide_data).match(content).missing
 
-def generate_guided_recommendations(content, guide_data, structure_score, technical_score):
+def generate_guided_recommendations(content, guide_data, structure_score, technical_score, missing_sections=None):
     recommendations = []
     
     if structure_score < 70:
-        missing_sections = find_missing_sections(content, guide_data)
+        if missing_sections is None:
+            missing_sections = find_missing_sections(content, guide_data)
         if missing_sections:
             recommendations.append(f"Ajouter: {', '.join(missing_sections)}")
     
@@ -451,32 +361,22 @@ def generate_guided_recommendations(content, guide_data, structure_score, techni
 def extract_text_from_pdf(file_path):
     try:
         if os.path.exists(file_path):
-            with open(file_path, 'rb') as f:
-                content = f.read()
-                text = ""
-                try:
-                    text_matches = re.findall(b'[\\x20-\\x7E]{4,}', content)
-                    for match in text_matches:
-                        try:
-                            text += match.decode('utf-8', errors='ignore') + " "
-                        except:
-                            continue
-                except:
-                    text = "Contenu PDF non extractible"
-            
-            text = re.sub(r'[^\x00-\x7F]+', ' ', text)
-            text = re.sub(r'\s+', ' ', text)
-            return text[:10000]
+            return extract_pdf_text(
+                file_path,
+                max_pages=Config.ANALYSIS_MAX_PAGES or None,
+                max_chars=Config.ANALYSIS_MAX_CHARS or None
+            ) or "Contenu PDF non extractible"
         return "RAPPORT DE PROJET PFA - ANALYSE AUTOMATIQUE"
     except Exception as e:
         print(f"Erreur extraction PDF: {e}")
         return "RAPPORT DE PROJET PFA - ANALYSE AUTOMATIQUE"
 
 def analyze_with_mathematical_models(content, domain):
-    structure_score = calculate_structural_score_math(content)
-    technical_score = calculate_technical_score_math(content, domain)
-    math_complexity = calculate_mathematical_complexity(content)
-    quality_score = calculate_quality_score_math(content)
+    metrics = TextMetrics(content)
+    structure_score = metrics.structural_score
+    technical_score = metrics.technical_score
+    math_complexity = metrics.mathematical_complexity
+    quality_score = metrics.quality_score
     
     overall_score = calculate_overall_score_math(
         structure_score, technical_score, math_complexity, quality_score
@@ -486,23 +386,23 @@ def analyze_with_mathematical_models(content, domain):
         'overall_score': round(overall_score, 2),
         'structure': {
             'score': round(structure_score, 2),
-            'sections_detected': detect_sections_math(content),
-            'complexity': round(calculate_structure_complexity(content), 2)
+            'sections_detected': metrics.sections,
+            'complexity': round(metrics.structure_complexity, 2)
         },
         'technical': {
             'score': round(technical_score, 2),
-            'terms_found': extract_technical_terms(content),
-            'terms_count': len(extract_technical_terms(content))
+            'terms_found': metrics.technical_terms,
+            'terms_count': len(metrics.technical_terms)
         },
         'mathematical': {
             'score': round(math_complexity, 2),
-            'equations_count': count_mathematical_elements(content),
+            'equations_count': metrics.math_elements,
             'complexity_level': get_complexity_level(math_complexity)
         },
         'quality': {
             'score': round(quality_score, 2),
-            'readability': round(calculate_readability_index(content), 2),
-            'coherence': round(calculate_coherence_score(content), 2)
+            'readability': round(metrics.readability, 2),
+            'coherence': round(metrics.coherence, 2)
         },
         'recommendations': generate_mathematical_recommendations(
             structure_score, technical_score, math_complexity, quality_score
@@ -544,30 +444,22 @@ def calculate_overall_score_math(structure, technical, math_complexity, quality)
     return min(100, weighted_score)
 
 def detect_sections_math(content):
-    sections = ['introduction', 'methodologie', 'resultats', 'conclusion', 'bibliographie']
     detected = []
-    for section in sections:
+    for section in SECTIONS:
         if detect_section(content, section):
             detected.append(section)
     return detected
 
 def detect_section(content, section):
-    patterns = {
-        'introduction': r'introduction|contexte|problématique|objectif',
-        'methodologie': r'méthodologie|méthode|approche|implémentation',
-        'resultats': r'résultat|expérimentation|test|performance',
-        'conclusion': r'conclusion|perspective|recommandation|bilan',
-        'bibliographie': r'bibliographie|référence|source'
-    }
-    pattern = patterns.get(section, section)
+    pattern = SECTION_PATTERNS.get(section, section)
     return bool(re.search(pattern, content.lower()))
 
 def extract_technical_terms(content):
-    technical_terms = re.findall(r'\b(html|css|javascript|python|react|vue|angular|flask|django|tensorflow|pytorch|machine learning|deep learning|android|ios|react native|flutter|pandas|numpy|sql|database|api|rest|graphql)\b', content.lower())
+    technical_terms = TECHNICAL_TERMS_PATTERN.findall(content.lower())
     return list(set(technical_terms))
 
 def count_mathematical_elements(content):
-    return len(re.findall(r'\$[^$]+\$', content)) + len(re.findall(r'[a-zA-Z]\s*=\s*[^\\n]+', content))
+    return len(INLINE_MATH_PATTERN.findall(content)) + len(EQUATION_PATTERN.findall(content))
 
 def calculate_structure_complexity(content):
     paragraphs = len(re.split(r'\n\s*\n', content))
@@ -587,8 +479,7 @@ def calculate_readability_index(content):
     return max(0, min(100, readability))
 
 def calculate_coherence_score(content):
-    transition_words = ['premièrement', 'deuxièmement', 'ensuite', 'en conclusion', 'par conséquent']
-    transition_count = sum(1 for word in transition_words if word in content.lower())
+    transition_count = sum(1 for word in TRANSITION_WORDS if word in content.lower())
     sections = detect_sections_math(content)
     section_score = min(1.0, len(sections) / 5)
     transition_score = min(0.5, transition_count * 0.1)
@@ -22,6 +22,10 @@ def login():
 
         user = User.query.filter_by(email=email).first()
         if user and user.check_password(password) and user.is_active:
+            # Hachage d'une ancienne politique: recalculé tant que le mot de passe est connu
+            if user.password_needs_rehash():
+                user.set_password(password)
+                db.session.commit()
             login_user(user, remember=remember)
             flash('Connexion réussie !', 'success')
             next_page = request.args.get('next')
@@ -104,6 +108,9 @@ def profile():
 @auth_bp.route('/profile/edit', methods=['GET', 'POST'])
 @login_required
 def edit_profile():
+    # current_user est un instantané en lecture seule (utils/identity_cache.py): modifier le modèle
+    user = db.session.get(User, current_user.id)
+
     if request.method == 'POST':
         first_name = request.form.get('first_name', '').strip()
         last_name = request.form.get('last_name', '').strip()
@@ -125,7 +132,7 @@ def edit_profile():
                 errors.append('Les mots de passe ne correspondent pas.')
 
         # Check email conflict
-        if email and email != current_user.email:
+        if email and email != user.email:
             if User.query.filter_by(email=email).first():
                 errors.append('Cet email est déjà utilisé par un autre compte.')
 
@@ -136,14 +143,14 @@ def edit_profile():
 
         # Apply changes
         if email:
-            current_user.email = email
-        current_user.first_name = first_name or None
-        current_user.last_name = last_name or None
+            user.email = email
+        user.first_name = first_name or None
+        user.last_name = last_name or None
         if password:
-            current_user.set_password(password)
+            user.set_password(password)
 
         db.session.commit()
         flash('Profil mis à jour avec succès.', 'success')
         return redirect(url_for('auth.profile'))
 
-    return render_template('auth/edit_profile.html', user=current_user)
+    return render_template('auth/edit_profile.html', user=user)
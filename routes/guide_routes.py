@@ -5,11 +5,7 @@ from models import db, GuideStage
 import json
 import os
 from datetime import datetime
-import io
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
+from utils.pdf_export import render_guide
 
 guide_bp = Blueprint('guide', __name__)
 
@@ -176,51 +172,7 @@ def download_guide(guide_id):
     guide_data = json.loads(guide.content)
     
     # Créer le PDF
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    styles = getSampleStyleSheet()
-    story = []
-    
-    # Titre
-    title_style = ParagraphStyle(
-        'TitleStyle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        textColor=colors.HexColor('#2C3E50'),
-        spaceAfter=30,
-        alignment=1
-    )
-    story.append(Paragraph(f"GUIDE: {guide.title}", title_style))
-    
-    # Informations
-    story.append(Paragraph(f"<b>Domaine:</b> {guide.domain}", styles['Normal']))
-    story.append(Paragraph(f"<b>Description:</b> {guide.description}", styles['Normal']))
-    story.append(Spacer(1, 20))
-    
-    # Sections requises
-    story.append(Paragraph("SECTIONS REQUISES:", styles['Heading2']))
-    for section in guide_data.get('required_sections', []):
-        story.append(Paragraph(f"• {section.title()}", styles['Normal']))
-    
-    story.append(Spacer(1, 15))
-    
-    # Sections optionnelles
-    if guide_data.get('optional_sections'):
-        story.append(Paragraph("SECTIONS OPTIONNELLES:", styles['Heading2']))
-        for section in guide_data['optional_sections']:
-            story.append(Paragraph(f"• {section.title()}", styles['Normal']))
-    
-    story.append(Spacer(1, 15))
-    
-    # Critères d'évaluation
-    eval_criteria = guide_data.get('evaluation_criteria', {})
-    story.append(Paragraph("CRITÈRES D'ÉVALUATION:", styles['Heading2']))
-    story.append(Paragraph(f"Structure: {eval_criteria.get('structure_weight', 0.4) * 100}%", styles['Normal']))
-    story.append(Paragraph(f"Technique: {eval_criteria.get('technical_weight', 0.3) * 100}%", styles['Normal']))
-    story.append(Paragraph(f"Contenu: {eval_criteria.get('content_weight', 0.3) * 100}%", styles['Normal']))
-    
-    doc.build(story)
-    buffer.seek(0)
+    buffer = render_guide(guide, guide_data)
     
     filename = f"guide_{guide.title.replace(' ', '_')}.pdf"
     return send_file(buffer, as_attachment=True, download_name=filename, mimetype='application/pdf')
\ No newline at end of file
@@ -3,10 +3,15 @@ from flask_login import login_required, current_user
 from models import db, User, Comment, PFAProject, ProjectComment, Notification
 from datetime import datetime, timedelta
 import json
-from sqlalchemy import func, desc, or_
+from sqlalchemy import func, desc, or_, exists
+from sqlalchemy.orm import joinedload
+from utils.pagination import keyset_paginate
+from utils.rate_limit import rate_limit
 
 jury_bp = Blueprint('jury', __name__)
 
+EVALUATIONS_PAGE_SIZE = 20
+
 @jury_bp.route('/dashboard')
 @login_required
 def dashboard():
@@ -16,14 +21,16 @@ def dashboard():
         return redirect(url_for('public.home'))
     
     # Statistiques avancées
+    total_projects = PFAProject.query.filter_by(status='published').count()
+    jury_comments, avg_recommendations = db.session.query(
+        func.count(Comment.id), func.avg(Comment.recommendations)
+    ).filter(Comment.jury_id == current_user.id).one()
     stats = {
-        'total_projects': PFAProject.query.filter_by(status='published').count(),
-        'projects_evaluated': Comment.query.filter_by(jury_id=current_user.id).count(),
-        'total_comments': Comment.query.filter_by(jury_id=current_user.id).count(),
-        'avg_recommendations': db.session.query(func.avg(Comment.recommendations))
-            .filter_by(jury_id=current_user.id).scalar() or 0,
-        'pending_evaluations': PFAProject.query.filter_by(status='published').count() - 
-                             Comment.query.filter_by(jury_id=current_user.id).count(),
+        'total_projects': total_projects,
+        'projects_evaluated': jury_comments,
+        'total_comments': jury_comments,
+        'avg_recommendations': avg_recommendations or 0,
+        'pending_evaluations': total_projects - jury_comments,
         'top_performing_domain': get_top_performing_domain(current_user.id)
     }
     
@@ -32,6 +39,7 @@ def dashboard():
     
     # Commentaires récents du jury
     recent_comments = Comment.query.filter_by(jury_id=current_user.id)\
+        .options(joinedload(Comment.student_user))\
         .order_by(Comment.created_at.desc()).limit(5).all()
     
     # Alertes et notifications
@@ -40,6 +48,7 @@ def dashboard():
     return render_template('jury/dashboard.html',
                          stats=stats,
                          recent_projects=recent_projects,
+                         comment_counts=PFAProject.get_comment_counts(recent_projects),
                          recent_comments=recent_comments,
                          alerts=alerts)
 
@@ -59,6 +68,7 @@ def projects_to_evaluate():
     
     return render_template('jury/projects_to_evaluate.html',
                          projects=projects,
+                         comment_counts=PFAProject.get_comment_counts(projects),
                          domain=domain,
                          priority=priority)
 
@@ -78,8 +88,7 @@ def evaluate_project(project_id):
     # Vérifier si une évaluation existe déjà
     existing_evaluation = Comment.query.filter_by(
         jury_id=current_user.id,
-        student_id=project.student_id,
-        project_title=project.title
+        project_id=project.id
     ).first()
     
     return render_template('jury/evaluate_project.html',
@@ -96,11 +105,13 @@ def my_evaluations():
     
     filter_type = request.args.get('filter', 'all')
     sort_by = request.args.get('sort', 'recent')
+    cursor = request.args.get('cursor')
     
-    evaluations = get_evaluations_with_filters(current_user.id, filter_type, sort_by)
+    page = get_evaluations_with_filters(current_user.id, filter_type, sort_by, cursor)
     
     return render_template('jury/my_evaluations.html',
-                         evaluations=evaluations,
+                         evaluations=page.items,
+                         page=page,
                          filter_type=filter_type,
                          sort_by=sort_by)
 
@@ -179,10 +190,12 @@ def project_suggestions():
     suggestions = get_ai_project_suggestions(current_user.id)
     
     return render_template('jury/project_suggestions.html',
-                         suggestions=suggestions)
+                         suggestions=suggestions,
+                         comment_counts=PFAProject.get_comment_counts(suggestions))
 
 @jury_bp.route('/api/auto-complete', methods=['POST'])
 @login_required
+@rate_limit('autocomplete')
 def auto_complete():
     """API d'auto-complétion pour les commentaires"""
     if not current_user.is_jury():
@@ -222,52 +235,50 @@ def get_comment_api(comment_id):
 # FONCTIONS UTILITAIRES MANQUANTES
 # ================================
 
+def not_evaluated_by(jury_id):
+    """Anti-jointure: projets sans évaluation de ce jury"""
+    return ~exists().where(Comment.jury_id == jury_id, Comment.project_id == PFAProject.id)
+
 def get_projects_for_evaluation(jury_id, limit=5):
-    """Récupère les projets à évaluer pour un jury"""
-    # Récupérer les titres des projets déjà évalués par ce jury
-    evaluated_titles = [c.project_title for c in Comment.query.filter_by(jury_id=jury_id).all()]
-    
-    # Projets non évalués par ce jury
+    """Récupère les projets à évaluer pour un jury (likes puis vues: ordre de idx_status_likes_views_id)"""
     projects = PFAProject.query.filter(
         PFAProject.status == 'published',
-        ~PFAProject.title.in_(evaluated_titles)
+        not_evaluated_by(jury_id)
     ).order_by(
         desc(PFAProject.likes_count),
-        desc(PFAProject.views_count)
+        desc(PFAProject.views_count),
+        desc(PFAProject.id)
     ).limit(limit).all()
     
     return projects
 
 def get_smart_project_recommendations(jury_id, domain='all', priority='all'):
     """Algorithmes de recommandation de projets"""
-    # Récupérer les titres des projets déjà évalués
-    evaluated_titles = [c.project_title for c in Comment.query.filter_by(jury_id=jury_id).all()]
-    
     # Requête de base
-    query = PFAProject.query.filter(
+    query = PFAProject.query.options(joinedload(PFAProject.project_student)).filter(
         PFAProject.status == 'published',
-        ~PFAProject.title.in_(evaluated_titles)
+        not_evaluated_by(jury_id)
     )
     
     # Filtrage par domaine
     if domain != 'all':
         query = query.filter(PFAProject.domain == domain)
     
-    # Priorisation intelligente
+    # Priorisation intelligente (départage par id: ordre des index (status, colonne, id))
     if priority == 'popular':
-        query = query.order_by(desc(PFAProject.likes_count))
+        query = query.order_by(desc(PFAProject.likes_count), desc(PFAProject.id))
     elif priority == 'commented':
         # Trier par nombre de commentaires (approximation)
-        query = query.order_by(desc(PFAProject.views_count))
+        query = query.order_by(desc(PFAProject.views_count), desc(PFAProject.id))
     elif priority == 'recent':
-        query = query.order_by(desc(PFAProject.created_at))
+        query = query.order_by(desc(PFAProject.created_at), desc(PFAProject.id))
     elif priority == 'domain_expertise':
         # Prioriser les projets dans le domaine d'expertise du jury
         # Pour l'instant, on utilise les vues comme proxy
-        query = query.order_by(desc(PFAProject.views_count))
+        query = query.order_by(desc(PFAProject.views_count), desc(PFAProject.id))
     else:
-        # Par défaut: mélange de popularité et récence
-        query = query.order_by(desc(PFAProject.likes_count), desc(PFAProject.created_at))
+        # Par défaut: mélange de popularité et récence (id croissant avec la date de création)
+        query = query.order_by(desc(PFAProject.likes_count), desc(PFAProject.id))
     
     return query.limit(20).all()
 
@@ -276,11 +287,9 @@ def get_evaluation_alerts(jury_id):
     alerts = []
     
     # Projets populaires non évalués
-    evaluated_titles = [c.project_title for c in Comment.query.filter_by(jury_id=jury_id).all()]
-    
-    popular_unevaluated = PFAProject.query.filter(
+    popular_unevaluated = db.session.query(PFAProject.id, PFAProject.title).filter(
         PFAProject.status == 'published',
-        ~PFAProject.title.in_(evaluated_titles)
+        not_evaluated_by(jury_id)
     ).order_by(desc(PFAProject.likes_count)).limit(3).all()
     
     for project in popular_unevaluated:
@@ -292,10 +301,10 @@ def get_evaluation_alerts(jury_id):
     
     # Évaluations en retard (projets créés il y a plus de 7 jours)
     week_ago = datetime.utcnow() - timedelta(days=7)
-    old_unevaluated = PFAProject.query.filter(
+    old_unevaluated = db.session.query(PFAProject.id, PFAProject.title).filter(
         PFAProject.status == 'published',
         PFAProject.created_at < week_ago,
-        ~PFAProject.title.in_(evaluated_titles)
+        not_evaluated_by(jury_id)
     ).limit(2).all()
     
     for project in old_unevaluated:
@@ -335,44 +344,36 @@ def get_jury_evaluation_stats(jury_id):
 
 def get_ai_project_suggestions(jury_id):
     """Suggestions de projets basées sur l'historique du jury"""
-    # Récupérer les domaines des projets évalués par le jury
-    jury_evaluations = Comment.query.filter_by(jury_id=jury_id).all()
-    
-    if not jury_evaluations:
-        # Si pas d'historique, retourner des projets populaires
-        return PFAProject.query.filter_by(status='published')\
-            .order_by(desc(PFAProject.likes_count)).limit(4).all()
+    # Domaines préférés du jury (top 2), d'après les projets évalués
+    preferred_domains = db.session.query(PFAProject.domain, func.count(Comment.id).label('count'))\
+        .join(Comment, Comment.project_id == PFAProject.id)\
+        .filter(Comment.jury_id == jury_id)\
+        .group_by(PFAProject.domain)\
+        .order_by(desc('count')).limit(2).all()
     
-    # Extraire les domaines des projets évalués
-    evaluated_titles = [e.project_title for e in jury_evaluations]
-    evaluated_projects = PFAProject.query.filter(PFAProject.title.in_(evaluated_titles)).all()
+    base_query = PFAProject.query.options(joinedload(PFAProject.project_student))\
+        .filter(PFAProject.status == 'published')
     
-    domain_counts = {}
-    for project in evaluated_projects:
-        domain_counts[project.domain] = domain_counts.get(project.domain, 0) + 1
-    
-    # Domaines préférés du jury (top 2)
-    preferred_domains = sorted(domain_counts.items(), key=lambda x: x[1], reverse=True)[:2]
+    if not preferred_domains:
+        # Si pas d'historique, retourner des projets populaires
+        return base_query.order_by(desc(PFAProject.likes_count)).limit(4).all()
     
     suggested_projects = []
     
     for domain, count in preferred_domains:
         # Projets dans ce domaine non encore évalués
-        evaluated_titles_all = [c.project_title for c in Comment.query.filter_by(jury_id=jury_id).all()]
-        
-        projects = PFAProject.query.filter(
+        projects = base_query.filter(
             PFAProject.domain == domain,
-            PFAProject.status == 'published',
-            ~PFAProject.title.in_(evaluated_titles_all)
+            not_evaluated_by(jury_id)
         ).order_by(desc(PFAProject.likes_count)).limit(2).all()
         
         suggested_projects.extend(projects)
     
     # Si pas assez de suggestions, ajouter des projets populaires
     if len(suggested_projects) < 4:
-        additional = PFAProject.query.filter(
-            PFAProject.status == 'published',
-            ~PFAProject.title.in_([p.title for p in suggested_projects] + evaluated_titles_all)
+        additional = base_query.filter(
+            not_evaluated_by(jury_id),
+            ~PFAProject.id.in_([p.id for p in suggested_projects])
         ).order_by(desc(PFAProject.likes_count)).limit(4 - len(suggested_projects)).all()
         
         suggested_projects.extend(additional)
@@ -431,8 +432,7 @@ def submit_evaluation(project_id, form_data):
     # Vérifier si une évaluation existe déjà
     existing_evaluation = Comment.query.filter_by(
         jury_id=current_user.id,
-        student_id=project.student_id,
-        project_title=project.title
+        project_id=project.id
     ).first()
     
     if existing_evaluation:
@@ -446,6 +446,7 @@ def submit_evaluation(project_id, form_data):
         comment = Comment(
             student_id=project.student_id,
             jury_id=current_user.id,
+            project_id=project.id,
             project_title=project.title,
             content=form_data.get('content', ''),
             recommendations=form_data.get('recommendations', 0, type=int)
@@ -471,9 +472,9 @@ def submit_evaluation(project_id, form_data):
     
     return redirect(url_for('jury.dashboard'))
 
-def get_evaluations_with_filters(jury_id, filter_type, sort_by):
-    """Filtrage et tri des évaluations"""
-    query = Comment.query.filter_by(jury_id=jury_id)
+def get_evaluations_with_filters(jury_id, filter_type, sort_by, cursor=None, per_page=EVALUATIONS_PAGE_SIZE):
+    """Filtrage, tri et pagination par clé des évaluations (avec leur nombre total)"""
+    query = Comment.query.filter_by(jury_id=jury_id).options(joinedload(Comment.student_user))
     
     # Filtres
     if filter_type == 'high_impact':
@@ -482,29 +483,23 @@ def get_evaluations_with_filters(jury_id, filter_type, sort_by):
         week_ago = datetime.utcnow() - timedelta(days=7)
         query = query.filter(Comment.created_at >= week_ago)
     
-    # Tri
+    # Tri: clé de pagination terminée par l'id
     if sort_by == 'recommendations':
-        query = query.order_by(desc(Comment.recommendations))
+        keys, descending = (Comment.recommendations, Comment.id), True
     elif sort_by == 'recent':
-        query = query.order_by(desc(Comment.created_at))
+        keys, descending = (Comment.created_at, Comment.id), True
     else:  # alphabetic
-        query = query.order_by(Comment.project_title)
+        keys, descending = (Comment.project_title, Comment.id), False
     
-    return query.all()
+    return keyset_paginate(query, keys, cursor, per_page, descending=descending, with_count=True)
 
 def get_top_performing_domain(jury_id):
     """Domaine où le jury est le plus performant (basé sur les recommandations)"""
-    # Cette fonction est simplifiée - dans une vraie implémentation, 
-    # on lierait les commentaires aux projets pour avoir les domaines
-    evaluations = Comment.query.filter_by(jury_id=jury_id).all()
-    
-    if not evaluations:
-        return "N/A"
-    
-    # Pour l'instant, on retourne le domaine du projet le plus recommandé
-    best_evaluation = max(evaluations, key=lambda x: x.recommendations)
-    
-    # Trouver le projet correspondant
-    project = PFAProject.query.filter_by(title=best_evaluation.project_title).first()
-    
-    return project.domain if project else "N/A"
\ No newline at end of file
+    # Domaine du projet de l'évaluation la plus recommandée
+    domain = db.session.query(PFAProject.domain)\
+        .join(Comment, Comment.project_id == PFAProject.id)\
+        .filter(Comment.jury_id == jury_id)\
+        .order_by(desc(Comment.recommendations), Comment.id)\
+        .limit(1).scalar()
+    
+    return domain or "N/A"
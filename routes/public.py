@@ -1,9 +1,17 @@
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash, current_app
 from flask_login import current_user
 from models import db, User, Comment, PFAProject, ProjectComment
 from datetime import datetime, timedelta
 import json
 from sqlalchemy import func, desc, or_
+from sqlalchemy.orm import joinedload
+from utils.statistics import get_global_statistics
+from utils.technology_index import get_technology_cloud, technology_filter
+from utils.search import apply_search
+from utils.typeahead import typeahead_index
+from utils.pagination import keyset_paginate
+
+EXPLORE_PAGE_SIZE = 48
 
 public_bp = Blueprint('public', __name__)
 
@@ -39,12 +47,11 @@ def ranking():
     """Classement avancé avec multiples critères"""
     period = request.args.get('period', 'all')
     category = request.args.get('category', 'all')
-    page = request.args.get('page', 1, type=int)
-    per_page = 10
+    cursor = request.args.get('cursor')
     
-    # Récupération avec pagination
-    pagination = get_ranking_data(period, category, page, per_page)
-    top_comments = pagination.items
+    # Récupération avec pagination par clé
+    page = get_ranking_data(period, category, cursor)
+    top_comments = page.items
     
     # Statistiques
     stats = get_ranking_statistics()
@@ -54,25 +61,28 @@ def ranking():
                          stats=stats,
                          period=period,
                          category=category,
-                         page=page,
-                         pages=pagination.pages)
+                         page=page)
 
 @public_bp.route('/explorer')
 def explore():
     """Page d'exploration avancée des projets"""
     domain = request.args.get('domain', 'all')
     technology = request.args.get('technology', '')
-    sort_by = request.args.get('sort', 'recent')
     search_query = request.args.get('q', '')
+    sort_by = request.args.get('sort', 'relevance' if search_query else 'recent')
+    cursor = request.args.get('cursor')
     
     # Filtrage intelligent
-    projects = explore_projects(domain, technology, sort_by, search_query)
+    page = explore_projects(domain, technology, sort_by, search_query, cursor)
+    projects = page.items
     
     # Statistiques de filtrage
     filter_stats = get_exploration_statistics()
     
     return render_template('public/explore.html',
                          projects=projects,
+                         comment_counts=PFAProject.get_comment_counts(projects),
+                         page=page,
                          domain=domain,
                          technology=technology,
                          sort_by=sort_by,
@@ -135,6 +145,26 @@ def trending_projects_api():
     trending = get_trending_projects()
     return jsonify(trending)
 
+@public_bp.route('/api/search')
+def search_api():
+    """API d'autocomplétion (titres, technologies, étudiants)"""
+    query = request.args.get('q', '').strip()
+    limit = min(request.args.get('limit', 8, type=int), 20)
+    
+    typeahead_index.ensure_fresh()
+    results = typeahead_index.search(query, limit) if len(query) >= 2 else []
+    for result in results:
+        result['url'] = url_for('public.project_detail_public', project_id=result['id'])
+    
+    # ETag calculé sur le corps: identique d'un worker à l'autre pour un même contenu,
+    # une frappe répétée ou un retour arrière donne un 304
+    response = jsonify(results)
+    response.add_etag()
+    response.make_conditional(request)
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config.get('TYPEAHEAD_MAX_AGE', 30)
+    return response
+
 @public_bp.route('/api/global-stats')
 def global_stats_api():
     """API pour les statistiques globales"""
@@ -145,9 +175,9 @@ def global_stats_api():
 # FONCTIONS UTILITAIRES CORRIGÉES
 # ================================
 
-def get_ranking_data(period='all', category='all', page=1, per_page=10):
-    """Récupère les données de classement avec pagination"""
-    query = Comment.query.filter_by(is_public=True)
+def get_ranking_data(period='all', category='all', cursor=None, per_page=10):
+    """Récupère une page du classement (pagination par clé, sans COUNT)"""
+    query = Comment.query.filter_by(is_public=True).options(joinedload(Comment.jury_user))
     
     # Filtrage temporel
     if period == 'week':
@@ -174,24 +204,8 @@ def get_ranking_data(period='all', category='all', page=1, per_page=10):
             conditions = [Comment.project_title.ilike(f'%{keyword}%') for keyword in keywords]
             query = query.filter(or_(*conditions))
     
-    # Pagination
-    pagination = query.order_by(desc(Comment.recommendations)).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
-    
-    return pagination
-
-def get_global_statistics():
-    """Statistiques globales de la plateforme"""
-    return {
-        'total_projects': PFAProject.query.filter_by(status='published').count(),
-        'total_students': User.query.filter_by(role='student', is_active=True).count(),
-        'total_juries': User.query.filter_by(role='jury', is_active=True).count(),
-        'total_comments': Comment.query.filter_by(is_public=True).count(),
-        'total_recommendations': db.session.query(func.sum(Comment.recommendations)).scalar() or 0,
-        'avg_project_rating': db.session.query(func.avg(Comment.recommendations)).scalar() or 0,
-        'active_this_week': get_active_users_this_week()
-    }
+    # Pagination par (recommandations, id): la page N coûte autant que la première
+    return keyset_paginate(query, (Comment.recommendations, Comment.id), cursor, per_page)
 
 def get_ranked_comments(period, category, sort_by):
     """Système de classement intelligent"""
@@ -253,8 +267,8 @@ def get_top_juries():
      .order_by(desc('comments_count'))\
      .limit(10).all()
 
-def explore_projects(domain, technology, sort_by, search_query):
-    """Exploration avancée des projets"""
+def explore_projects(domain, technology, sort_by, search_query, cursor=None):
+    """Exploration avancée des projets, par pages de EXPLORE_PAGE_SIZE"""
     query = PFAProject.query.filter_by(status='published')
     
     # Filtrage par domaine
@@ -262,33 +276,30 @@ def explore_projects(domain, technology, sort_by, search_query):
         query = query.filter(PFAProject.domain == domain)
     
     # Filtrage par technologie
-    if technology:
-        query = query.filter(PFAProject.technologies.ilike(f'%{technology}%'))
+    technology_clause = technology_filter(technology)
+    if technology_clause is not None:
+        query = query.filter(technology_clause)
     
-    # Recherche textuelle
+    # Recherche plein texte
+    rank = None
     if search_query:
-        query = query.filter(
-            or_(
-                PFAProject.title.ilike(f'%{search_query}%'),
-                PFAProject.description.ilike(f'%{search_query}%'),
-                PFAProject.technologies.ilike(f'%{search_query}%')
-            )
-        )
-    
-    # Tri
-    if sort_by == 'popular':
-        query = query.order_by(desc(PFAProject.likes_count))
+        query, rank = apply_search(query, search_query)
+    
+    # Tri: clé de pagination terminée par l'id (départage stable)
+    descending = True
+    if sort_by == 'relevance' and rank is not None:
+        keys, descending = (rank, PFAProject.id), False
+    elif sort_by == 'popular':
+        keys = (PFAProject.likes_count, PFAProject.id)
     elif sort_by == 'views':
-        query = query.order_by(desc(PFAProject.views_count))
+        keys = (PFAProject.views_count, PFAProject.id)
     elif sort_by == 'recent':
-        query = query.order_by(desc(PFAProject.created_at))
+        keys = (PFAProject.created_at, PFAProject.id)
     else:  # trending (mix popularité et récence)
-        query = query.order_by(
-            desc(PFAProject.likes_count + PFAProject.views_count),
-            desc(PFAProject.created_at)
-        )
+        keys = (PFAProject.likes_count + PFAProject.views_count, PFAProject.id)
     
-    return query.limit(48).all()
+    return keyset_paginate(query.options(joinedload(PFAProject.project_student)), keys, cursor,
+                           EXPLORE_PAGE_SIZE, descending=descending)
 
 def get_exploration_statistics():
     """Statistiques pour la page d'exploration"""
@@ -307,22 +318,6 @@ def get_domain_distribution():
      .group_by(PFAProject.domain)\
      .all()
 
-def get_technology_cloud():
-    """Nuage de technologies les plus populaires"""
-    all_technologies = []
-    projects = PFAProject.query.filter_by(status='published').all()
-    
-    for project in projects:
-        if project.technologies:
-            tech_list = [tech.strip() for tech in project.technologies.split(',')]
-            all_technologies.extend(tech_list)
-    
-    # Compter les occurrences
-    from collections import Counter
-    tech_counter = Counter(all_technologies)
-    
-    return tech_counter.most_common(20)
-
 def get_similar_projects(project):
     """Recommandation de projets similaires"""
     similar = PFAProject.query.filter(
@@ -389,32 +384,14 @@ def get_engagement_metrics():
         ).scalar() or 0
     }
 
-def get_active_users_this_week():
-    """Utilisateurs actifs cette semaine"""
-    last_week = datetime.utcnow() - timedelta(days=7)
-    
-    # Étudiants ayant publié des projets
-    active_students = User.query.join(PFAProject, User.id == PFAProject.student_id)\
-        .filter(
-            User.role == 'student',
-            PFAProject.created_at >= last_week
-        ).distinct().count()
-    
-    # Jurys ayant commenté
-    active_juries = User.query.join(Comment, User.id == Comment.jury_id)\
-        .filter(
-            User.role == 'jury',
-            Comment.created_at >= last_week
-        ).distinct().count()
-    
-    return active_students + active_juries
-
 def get_trending_projects():
     """Projets tendance (mix popularité et récence)"""
-    trending = PFAProject.query.filter_by(status='published')\
+    # Départage par id (croissant avec la date de création): ordre de idx_status_popularity_id
+    trending = PFAProject.query.options(joinedload(PFAProject.project_student))\
+        .filter_by(status='published')\
         .order_by(
             desc(PFAProject.likes_count + PFAProject.views_count),
-            desc(PFAProject.created_at)
+            desc(PFAProject.id)
         ).limit(8).all()
     
     return [{
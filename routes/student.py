@@ -1,7 +1,9 @@
-from flask import Blueprint, render_template, redirect, url_for, jsonify
+from flask import Blueprint, render_template, redirect, url_for, jsonify, abort
 from flask_login import login_required, current_user
 from sqlalchemy import func
-from models import db, User, Comment, PFAProject, ProjectComment, GuideStage
+from models import db, User, Comment, PFAProject, ProjectComment, GuideStage, UserLike
+from utils.counters import increment_once
+from utils.statistics import statistics_snapshot
 from datetime import datetime, timedelta
 
 student_bp = Blueprint('student', __name__)
@@ -56,19 +58,24 @@ def recommend_comment(comment_id):
     if current_user.role != 'student':
         return jsonify({'success': False, 'message': 'Non autorisé'}), 403
     
-    comment = Comment.query.get_or_404(comment_id)
+    comment_student_id = db.session.query(Comment.student_id).filter(Comment.id == comment_id).scalar()
+    if comment_student_id is None:
+        abort(404)
     
     # Check if comment is not from current student
-    if comment.student_id == current_user.id:
+    if comment_student_id == current_user.id:
         return jsonify({'success': False, 'message': 'Vous ne pouvez pas recommander vos propres commentaires'}), 400
     
-    # Increment recommendations
-    comment.recommendations += 1
-    db.session.commit()
+    # Increment recommendations (une seule fois par étudiant)
+    recommendations, added = increment_once(Comment, 'recommendations', comment_id,
+                                            current_user.id, UserLike.TARGET_COMMENT)
+    if added:
+        statistics_snapshot.invalidate()
     
     return jsonify({
         'success': True,
-        'recommendations': comment.recommendations
+        'recommendations': recommendations,
+        'already_recommended': not added
     })
 
 @student_bp.route('/api/active-guide')
@@ -1,10 +1,13 @@
 # routes/student_projects.py - VERSION CORRIGÉE
 import os
-from flask import Blueprint, render_template, request, flash, redirect, url_for, current_app
+from flask import Blueprint, render_template, request, flash, redirect, url_for, current_app, abort
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
-from models import db, PFAProject, ProjectDocument, ProjectComment
+from models import db, PFAProject, ProjectDocument, ProjectComment, UserLike
 from datetime import datetime
+from utils.search import apply_search
+from utils.counters import increment_once
+from utils.rate_limit import rate_limit
 
 student_projects_bp = Blueprint('student_projects', __name__)
 
@@ -37,6 +40,7 @@ def project_detail(project_id):
 
 @student_projects_bp.route('/projet/<int:project_id>/upload-document', methods=['GET', 'POST'])
 @login_required
+@rate_limit('upload', methods=('POST',))
 def upload_project_document(project_id):
     """Uploader un document pour un projet - NOUVEAU NOM"""
     # Vérifier que le projet existe et appartient à l'étudiant
@@ -192,15 +196,20 @@ def add_project_comment(project_id):
 @login_required
 def like_comment(comment_id):
     """Like un commentaire"""
+    if db.session.query(ProjectComment.id).filter(ProjectComment.id == comment_id).scalar() is None:
+        abort(404)
+    
     try:
-        comment = ProjectComment.query.get_or_404(comment_id)
-        comment.increment_likes()
+        likes_count, added = increment_once(ProjectComment, 'likes_count', comment_id,
+                                            current_user.id, UserLike.TARGET_PROJECT_COMMENT)
         
         return {
             'success': True,
-            'likes_count': comment.likes_count
+            'likes_count': likes_count,
+            'already_liked': not added
         }
     except Exception as e:
+        db.session.rollback()
         return {
             'success': False,
             'message': str(e)
@@ -221,18 +230,21 @@ def search_projects():
     projects_query = PFAProject.query.filter_by(status='published', is_public=True)
     
     # Appliquer les filtres
+    rank = None
     if query:
-        projects_query = projects_query.filter(
-            PFAProject.title.ilike(f'%{query}%') | 
-            PFAProject.description.ilike(f'%{query}%') |
-            PFAProject.technologies.ilike(f'%{query}%')
-        )
+        projects_query, rank = apply_search(projects_query, query)
     
     if domain:
-        projects_query = projects_query.filter_by(domain=domain)
+        projects_query = projects_query.filter(PFAProject.domain == domain)
+    
+    # Tri par pertinence quand une recherche est saisie
+    if rank is not None:
+        projects_query = projects_query.order_by(rank, PFAProject.created_at.desc())
+    else:
+        projects_query = projects_query.order_by(PFAProject.created_at.desc())
     
     # Pagination
-    projects = projects_query.order_by(PFAProject.created_at.desc()).paginate(
+    projects = projects_query.paginate(
         page=page, 
         per_page=9, 
         error_out=False
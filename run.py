@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import os
+from flask import current_app
 from app import create_app, db
 from models import User, PFAProject, GuideStage
 from werkzeug.security import generate_password_hash
@@ -18,7 +19,7 @@ def init_default_data():
                 last_name="System",
                 is_active=True
             )
-            admin.set_password("admin123")
+            admin.set_password("admin123", current_app.config['SEED_PASSWORD_HASH_METHOD'])
             db.session.add(admin)
             print("✅ Admin user created")
         
@@ -33,7 +34,7 @@ def init_default_data():
                 last_name="Dupont",
                 is_active=True
             )
-            jury.set_password("jury123")
+            jury.set_password("jury123", current_app.config['SEED_PASSWORD_HASH_METHOD'])
             db.session.add(jury)
             print("✅ Jury user created")
         
@@ -48,7 +49,7 @@ def init_default_data():
                 last_name="Martin",
                 is_active=True
             )
-            student.set_password("student123")
+            student.set_password("student123", current_app.config['SEED_PASSWORD_HASH_METHOD'])
             db.session.add(student)
             print("✅ Student user created")
         
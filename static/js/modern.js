@@ -229,12 +229,24 @@ class ModernUI {
     }
 
     displaySearchResults(results, container) {
-        container.innerHTML = results.map(result => `
-            <div class="search-result-item">
-                <h6>${result.title}</h6>
-                <p class="text-muted">${result.description}</p>
-            </div>
-        `).join('');
+        // Titres et noms saisis par les utilisateurs: nœuds construits avec textContent, jamais innerHTML
+        container.replaceChildren(...results.map(result => {
+            const link = document.createElement('a');
+            link.className = 'search-result-item d-block';
+            // URL relative uniquement (pas de javascript: ni de domaine externe)
+            if (typeof result.url === 'string' && result.url.startsWith('/') && !result.url.startsWith('//')) {
+                link.setAttribute('href', result.url);
+            }
+
+            const title = document.createElement('h6');
+            title.textContent = result.title ?? '';
+            const description = document.createElement('p');
+            description.className = 'text-muted';
+            description.textContent = result.description ?? '';
+
+            link.append(title, description);
+            return link;
+        }));
     }
 }
 
@@ -1,30 +1,77 @@
 # [file name]: utils/ai_analyzer.py
 import os
-import PyPDF2
 import re
+import threading
 from datetime import datetime
 from typing import Dict, List, Tuple
 
+from utils.pdf_text import get_pdf_pages
+
+FIGURE_WORDS = ('figure', 'image', 'graphique')
+
+
+class ParsedDocument:
+    """PDF parsé une seule fois: nombre de pages, texte et statistiques par page"""
+    
+    def __init__(self, pages: List[str]):
+        self.pages = [page or "" for page in pages]
+        self.total_pages = len(self.pages)
+        self.page_stats = [self._page_stats(page) for page in self.pages]
+        self._text = None
+    
+    @property
+    def text(self) -> str:
+        """Texte complet, construit une seule fois par jointure"""
+        if self._text is None:
+            self._text = "".join(f"{page}\n" for page in self.pages)
+        return self._text
+    
+    @staticmethod
+    def _page_stats(text: str) -> Dict:
+        lowered = text.lower()
+        return {
+            "chars": len(text.strip()),
+            "lines": len(text.split('\n')),
+            "mentions_figure": any(word in lowered for word in FIGURE_WORDS)
+        }
+
+
 class PFAReportAnalyzer:
     def __init__(self):
-        # Vérifier si OpenAI est disponible
-        self.openai_available = False
+        # Le client OpenAI n'est construit qu'à la première analyse
         api_key = os.getenv('OPENAI_API_KEY')
-        
         if api_key and api_key != 'sk-fake-key-for-testing' and api_key.startswith('sk-'):
-            try:
-                import openai
-                self.openai_client = openai.OpenAI(api_key=api_key)
-                self.openai_available = True
-                print("✓ OpenAI configuré")
-            except Exception as e:
-                print(f"⚠️ Erreur OpenAI: {e}")
-                self.openai_available = False
+            self._api_key = api_key
         else:
-            print("⚠️ Mode simulation - OpenAI non configuré")
+            self._api_key = None
+        self._openai_client = None
+        self._openai_checked = False
+        self._openai_lock = threading.Lock()
         
         self.guide_requirements = self.load_guide_requirements()
     
+    @property
+    def openai_client(self):
+        """Client OpenAI créé au premier usage (import d'openai compris)"""
+        if not self._openai_checked:
+            with self._openai_lock:
+                if not self._openai_checked:
+                    if self._api_key:
+                        try:
+                            import openai
+                            self._openai_client = openai.OpenAI(api_key=self._api_key)
+                            print("✓ OpenAI configuré")
+                        except Exception as e:
+                            print(f"⚠️ Erreur OpenAI: {e}")
+                    else:
+                        print("⚠️ Mode simulation - OpenAI non configuré")
+                    self._openai_checked = True
+        return self._openai_client
+    
+    @property
+    def openai_available(self) -> bool:
+        return self.openai_client is not None
+    
     def load_guide_requirements(self) -> Dict:
         """Charge les exigences du guide de stage"""
         return {
@@ -46,72 +93,68 @@ class PFAReportAnalyzer:
             }
         }
     
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
-        """Extrait le texte d'un PDF"""
+    def parse_pdf(self, pdf_path: str) -> "ParsedDocument":
+        """Parse le PDF une seule fois pour toutes les étapes de l'analyse"""
         try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+            return ParsedDocument(get_pdf_pages(pdf_path))
         except Exception as e:
             raise Exception(f"Erreur extraction PDF: {str(e)}")
     
-    def analyze_layout_issues(self, pdf_path: str) -> Dict:
+    def extract_text_from_pdf(self, pdf_path: str) -> str:
+        """Extrait le texte d'un PDF"""
+        return self.parse_pdf(pdf_path).text
+    
+    def analyze_layout_issues(self, pdf_path: str, document: "ParsedDocument" = None) -> Dict:
         """Analyse les problèmes de mise en page"""
         issues = []
         
         try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                total_pages = len(reader.pages)
-                
-                # Vérification nombre de pages
-                if total_pages < self.guide_requirements["structure"]["pages_minimum"]:
+            if document is None:
+                document = self.parse_pdf(pdf_path)
+            total_pages = document.total_pages
+            
+            # Vérification nombre de pages
+            if total_pages < self.guide_requirements["structure"]["pages_minimum"]:
+                issues.append({
+                    "type": "structure",
+                    "severity": "high",
+                    "message": f"Nombre de pages insuffisant ({total_pages} au lieu de {self.guide_requirements['structure']['pages_minimum']} minimum)",
+                    "page": "global"
+                })
+            
+            if total_pages > self.guide_requirements["structure"]["pages_maximum"]:
+                issues.append({
+                    "type": "structure", 
+                    "severity": "medium",
+                    "message": f"Rapport trop long ({total_pages} pages, maximum recommandé: {self.guide_requirements['structure']['pages_maximum']})",
+                    "page": "global"
+                })
+            
+            # Analyse basique du contenu par page
+            for page_num, stats in enumerate(document.page_stats, 1):
+                # Vérifier pages vides ou presque vides
+                if stats["chars"] < 50:
                     issues.append({
-                        "type": "structure",
+                        "type": "contenu",
                         "severity": "high",
-                        "message": f"Nombre de pages insuffisant ({total_pages} au lieu de {self.guide_requirements['structure']['pages_minimum']} minimum)",
-                        "page": "global"
+                        "message": "Page contenant très peu de texte",
+                        "page": page_num
                     })
                 
-                if total_pages > self.guide_requirements["structure"]["pages_maximum"]:
+                # Détecter les pages avec uniquement des images
+                if stats["lines"] < 3 and stats["mentions_figure"]:
                     issues.append({
-                        "type": "structure", 
-                        "severity": "medium",
-                        "message": f"Rapport trop long ({total_pages} pages, maximum recommandé: {self.guide_requirements['structure']['pages_maximum']})",
-                        "page": "global"
+                        "type": "formatage",
+                        "severity": "low", 
+                        "message": "Page potentiellement dédiée uniquement à une figure",
+                        "page": page_num
                     })
-                
-                # Analyse basique du contenu par page
-                for page_num, page in enumerate(reader.pages, 1):
-                    text = page.extract_text()
-                    
-                    # Vérifier pages vides ou presque vides
-                    if len(text.strip()) < 50:
-                        issues.append({
-                            "type": "contenu",
-                            "severity": "high",
-                            "message": "Page contenant très peu de texte",
-                            "page": page_num
-                        })
-                    
-                    # Détecter les pages avec uniquement des images
-                    lines = text.split('\n')
-                    if len(lines) < 3 and any(word in text.lower() for word in ['figure', 'image', 'graphique']):
-                        issues.append({
-                            "type": "formatage",
-                            "severity": "low", 
-                            "message": "Page potentiellement dédiée uniquement à une figure",
-                            "page": page_num
-                        })
-                
-                return {
-                    "total_pages": total_pages,
-                    "layout_issues": issues,
-                    "pages_analyzed": total_pages
-                }
+            
+            return {
+                "total_pages": total_pages,
+                "layout_issues": issues,
+                "pages_analyzed": total_pages
+            }
                 
         except Exception as e:
             raise Exception(f"Erreur analyse mise en page: {str(e)}")
@@ -294,14 +337,14 @@ class PFAReportAnalyzer:
     def comprehensive_analysis(self, pdf_path: str, guide_content: str = "") -> Dict:
         """Analyse complète du rapport"""
         try:
-            # Extraction texte
-            text = self.extract_text_from_pdf(pdf_path)
+            # Parsing unique du PDF, partagé par toutes les étapes
+            document = self.parse_pdf(pdf_path)
             
             # Analyse mise en page
-            layout_analysis = self.analyze_layout_issues(pdf_path)
+            layout_analysis = self.analyze_layout_issues(pdf_path, document)
             
             # Analyse contenu avec IA
-            content_analysis = self.analyze_content_with_ai(text, guide_content)
+            content_analysis = self.analyze_content_with_ai(document.text, guide_content)
             
             # Mode d'analyse
             analysis_mode = "openai" if self.openai_available else "simulation"
@@ -363,5 +406,31 @@ class PFAReportAnalyzer:
         
         return recommendations
 
-# Instance globale
-report_analyzer = PFAReportAnalyzer()
+# Instance globale, construite au premier usage
+_report_analyzer = None
+_report_analyzer_lock = threading.Lock()
+
+
+def get_report_analyzer() -> PFAReportAnalyzer:
+    """Retourne l'analyseur partagé, créé de façon thread-safe au premier appel"""
+    global _report_analyzer
+    if _report_analyzer is None:
+        with _report_analyzer_lock:
+            if _report_analyzer is None:
+                _report_analyzer = PFAReportAnalyzer()
+    return _report_analyzer
+
+
+def warm_up() -> PFAReportAnalyzer:
+    """Construit l'analyseur et son client OpenAI à l'avance (hook de démarrage)"""
+    analyzer = get_report_analyzer()
+    analyzer.openai_client
+    return analyzer
+
+
+def __getattr__(name):
+    # Compatibilité: `from utils.ai_analyzer import report_analyzer`
+    if name == 'report_analyzer':
+        return get_report_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
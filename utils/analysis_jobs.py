@@ -0,0 +1,212 @@
+# utils/analysis_jobs.py - ANALYSES DE RAPPORTS EN ARRIÈRE-PLAN
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import create_engine, func, select, update, desc
+
+from models import db, AnalysisJob, PFAProject, ProjectDocument, UploadedGuide
+from utils.rate_limit import RateLimitExceeded, rate_limiter
+
+DOCUMENTS_FOLDER = os.path.join('static', 'uploads', 'documents')
+GUIDES_FOLDER = os.path.join('static', 'uploads', 'guides')
+
+_executor = None
+_executor_lock = threading.Lock()
+_engines = {}
+
+
+def get_executor():
+    """Pool de processus local, créé au premier job (pas de broker nécessaire)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(max_workers=current_app.config.get('ANALYSIS_WORKERS', 2))
+    return _executor
+
+
+def reset_executor():
+    """Abandonner un pool cassé (processus tué) pour en recréer un au prochain job"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def shutdown_executor():
+    """Attendre la fin des jobs soumis puis fermer le pool (scripts, benchmarks)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _executor = None
+
+
+def get_latest_job(project_id):
+    """Dernier job d'analyse d'un projet"""
+    return AnalysisJob.query.filter_by(project_id=project_id)\
+        .order_by(desc(AnalysisJob.created_at), desc(AnalysisJob.id)).first()
+
+
+def enqueue_analysis(project, document, user_id, guide=None):
+    """Créer un job d'analyse et le soumettre au pool de workers"""
+    timeout = current_app.config.get('ANALYSIS_JOB_TIMEOUT', 600)
+    active_job = AnalysisJob.query.filter(
+        AnalysisJob.project_id == project.id,
+        AnalysisJob.status.in_(AnalysisJob.ACTIVE_STATUSES)
+    ).order_by(desc(AnalysisJob.created_at)).first()
+
+    if active_job:
+        if active_job.created_at >= datetime.utcnow() - timedelta(seconds=timeout):
+            # Une analyse est déjà en cours pour ce projet
+            return active_job
+        active_job.status = AnalysisJob.STATUS_FAILED
+        active_job.error = 'Délai d\'analyse dépassé'
+        active_job.finished_at = datetime.utcnow()
+
+    check_analysis_capacity(timeout)
+    # Seuls les nouveaux jobs consomment un jeton: recharger la page d'un job en cours est gratuit
+    rate_limiter.hit('analysis')
+
+    job = AnalysisJob(
+        project_id=project.id,
+        user_id=user_id,
+        document_id=document.id,
+        guide_id=guide.id if guide else None,
+        kind='guided' if guide else 'real'
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    submit_job(job.id)
+    return job
+
+
+def check_analysis_capacity(timeout):
+    """Refuser (429) une nouvelle analyse quand ANALYSIS_MAX_CONCURRENT sont déjà en file ou en cours.
+
+    Compté sur la table analysis_jobs, donc commun à tous les workers; un job
+    plus vieux que le délai d'analyse (worker mort) ne compte plus.
+    """
+    max_concurrent = current_app.config.get('ANALYSIS_MAX_CONCURRENT', 0)
+    if not max_concurrent:
+        return
+    active = db.session.query(func.count(AnalysisJob.id)).filter(
+        AnalysisJob.status.in_(AnalysisJob.ACTIVE_STATUSES),
+        AnalysisJob.created_at >= datetime.utcnow() - timedelta(seconds=timeout)
+    ).scalar()
+    if active >= max_concurrent:
+        raise RateLimitExceeded(current_app.config.get('ANALYSIS_RETRY_AFTER', 30),
+                                description="Trop d'analyses en cours, réessayez dans quelques instants.")
+
+
+def submit_job(job_id):
+    """Soumettre un job existant au pool"""
+    database_uri = db.engine.url.render_as_string(hide_password=False)
+    try:
+        future = get_executor().submit(run_analysis_job, job_id, database_uri)
+    except BrokenProcessPool:
+        reset_executor()
+        future = get_executor().submit(run_analysis_job, job_id, database_uri)
+
+    def _on_done(done_future):
+        # Un worker tué ne peut pas marquer son job en échec lui-même
+        error = done_future.exception()
+        if error is not None:
+            _mark_failed(_get_engine(database_uri), job_id, str(error) or error.__class__.__name__)
+
+    future.add_done_callback(_on_done)
+    return future
+
+
+def compute_analysis(file_path, domain, guide_data=None, guide_title=None, guide_id=None):
+    """Extraction + scoring d'un rapport, sans accès à la base"""
+    from routes.ai_routes import (extract_text_from_pdf, analyze_with_mathematical_models,
+                                  analyze_with_uploaded_guide)
+
+    content = extract_text_from_pdf(file_path)
+    if guide_data is None:
+        return analyze_with_mathematical_models(content, domain)
+    return analyze_with_uploaded_guide(content, domain, guide_data, guide_title, guide_id)
+
+
+def run_analysis_job(job_id, database_uri):
+    """Point d'entrée exécuté dans un processus du pool"""
+    from routes.ai_routes import load_guide_data
+
+    engine = _get_engine(database_uri)
+    jobs = AnalysisJob.__table__
+    projects = PFAProject.__table__
+    documents = ProjectDocument.__table__
+    guides = UploadedGuide.__table__
+
+    with engine.begin() as conn:
+        job = conn.execute(select(jobs).where(jobs.c.id == job_id)).first()
+        if job is None or job.status != AnalysisJob.STATUS_QUEUED:
+            return
+        conn.execute(update(jobs).where(jobs.c.id == job_id).values(
+            status=AnalysisJob.STATUS_RUNNING,
+            started_at=datetime.utcnow()
+        ))
+        project = conn.execute(select(projects.c.domain).where(projects.c.id == job.project_id)).first()
+        document = conn.execute(select(documents.c.file_path).where(documents.c.id == job.document_id)).first()
+        guide = None
+        if job.guide_id:
+            guide = conn.execute(select(guides.c.title, guides.c.file_path, guides.c.file_name)
+                                 .where(guides.c.id == job.guide_id)).first()
+
+    try:
+        if project is None or document is None:
+            raise ValueError('Projet ou document introuvable')
+
+        guide_data = guide_title = None
+        if job.guide_id:
+            if guide is None:
+                raise ValueError('Guide non trouvé')
+            guide_data = load_guide_data(os.path.join(GUIDES_FOLDER, guide.file_path), guide.file_name)
+            if not guide_data:
+                raise ValueError('Erreur chargement guide')
+            guide_title = guide.title
+
+        file_path = os.path.join(DOCUMENTS_FOLDER, document.file_path)
+        analysis_result = compute_analysis(file_path, project.domain, guide_data, guide_title, job.guide_id)
+
+        with engine.begin() as conn:
+            conn.execute(update(projects).where(projects.c.id == job.project_id).values(
+                has_ai_analysis=True,
+                ai_analysis_data=analysis_result,
+                ai_analysis_date=datetime.now(),
+                ai_adaptability_score=analysis_result['overall_score']
+            ))
+            conn.execute(update(jobs).where(jobs.c.id == job_id).values(
+                status=AnalysisJob.STATUS_DONE,
+                finished_at=datetime.utcnow()
+            ))
+    except Exception as e:
+        _mark_failed(engine, job_id, str(e))
+
+
+def _mark_failed(engine, job_id, message):
+    jobs = AnalysisJob.__table__
+    with engine.begin() as conn:
+        conn.execute(update(jobs).where(
+            jobs.c.id == job_id,
+            jobs.c.status.in_(AnalysisJob.ACTIVE_STATUSES)
+        ).values(
+            status=AnalysisJob.STATUS_FAILED,
+            error=message,
+            finished_at=datetime.utcnow()
+        ))
+
+
+def _get_engine(database_uri):
+    # Un engine par processus et par base, jamais hérité du parent
+    key = (os.getpid(), database_uri)
+    if key not in _engines:
+        _engines[key] = create_engine(database_uri)
+    return _engines[key]
@@ -0,0 +1,151 @@
+# utils/counters.py - COMPTEURS: ÉCRITURE DIFFÉRÉE ET INCRÉMENTS ATOMIQUES
+import atexit
+import os
+import threading
+from collections import defaultdict
+
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm.attributes import set_committed_value
+
+from models import db, UserLike
+
+
+class CounterBuffer:
+    """Incréments accumulés en mémoire puis écrits par lots.
+
+    Chaque flush exécute un UPDATE ... SET col = col + n par (table, colonne),
+    dans sa propre transaction: aucun commit dans la requête, aucun incrément
+    perdu entre deux requêtes concurrentes.
+    """
+
+    def __init__(self):
+        self._pending = defaultdict(int)
+        self._lock = threading.Lock()
+        self._app = None
+        self._interval = 0
+        self._pid = None
+        self._stop = threading.Event()
+
+    def init_app(self, app):
+        self._app = app
+        self._interval = app.config.get('COUNTER_FLUSH_INTERVAL', 5)
+
+    def increment(self, obj, column, amount=1):
+        """Incrémenter obj.column sans marquer l'objet comme modifié"""
+        table = obj.__table__
+        current = getattr(obj, column) or 0
+        # Valeur affichée à jour, sans UPDATE au prochain commit de la session
+        set_committed_value(obj, column, current + amount)
+
+        with self._lock:
+            self._pending[(table.name, column, obj.id)] += amount
+
+        if self._interval <= 0 or self._app is None:
+            # Pas de tâche de fond (scripts, tests): écriture immédiate
+            self.flush()
+        else:
+            self._ensure_started()
+
+    def flush(self):
+        """Écrire tous les incréments en attente"""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(int)
+        if not pending:
+            return 0
+
+        grouped = defaultdict(list)
+        for (table_name, column, row_id), amount in pending.items():
+            grouped[(table_name, column)].append({'row_id': row_id, 'amount': amount})
+
+        try:
+            with db.engine.begin() as conn:
+                for (table_name, column), rows in grouped.items():
+                    table = db.metadata.tables[table_name]
+                    conn.execute(
+                        update(table).where(table.c.id == bindparam('row_id'))
+                        .values({column: table.c[column] + bindparam('amount')}),
+                        rows
+                    )
+        except Exception as e:
+            # Remettre les incréments en attente pour le prochain flush
+            with self._lock:
+                for key, amount in pending.items():
+                    self._pending[key] += amount
+            print(f"⚠️ Erreur écriture des compteurs: {e}")
+            return 0
+        return len(pending)
+
+    def _ensure_started(self):
+        # Un thread par processus (les workers forkés ne l'héritent pas)
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            threading.Thread(target=self._run, name='counter-flush', daemon=True).start()
+            atexit.register(self._flush_in_context)
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            self._flush_in_context()
+
+    def _flush_in_context(self):
+        with self._app.app_context():
+            self.flush()
+
+    def stop(self):
+        """Arrêter la tâche de fond après un dernier flush"""
+        self._stop.set()
+        if self._app is not None:
+            self._flush_in_context()
+
+
+counter_buffer = CounterBuffer()
+
+
+# ----- Incréments atomiques dédupliqués par utilisateur -----
+
+def _insert_ignore(table, bind):
+    """INSERT ... ON CONFLICT DO NOTHING selon le SGBD"""
+    if bind.dialect.name == 'postgresql':
+        return postgresql.insert(table).on_conflict_do_nothing()
+    if bind.dialect.name == 'sqlite':
+        return sqlite.insert(table).on_conflict_do_nothing()
+    return insert(table).prefix_with('IGNORE')
+
+
+def increment_once(model, column, row_id, user_id, target_type):
+    """+1 sur model.column, au plus une fois par utilisateur.
+
+    Retourne (nouveau total, incrémenté?) sans charger l'objet ORM; le total
+    vient de UPDATE ... RETURNING (ou d'un SELECT dans la même transaction
+    quand le SGBD ne le supporte pas).
+    """
+    table = model.__table__
+    bind = db.session.get_bind()
+
+    inserted = db.session.execute(
+        _insert_ignore(UserLike.__table__, bind),
+        {'target_type': target_type, 'target_id': row_id, 'user_id': user_id}
+    ).rowcount == 1
+
+    if not inserted:
+        count = db.session.execute(select(table.c[column]).where(table.c.id == row_id)).scalar()
+    elif bind.dialect.update_returning:
+        count = db.session.execute(
+            update(table).where(table.c.id == row_id)
+            .values({column: func.coalesce(table.c[column], 0) + 1})
+            .returning(table.c[column])
+        ).scalar()
+    else:
+        db.session.execute(
+            update(table).where(table.c.id == row_id)
+            .values({column: func.coalesce(table.c[column], 0) + 1})
+        )
+        count = db.session.execute(select(table.c[column]).where(table.c.id == row_id)).scalar()
+
+    db.session.commit()
+    return count or 0, inserted
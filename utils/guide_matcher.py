@@ -0,0 +1,121 @@
+# utils/guide_matcher.py - DÉTECTION DES SECTIONS D'UN GUIDE EN UNE SEULE PASSE
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+
+MATCHER_CACHE_SIZE = 128
+
+# Les références arrière et groupes nommés ne survivent pas à la combinaison
+_UNCOMBINABLE = re.compile(r'\\[1-9]|\(\?P[<=]')
+
+
+class GuideMatch:
+    """Résultat de la détection: sections trouvées, manquantes et conformité"""
+
+    def __init__(self, detected, missing, required_count, detected_required_count):
+        self.detected = detected
+        self.missing = missing
+        self.required_count = required_count
+        self.detected_required_count = detected_required_count
+
+    @property
+    def structure_score(self):
+        if not self.required_count:
+            return 50
+        return min(100, (self.detected_required_count / self.required_count) * 100)
+
+    @property
+    def compliance(self):
+        if not self.required_count:
+            return 0
+        return round((self.detected_required_count / self.required_count) * 100, 1)
+
+
+class GuideMatcher:
+    """Patterns d'un guide compilés une fois et combinés en une seule alternative"""
+
+    def __init__(self, guide_data):
+        section_patterns = guide_data.get('section_patterns', {})
+        self.required_sections = guide_data.get('required_sections', [])
+        self.all_sections = self.required_sections + guide_data.get('optional_sections', [])
+
+        self._compiled = {}
+        combinable = []
+        for section in self.all_sections:
+            if section in self._compiled:
+                continue
+            pattern = section_patterns.get(section, f'\\b{section}\\b')
+            self._compiled[section] = re.compile(pattern, re.IGNORECASE)
+            if not _UNCOMBINABLE.search(pattern):
+                combinable.append((section, pattern))
+
+        # Chaque section devient un groupe nommé s0, s1, ... de l'alternative
+        self._group_sections = {f's{i}': section for i, (section, _) in enumerate(combinable)}
+        try:
+            self._combined = re.compile(
+                '|'.join(f'(?P<s{i}>{pattern})' for i, (_, pattern) in enumerate(combinable)),
+                re.IGNORECASE
+            ) if combinable else None
+        except re.error:
+            self._combined = None
+
+    def match(self, content):
+        """Scanner le texte (minuscules calculées une fois) et retourner un GuideMatch"""
+        text = content.lower()
+        remaining = set(self._compiled)
+        found = set()
+
+        if self._combined is not None:
+            for m in self._combined.finditer(text):
+                section = self._group_sections[m.lastgroup]
+                if section in remaining:
+                    remaining.discard(section)
+                    found.add(section)
+                    if not remaining:
+                        break
+
+        # Une correspondance peut en masquer une autre dans l'alternative:
+        # vérifier individuellement les sections restantes
+        for section in remaining:
+            if self._compiled[section].search(text):
+                found.add(section)
+
+        detected = [section for section in self.all_sections if section in found]
+        missing = [section for section in self.required_sections if section not in found]
+        return GuideMatch(
+            detected=detected,
+            missing=missing,
+            required_count=len(self.required_sections),
+            detected_required_count=len(self.required_sections) - len(missing)
+        )
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def guide_version(guide_data):
+    """Empreinte du contenu du guide, utilisée comme numéro de version"""
+    payload = json.dumps(guide_data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def get_guide_matcher(guide_data, guide_id=None, version=None):
+    """Matcher compilé, mis en cache par (id du guide, version)"""
+    key = (guide_id, version or guide_version(guide_data))
+
+    with _cache_lock:
+        matcher = _cache.get(key)
+        if matcher is not None:
+            _cache.move_to_end(key)
+            return matcher
+
+    matcher = GuideMatcher(guide_data)
+
+    with _cache_lock:
+        _cache[key] = matcher
+        while len(_cache) > MATCHER_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return matcher
@@ -9,11 +9,8 @@ def format_datetime(value, format='%d/%m/%Y %H:%M'):
     return value.strftime(format)
 
 def get_client_ip():
-    """Récupérer l'IP du client"""
-    if request.headers.get('X-Forwarded-For'):
-        return request.headers.get('X-Forwarded-For').split(',')[0]
-    else:
-        return request.remote_addr
+    """Récupérer l'IP du client (X-Forwarded-For appliqué par ProxyFix selon TRUSTED_PROXY_HOPS)"""
+    return request.remote_addr
 
 def paginate_query(query, page, per_page=10):
     """Paginer une requête"""
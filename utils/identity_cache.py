@@ -0,0 +1,159 @@
+# utils/identity_cache.py - CACHE DES IDENTITÉS CHARGÉES PAR FLASK-LOGIN (TTL + LRU)
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+from flask_login import UserMixin
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from models import db, User
+
+# Colonnes copiées dans l'instantané (tout ce que lisent current_user et les gabarits)
+SNAPSHOT_COLUMNS = ('id', 'username', 'email', 'first_name', 'last_name', 'role', 'is_active')
+
+_SESSION_USERS = 'identity_cache_users'
+
+
+class UserSnapshot(UserMixin):
+    """Identité en lecture seule de l'utilisateur connecté (current_user).
+
+    Même interface que User pour les vues et les gabarits (rôle, noms,
+    is_admin()...), sans session ORM: pour modifier l'utilisateur, charger
+    le modèle avec to_model().
+    """
+
+    __slots__ = SNAPSHOT_COLUMNS
+
+    def __init__(self, id, username, email, first_name, last_name, role, is_active):
+        for name, value in zip(SNAPSHOT_COLUMNS, (id, username, email, first_name, last_name, role, is_active)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"UserSnapshot est en lecture seule: modifier User via to_model() ({name})")
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+    def to_model(self):
+        """Utilisateur ORM correspondant (une requête)"""
+        return db.session.get(User, self.id)
+
+    def get_full_name(self):
+        if self.first_name and self.last_name:
+            return f"{self.first_name} {self.last_name}"
+        return self.username
+
+    def is_admin(self):
+        return self.role == 'admin'
+
+    def is_jury(self):
+        return self.role == 'jury'
+
+    def is_student(self):
+        return self.role == 'student'
+
+    def __repr__(self):
+        return f'<UserSnapshot {self.username}>'
+
+
+class IdentityCache:
+    """Instantanés par id utilisateur, bornés en nombre (LRU) et en âge (TTL).
+
+    L'invalidation suit les commits de ce processus; le TTL borne le retard
+    des autres processus (modification faite par un autre worker).
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        ttl = current_app.config.get('USER_CACHE_TTL', 60)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and time.monotonic() - entry[1] <= ttl:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def put(self, snapshot):
+        max_size = current_app.config.get('USER_CACHE_SIZE', 1024)
+        with self._lock:
+            self._entries[snapshot.id] = (snapshot, time.monotonic())
+            self._entries.move_to_end(snapshot.id)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+identity_cache = IdentityCache()
+
+
+def load_user_snapshot(user_id):
+    """user_loader de Flask-Login: instantané en cache, sinon une requête sur les seules colonnes utiles"""
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+    if current_app.config.get('USER_CACHE_TTL', 60) <= 0:
+        return db.session.get(User, user_id)
+
+    snapshot = identity_cache.get(user_id)
+    if snapshot is None:
+        row = db.session.query(*[getattr(User, name) for name in SNAPSHOT_COLUMNS]) \
+            .filter(User.id == user_id).first()
+        if row is None:
+            return None
+        snapshot = UserSnapshot.from_row(row)
+        identity_cache.put(snapshot)
+    return snapshot
+
+
+# ----- Invalidation par événements du modèle -----
+
+def _remember(target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_SESSION_USERS, set()).add(target.id)
+
+
+@event.listens_for(User, 'after_delete')
+def _user_deleted(mapper, connection, target):
+    _remember(target)
+
+
+@event.listens_for(User, 'after_update')
+def _user_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in SNAPSHOT_COLUMNS):
+        _remember(target)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    user_ids = session.info.pop(_SESSION_USERS, None)
+    if user_ids:
+        identity_cache.invalidate(user_ids)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop(_SESSION_USERS, None)
@@ -0,0 +1,147 @@
+# utils/pagination.py - PAGINATION PAR CLÉ (KEYSET) AVEC CURSEURS OPAQUES
+import hashlib
+from datetime import datetime
+from decimal import Decimal
+
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import literal, tuple_
+
+FORWARD = 'n'
+BACKWARD = 'p'
+CURSOR_SALT = 'keyset-cursor'
+
+
+class KeysetPage:
+    """Une page de résultats et les curseurs vers les pages voisines"""
+
+    def __init__(self, items, next_cursor=None, prev_cursor=None, total=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def _signature(keys):
+    # Un curseur n'est valable que pour le tri qui l'a produit
+    return hashlib.sha1('|'.join(str(key) for key in keys).encode('utf-8')).hexdigest()[:8]
+
+
+def _serializer():
+    # Signé avec SECRET_KEY: un curseur forgé est refusé avant toute requête
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt=CURSOR_SALT)
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _decode_value(key, value):
+    """Valeur du curseur convertie au type Python de la clé; ValueError si incompatible"""
+    try:
+        expected = key.type.python_type
+    except NotImplementedError:
+        expected = None
+
+    if expected is datetime:
+        if not isinstance(value, dict) or not isinstance(value.get('dt'), str):
+            raise ValueError(value)
+        return datetime.fromisoformat(value['dt'])
+    if value is None or isinstance(value, (bool, dict, list)):
+        raise ValueError(value)
+    if expected is int:
+        if not isinstance(value, int):
+            raise ValueError(value)
+        return value
+    if expected in (float, Decimal):
+        if not isinstance(value, (int, float)):
+            raise ValueError(value)
+        return expected(value)
+    if expected is str and not isinstance(value, str):
+        raise ValueError(value)
+    return value
+
+
+def encode_cursor(keys, values, direction=FORWARD):
+    """Curseur opaque et signé désignant une position dans le tri"""
+    return _serializer().dumps({'s': _signature(keys), 'd': direction, 'v': [_encode_value(v) for v in values]})
+
+
+def decode_cursor(keys, cursor):
+    """(direction, valeurs) d'un curseur, None s'il est absent, invalide ou d'un autre tri"""
+    if not cursor:
+        return None
+    try:
+        payload = _serializer().loads(cursor)
+        if payload.get('s') != _signature(keys) or payload.get('d') not in (FORWARD, BACKWARD):
+            return None
+        if len(payload['v']) != len(keys):
+            return None
+        values = [_decode_value(key, value) for key, value in zip(keys, payload['v'])]
+    except (BadSignature, ValueError, TypeError, KeyError, AttributeError):
+        return None
+    return payload['d'], values
+
+
+def keyset_paginate(query, keys, cursor=None, per_page=10, descending=True, with_count=False):
+    """Paginer une requête ORM par recherche de clé plutôt que par OFFSET.
+
+    keys: expressions de tri sur des colonnes NOT NULL (un NULL en fin de page
+    arrêterait le parcours), toutes dans le même sens, la dernière unique
+    (ex: (Comment.recommendations, Comment.id)). La page N coûte autant que
+    la page 1: un parcours d'index à partir de la clé du curseur, limité à
+    per_page + 1. Le COUNT n'est exécuté que si with_count est demandé.
+    """
+    total = query.order_by(None).count() if with_count else None
+
+    decoded = decode_cursor(keys, cursor)
+    direction, values = decoded if decoded else (FORWARD, None)
+    backward = direction == BACKWARD
+
+    # Reculer = parcourir le tri inverse à partir du curseur puis remettre la page à l'endroit
+    scan_descending = descending != backward
+    if values is not None:
+        row = tuple_(*keys)
+        bound = tuple_(*[literal(value, key.type) for key, value in zip(keys, values)])
+        query = query.filter(row < bound if scan_descending else row > bound)
+    ordering = [key.desc() if scan_descending else key.asc() for key in keys]
+
+    labels = [key.label(f'_keyset_{index}') for index, key in enumerate(keys)]
+    rows = query.add_columns(*labels).order_by(None).order_by(*ordering).limit(per_page + 1).all()
+
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backward:
+        rows.reverse()
+
+    items = [row[0] for row in rows]
+    if not rows:
+        return KeysetPage(items, total=total)
+
+    first_key, last_key = list(rows[0][1:]), list(rows[-1][1:])
+    has_next = more if not backward else True
+    has_prev = more if backward else values is not None
+    return KeysetPage(
+        items,
+        next_cursor=encode_cursor(keys, last_key, FORWARD) if has_next else None,
+        prev_cursor=encode_cursor(keys, first_key, BACKWARD) if has_prev else None,
+        total=total
+    )
@@ -0,0 +1,63 @@
+# utils/passwords.py - POLITIQUE DE HACHAGE DES MOTS DE PASSE (ALGORITHME, COÛT, REHACHAGE)
+import sys
+from functools import lru_cache
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from config import Config
+
+
+def _setting(name):
+    if has_app_context():
+        return current_app.config.get(name, getattr(Config, name))
+    return getattr(Config, name)
+
+
+@lru_cache(maxsize=16)
+def canonical_method(method):
+    """Préfixe exact écrit par Werkzeug pour une méthode (coût par défaut explicité),
+    ex: 'pbkdf2:sha256' -> 'pbkdf2:sha256:600000'"""
+    return generate_password_hash('', method=method, salt_length=1).split('$', 1)[0]
+
+
+def hash_password(password, method=None):
+    method = method or _setting('PASSWORD_HASH_METHOD')
+    return _offload(generate_password_hash, password, method, _setting('PASSWORD_SALT_LENGTH'))
+
+
+def verify_password(password_hash, password):
+    return _offload(check_password_hash, password_hash, password)
+
+
+def needs_rehash(password_hash):
+    """Le hachage stocké ne suit plus la politique (algorithme, coût ou longueur du sel)"""
+    parts = password_hash.split('$')
+    if len(parts) != 3:
+        return True
+    method, salt, _ = parts
+    return (method != canonical_method(_setting('PASSWORD_HASH_METHOD'))
+            or len(salt) != _setting('PASSWORD_SALT_LENGTH'))
+
+
+# ----- Exécution hors de la boucle des workers asynchrones -----
+
+def _offload(function, *args):
+    """Sous gevent/eventlet, un hachage de ~50 ms bloque tous les greenlets du worker:
+    le calculer dans le pool de threads natifs (scrypt et PBKDF2 libèrent le GIL).
+    Workers synchrones ou threads: appel direct."""
+    if not _setting('PASSWORD_HASH_OFFLOAD'):
+        return function(*args)
+
+    if 'gevent' in sys.modules:
+        from gevent import monkey
+        if monkey.is_module_patched('socket'):
+            import gevent
+            return gevent.get_hub().threadpool.apply(function, args)
+
+    if 'eventlet' in sys.modules:
+        from eventlet import patcher, tpool
+        if patcher.is_monkey_patched('socket'):
+            return tpool.execute(function, *args)
+
+    return function(*args)
@@ -0,0 +1,127 @@
+# utils/pdf_export.py - GÉNÉRATION DES EXPORTS PDF
+# reportlab n'est importé qu'au premier export, pas au démarrage des workers
+import io
+
+
+def _title_style(styles):
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib import colors
+
+    return ParagraphStyle(
+        'TitleStyle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        textColor=colors.HexColor('#2C3E50'),
+        spaceAfter=30,
+        alignment=1
+    )
+
+
+def render_analysis_report(project):
+    """PDF de l'analyse IA d'un projet"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib import colors
+    from reportlab.lib.units import cm
+
+    analysis = project.ai_analysis_data
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    styles = getSampleStyleSheet()
+    story = []
+
+    # Titre
+    story.append(Paragraph("ANALYSE DU RAPPORT PFA", _title_style(styles)))
+
+    # Informations
+    story.append(Paragraph(f"<b>Projet:</b> {project.title}", styles['Normal']))
+    story.append(Paragraph(f"<b>Domaine:</b> {project.domain}", styles['Normal']))
+    story.append(Paragraph(f"<b>Score global:</b> {analysis['overall_score']}/100", styles['Normal']))
+    story.append(Paragraph(f"<b>Date:</b> {project.ai_analysis_date.strftime('%d/%m/%Y à %H:%M')}", styles['Normal']))
+    story.append(Spacer(1, 20))
+
+    # Scores
+    story.append(Paragraph("SCORES DÉTAILLÉS:", styles['Heading2']))
+
+    scores_data = [
+        ['Catégorie', 'Score', 'Détails'],
+        ['Structure', f"{analysis['structure']['score']}/100",
+         f"{len(analysis['structure']['sections_detected'])} sections"],
+        ['Technique', f"{analysis['technical']['score']}/100",
+         f"{analysis['technical']['terms_count']} termes"],
+        ['Mathématique', f"{analysis['mathematical']['score']}/100",
+         f"{analysis['mathematical']['complexity_level']}"],
+        ['Qualité', f"{analysis['quality']['score']}/100",
+         f"{analysis['quality']['readability']} lisibilité"]
+    ]
+
+    scores_table = Table(scores_data, colWidths=[4*cm, 2*cm, 4*cm])
+    scores_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2C3E50')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+    ]))
+
+    story.append(scores_table)
+    story.append(Spacer(1, 20))
+
+    # Recommandations
+    if analysis['recommendations']:
+        story.append(Paragraph("RECOMMANDATIONS:", styles['Heading2']))
+        for rec in analysis['recommendations']:
+            story.append(Paragraph(f"• {rec}", styles['Normal']))
+
+    doc.build(story)
+    buffer.seek(0)
+    return buffer
+
+
+def render_guide(guide, guide_data):
+    """PDF d'un guide de structure"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    styles = getSampleStyleSheet()
+    story = []
+
+    # Titre
+    story.append(Paragraph(f"GUIDE: {guide.title}", _title_style(styles)))
+
+    # Informations
+    story.append(Paragraph(f"<b>Domaine:</b> {guide.domain}", styles['Normal']))
+    story.append(Paragraph(f"<b>Description:</b> {guide.description}", styles['Normal']))
+    story.append(Spacer(1, 20))
+
+    # Sections requises
+    story.append(Paragraph("SECTIONS REQUISES:", styles['Heading2']))
+    for section in guide_data.get('required_sections', []):
+        story.append(Paragraph(f"• {section.title()}", styles['Normal']))
+
+    story.append(Spacer(1, 15))
+
+    # Sections optionnelles
+    if guide_data.get('optional_sections'):
+        story.append(Paragraph("SECTIONS OPTIONNELLES:", styles['Heading2']))
+        for section in guide_data['optional_sections']:
+            story.append(Paragraph(f"• {section.title()}", styles['Normal']))
+
+    story.append(Spacer(1, 15))
+
+    # Critères d'évaluation
+    eval_criteria = guide_data.get('evaluation_criteria', {})
+    story.append(Paragraph("CRITÈRES D'ÉVALUATION:", styles['Heading2']))
+    story.append(Paragraph(f"Structure: {eval_criteria.get('structure_weight', 0.4) * 100}%", styles['Normal']))
+    story.append(Paragraph(f"Technique: {eval_criteria.get('technical_weight', 0.3) * 100}%", styles['Normal']))
+    story.append(Paragraph(f"Contenu: {eval_criteria.get('content_weight', 0.3) * 100}%", styles['Normal']))
+
+    doc.build(story)
+    buffer.seek(0)
+    return buffer
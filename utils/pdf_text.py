@@ -0,0 +1,90 @@
+# utils/pdf_text.py - EXTRACTION DU TEXTE DES PDF PAGE PAR PAGE
+import re
+import unicodedata
+
+import PyPDF2
+
+from utils.text_cache import text_cache
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Accents détachés produits par les PDF LaTeX ("Syst` emes", "G´ enie")
+ACCENT_MARKS = {'`': '\u0300', '´': '\u0301', 'ˆ': '\u0302', '^': '\u0302', '˜': '\u0303', '¨': '\u0308'}
+DETACHED_ACCENT_PATTERN = re.compile(r'(?<=[A-Za-z])\s?([`´ˆ^˜¨])\s?([aeiouyAEIOUY])')
+DETACHED_CEDILLA_PATTERN = re.compile(r'([cC])\s?¸')
+
+
+def iter_pdf_pages(file_path, max_pages=None):
+    """Générateur du texte brut de chaque page.
+
+    Le fichier est lu à la demande par PyPDF2 (flux FlateDecode décodés page
+    par page): seule la page courante est en mémoire, pas le fichier entier.
+    """
+    with open(file_path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        for index, page in enumerate(reader.pages):
+            if max_pages and index >= max_pages:
+                break
+            yield page.extract_text() or ''
+
+
+def extract_pages(file_path, max_pages=None, max_chars=None):
+    """Texte brut des pages, dans la limite de max_pages.
+
+    Avec max_chars, l'analyse s'arrête dès que le texte normalisé des pages lues
+    atteint le budget: les pages suivantes ne sont pas décodées.
+    """
+    pages = []
+    total = 0
+    for page_text in iter_pdf_pages(file_path, max_pages):
+        pages.append(page_text)
+        if max_chars:
+            total += len(normalize_text(page_text))
+            if total >= max_chars:
+                break
+    return {'pages': pages}
+
+
+def get_pdf_pages(file_path, max_pages=None, max_chars=None):
+    """Pages du PDF via le cache disque (clé: SHA-256 du fichier).
+
+    Les limites font partie de l'espace de noms: une entrée tronquée n'est
+    jamais servie à un appelant dont le budget est plus grand.
+    """
+    namespace = 'pypdf2'
+    if max_pages:
+        namespace += f'-{max_pages}p'
+    if max_chars:
+        namespace += f'-{max_chars}c'
+    return text_cache.get_or_extract(
+        file_path, namespace, lambda path: extract_pages(path, max_pages, max_chars)
+    )['pages']
+
+
+def normalize_text(text):
+    """Normaliser (ligatures, accents détachés, espaces) en gardant les accents"""
+    text = DETACHED_ACCENT_PATTERN.sub(lambda m: m.group(2) + ACCENT_MARKS[m.group(1)], text)
+    text = DETACHED_CEDILLA_PATTERN.sub(lambda m: m.group(1) + '\u0327', text)
+    text = unicodedata.normalize('NFKC', text)
+    return WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+def iter_pdf_text(file_path, max_pages=None, max_chars=None):
+    """Générateur du texte normalisé page par page, arrêté au budget de caractères"""
+    remaining = max_chars
+    for page_text in get_pdf_pages(file_path, max_pages, max_chars):
+        text = normalize_text(page_text)
+        if not text:
+            continue
+        if remaining is not None:
+            text = text[:remaining]
+            remaining -= len(text)
+        yield text
+        if remaining is not None and remaining <= 0:
+            break
+
+
+def extract_pdf_text(file_path, max_pages=None, max_chars=None):
+    """Texte complet du PDF dans les limites de pages et de caractères"""
+    text = ' '.join(iter_pdf_text(file_path, max_pages, max_chars))
+    return text[:max_chars] if max_chars else text
@@ -0,0 +1,169 @@
+# utils/perf.py - INSTRUMENTATION: REQUÊTES SQL ET TEMPS PAR ROUTE
+import threading
+import time
+
+from flask import g, has_request_context, request, template_rendered, before_render_template
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class EndpointStats:
+    """Agrégats d'une route depuis le démarrage du processus"""
+
+    def __init__(self):
+        self.requests = 0
+        self.statements = 0
+        self.max_statements = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.over_budget = 0
+
+    def record(self, statements, db_time, render_time, total_time, over_budget):
+        self.requests += 1
+        self.statements += statements
+        self.max_statements = max(self.max_statements, statements)
+        self.db_time += db_time
+        self.render_time += render_time
+        self.total_time += total_time
+        self.max_time = max(self.max_time, total_time)
+        if over_budget:
+            self.over_budget += 1
+
+    def to_dict(self):
+        requests = self.requests or 1
+        return {
+            'requests': self.requests,
+            'avg_statements': round(self.statements / requests, 1),
+            'max_statements': self.max_statements,
+            'avg_db_ms': round(self.db_time / requests * 1000, 2),
+            'avg_render_ms': round(self.render_time / requests * 1000, 2),
+            'avg_total_ms': round(self.total_time / requests * 1000, 2),
+            'max_total_ms': round(self.max_time * 1000, 2),
+            'over_budget': self.over_budget
+        }
+
+
+class PerfRecorder:
+    """Compte les requêtes SQL et mesure les temps de chaque vue.
+
+    Les événements SQLAlchemy (before/after_cursor_execute) alimentent un état
+    par requête HTTP stocké dans flask.g; after_request l'agrège par endpoint.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._app = None
+
+    def init_app(self, app):
+        if not app.config.get('PERF_INSTRUMENTATION', True):
+            return
+        self._app = app
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        before_render_template.connect(self._start_render, app)
+        template_rendered.connect(self._finish_render, app)
+
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    # ----- Cycle de la requête -----
+
+    def _start_request(self):
+        g.perf = {'start': time.perf_counter(), 'statements': 0, 'db_time': 0.0,
+                  'render_time': 0.0, 'render_start': None}
+
+    def _start_render(self, sender, template, context, **extra):
+        perf = g.get('perf')
+        if perf is not None:
+            perf['render_start'] = time.perf_counter()
+
+    def _finish_render(self, sender, template, context, **extra):
+        perf = g.get('perf')
+        if perf is not None and perf['render_start'] is not None:
+            perf['render_time'] += time.perf_counter() - perf['render_start']
+            perf['render_start'] = None
+
+    def _finish_request(self, response):
+        perf = g.pop('perf', None)
+        if perf is None:
+            return response
+
+        endpoint = request.endpoint or 'unknown'
+        total_time = time.perf_counter() - perf['start']
+        over_budget = self._check_budget(endpoint, perf['statements'], total_time)
+
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, EndpointStats())
+            stats.record(perf['statements'], perf['db_time'], perf['render_time'], total_time, over_budget)
+
+        response.headers['Server-Timing'] = (
+            f"db;dur={perf['db_time'] * 1000:.1f};desc=\"{perf['statements']} SQL\", "
+            f"render;dur={perf['render_time'] * 1000:.1f}, total;dur={total_time * 1000:.1f}"
+        )
+        return response
+
+    def _check_budget(self, endpoint, statements, total_time):
+        config = self._app.config
+        budget = config.get('PERF_BUDGETS', {}).get(endpoint, {})
+        max_statements = budget.get('statements', config.get('PERF_DEFAULT_STATEMENT_BUDGET'))
+        max_ms = budget.get('ms', config.get('PERF_DEFAULT_TIME_BUDGET_MS'))
+
+        exceeded = []
+        if max_statements is not None and statements > max_statements:
+            exceeded.append(f"{statements} requêtes SQL (budget {max_statements})")
+        if max_ms is not None and total_time * 1000 > max_ms:
+            exceeded.append(f"{total_time * 1000:.0f} ms (budget {max_ms} ms)")
+        if exceeded:
+            self._app.logger.warning(f"⚠️ Budget dépassé pour {endpoint}: {', '.join(exceeded)}")
+        return bool(exceeded)
+
+    # ----- Lecture -----
+
+    def snapshot(self):
+        """{endpoint: agrégats} trié par temps total cumulé"""
+        with self._lock:
+            items = sorted(self._stats.items(), key=lambda item: item[1].total_time, reverse=True)
+            return {endpoint: stats.to_dict() for endpoint, stats in items}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def prometheus(self):
+        """Exposition au format texte Prometheus (compteurs du processus courant)"""
+        metrics = (
+            ('remarqpfa_http_requests_total', 'Requêtes HTTP traitées', 'requests'),
+            ('remarqpfa_sql_statements_total', 'Requêtes SQL exécutées', 'statements'),
+            ('remarqpfa_db_seconds_total', 'Temps passé en base', 'db_time'),
+            ('remarqpfa_render_seconds_total', 'Temps de rendu des templates', 'render_time'),
+            ('remarqpfa_request_seconds_total', 'Temps total des requêtes', 'total_time'),
+            ('remarqpfa_budget_exceeded_total', 'Requêtes hors budget', 'over_budget'),
+        )
+        with self._lock:
+            lines = []
+            for name, help_text, attribute in metrics:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} counter')
+                for endpoint, endpoint_stats in sorted(self._stats.items()):
+                    lines.append(f'{name}{{endpoint="{endpoint}"}} {getattr(endpoint_stats, attribute)}')
+        return '\n'.join(lines) + '\n'
+
+
+perf_recorder = PerfRecorder()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'perf' in g:
+        conn.info.setdefault('perf_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('perf_query_start')
+    if not starts or not has_request_context() or 'perf' not in g:
+        return
+    g.perf['db_time'] += time.perf_counter() - starts.pop()
+    g.perf['statements'] += 1
@@ -0,0 +1,173 @@
+# utils/rate_limit.py - LIMITATION DE DÉBIT PAR SEAU À JETONS (UTILISATEUR ET IP)
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request
+from flask_login import current_user
+from werkzeug.exceptions import TooManyRequests
+
+from utils.helpers import get_client_ip
+
+# Nombre de seaux gardés par le stockage mémoire (les moins récemment utilisés sont oubliés)
+MEMORY_MAX_KEYS = 10000
+# Purge des seaux pleins du stockage SQLite, tous les N appels
+SQLITE_PRUNE_EVERY = 1000
+
+
+class RateLimitExceeded(TooManyRequests):
+    """429 avec l'en-tête Retry-After (secondes avant qu'un jeton soit disponible)"""
+
+    description = "Trop de requêtes, réessayez dans quelques instants."
+
+    def __init__(self, retry_after, description=None):
+        super().__init__(description=description, retry_after=max(1, math.ceil(retry_after)))
+
+
+def _refill(tokens, updated_at, capacity, refill_rate, now):
+    return min(capacity, tokens + (now - updated_at) * refill_rate)
+
+
+def _consume(tokens, capacity, refill_rate, now):
+    """(jetons restants, horodatage où le seau sera plein, attente si refusé ou 0)"""
+    if tokens >= 1:
+        tokens -= 1
+        wait = 0
+    else:
+        wait = (1 - tokens) / refill_rate
+    return tokens, now + (capacity - tokens) / refill_rate, wait
+
+
+class MemoryStore:
+    """Seaux du processus courant (un worker = ses propres compteurs), en LRU borné"""
+
+    def __init__(self):
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate, now):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            tokens = capacity if bucket is None else _refill(bucket[0], bucket[1], capacity, refill_rate, now)
+            tokens, _, wait = _consume(tokens, capacity, refill_rate, now)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > MEMORY_MAX_KEYS:
+                # O(1) par appel: le seau inutilisé depuis le plus longtemps est oublié
+                self._buckets.popitem(last=False)
+            return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteStore:
+    """Seaux partagés entre les workers d'une même machine (fichier SQLite).
+
+    Lecture et mise à jour d'un seau dans une transaction BEGIN IMMEDIATE:
+    deux workers ne peuvent pas consommer le même jeton.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL, full_at REAL NOT NULL)"
+            )
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def consume(self, key, capacity, refill_rate, now):
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens = capacity if row is None else _refill(row[0], row[1], capacity, refill_rate, now)
+            tokens, full_at, wait = _consume(tokens, capacity, refill_rate, now)
+            connection.execute(
+                "INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated_at, full_at) VALUES (?, ?, ?, ?)",
+                (key, tokens, now, full_at)
+            )
+            self._calls += 1
+            if self._calls % SQLITE_PRUNE_EVERY == 0:
+                connection.execute("DELETE FROM rate_limit_buckets WHERE full_at <= ?", (now,))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return wait
+
+    def clear(self):
+        self._connection().execute("DELETE FROM rate_limit_buckets")
+
+
+class RateLimiter:
+    """Limites nommées (RATE_LIMITS), chacune avec un seau par utilisateur et un seau par IP"""
+
+    def __init__(self):
+        self.store = None
+
+    def init_app(self, app):
+        if app.config.get('RATE_LIMIT_STORAGE', 'memory') == 'sqlite':
+            self.store = SQLiteStore(app.config['RATE_LIMIT_SQLITE_PATH'])
+        else:
+            self.store = MemoryStore()
+
+    def hit(self, name):
+        """Consommer un jeton de chaque seau de la limite; lève RateLimitExceeded si l'un est vide"""
+        if not current_app.config.get('RATE_LIMIT_ENABLED', True):
+            return
+        limit = current_app.config.get('RATE_LIMITS', {}).get(name)
+        if not limit:
+            return
+
+        now = time.time()
+        # Seau de l'utilisateur d'abord: un utilisateur déjà limité ne vide pas
+        # le seau de l'IP qu'il partage avec d'autres (NAT, réseau du campus)
+        keys = []
+        if 'user' in limit and current_user.is_authenticated:
+            keys.append(('user', f'{name}:user:{current_user.id}'))
+        if 'ip' in limit:
+            keys.append(('ip', f'{name}:ip:{get_client_ip()}'))
+
+        for scope, key in keys:
+            bucket = limit[scope]
+            wait = self.store.consume(key, bucket['burst'], bucket['limit'] / bucket['period'], now)
+            if wait:
+                current_app.logger.warning("Limite %s atteinte (%s)", name, key)
+                raise RateLimitExceeded(wait)
+
+
+rate_limiter = RateLimiter()
+
+
+def rate_limit(name, methods=None):
+    """Décorateur de vue: limite nommée de RATE_LIMITS, éventuellement restreinte à certaines méthodes HTTP
+    (placer sous @login_required pour que le seau par utilisateur s'applique)"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if methods is None or request.method in methods:
+                rate_limiter.hit(name)
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
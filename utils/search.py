@@ -0,0 +1,253 @@
+# utils/search.py - RECHERCHE PLEIN TEXTE DES PROJETS (SQLite FTS5 / PostgreSQL tsvector)
+import re
+import unicodedata
+
+from sqlalchemy import event, func, inspect, literal_column, select, text, or_
+
+from models import db, PFAProject
+
+SEARCH_TABLE = 'project_search'
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Poids des colonnes: titre > technologies > description
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+FRENCH_STOP_WORDS = {
+    'a', 'au', 'aux', 'avec', 'ce', 'ces', 'dans', 'de', 'des', 'du', 'en', 'et', 'il', 'la', 'le',
+    'les', 'leur', 'ou', 'par', 'pas', 'pour', 'qui', 'que', 'sa', 'se', 'ses', 'son', 'sur', 'un',
+    'une', 'l', 'd'
+}
+
+# Suffixes (sans accents) retirés par le raciniseur, du plus long au plus court
+FRENCH_SUFFIXES = (
+    'issements', 'issement', 'atrices', 'ateurs', 'ations', 'atrice', 'ateur', 'ation',
+    'ements', 'ement', 'ments', 'ment', 'ances', 'ences', 'ance', 'ence', 'ables', 'ible',
+    'able', 'iques', 'ique', 'istes', 'iste', 'ismes', 'isme', 'euses', 'euse', 'eux',
+    'ites', 'ite', 'ives', 'ive', 'ifs', 'if', 'ees', 'ee', 'es', 'er', 'ez', 'e'
+)
+MIN_STEM_LENGTH = 3
+
+# Configuration PostgreSQL: racinisation française + suppression des accents
+POSTGRES_SETUP = (
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    """DO $$ BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'fr_unaccent') THEN
+            CREATE TEXT SEARCH CONFIGURATION fr_unaccent (COPY = french);
+            ALTER TEXT SEARCH CONFIGURATION fr_unaccent
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem;
+        END IF;
+    END $$""",
+    f"""CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} (
+        project_id INTEGER PRIMARY KEY REFERENCES pfaprojects(id) ON DELETE CASCADE,
+        document TSVECTOR NOT NULL
+    )""",
+    f"CREATE INDEX IF NOT EXISTS idx_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)",
+)
+POSTGRES_DOCUMENT = (
+    "setweight(to_tsvector('fr_unaccent', coalesce({title}, '')), 'A') || "
+    "setweight(to_tsvector('fr_unaccent', coalesce({technologies}, '')), 'B') || "
+    "setweight(to_tsvector('fr_unaccent', coalesce({description}, '')), 'C')"
+)
+
+_available = {}
+
+
+# ----- Analyse du texte (SQLite: racinisation côté Python) -----
+
+def fold_accents(value):
+    """Minuscules sans accents ("Développement" -> "developpement")"""
+    decomposed = unicodedata.normalize('NFKD', value.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def stem_french(word):
+    """Raciniseur français léger: pluriel puis premier suffixe dérivationnel"""
+    if len(word) > MIN_STEM_LENGTH + 1 and word[-1] in 'sx':
+        word = word[:-1]
+    for suffix in FRENCH_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(value):
+    """Termes d'un texte: sans accents, sans mots vides"""
+    return [token for token in TOKEN_PATTERN.findall(fold_accents(value or ''))
+            if token not in FRENCH_STOP_WORDS]
+
+
+def analyze(value):
+    """Texte indexé dans FTS5: racine de chaque terme, suivie du terme complet
+    quand il diffère (la recherche par préfixe porte sur les mots saisis)"""
+    terms = []
+    for token in tokenize(value):
+        stem = stem_french(token)
+        terms.append(stem)
+        if stem != token:
+            terms.append(token)
+    return ' '.join(terms)
+
+
+# ----- Création et disponibilité de l'index -----
+
+def _backend(bind):
+    return {'sqlite': 'sqlite', 'postgresql': 'postgresql'}.get(bind.dialect.name)
+
+
+def is_available(connection):
+    """L'index existe-t-il dans cette base? (vérifié une fois par base)"""
+    key = str(connection.engine.url)
+    if key not in _available:
+        _available[key] = _backend(connection) is not None and inspect(connection).has_table(SEARCH_TABLE)
+    return _available[key]
+
+
+def create_search_index(connection):
+    """Créer la table d'index si elle n'existe pas (appelé après db.create_all)"""
+    backend = _backend(connection)
+    if backend == 'sqlite':
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+            f"USING fts5(title, technologies, description, tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+    elif backend == 'postgresql':
+        for statement in POSTGRES_SETUP:
+            connection.execute(text(statement))
+    else:
+        return
+    _available[str(connection.engine.url)] = True
+
+
+@event.listens_for(db.metadata, 'after_create')
+def _create_after_tables(metadata, connection, **kw):
+    existed = inspect(connection).has_table(SEARCH_TABLE)
+    create_search_index(connection)
+    if not existed and _backend(connection) is not None:
+        # Index créé sur une base existante: indexer les projets déjà présents
+        index_all_projects(connection)
+
+
+# ----- Synchronisation -----
+
+def index_project(connection, project_id, title, description, technologies):
+    if _backend(connection) == 'sqlite':
+        connection.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :id"), {'id': project_id})
+        connection.execute(
+            text(f"INSERT INTO {SEARCH_TABLE} (rowid, title, technologies, description) "
+                 f"VALUES (:id, :title, :technologies, :description)"),
+            {'id': project_id, 'title': analyze(title), 'technologies': analyze(technologies),
+             'description': analyze(description)}
+        )
+    else:
+        document = POSTGRES_DOCUMENT.format(title=':title', technologies=':technologies',
+                                            description=':description')
+        connection.execute(
+            text(f"INSERT INTO {SEARCH_TABLE} (project_id, document) VALUES (:id, {document}) "
+                 f"ON CONFLICT (project_id) DO UPDATE SET document = EXCLUDED.document"),
+            {'id': project_id, 'title': title, 'technologies': technologies, 'description': description}
+        )
+
+
+def unindex_project(connection, project_id):
+    column = 'rowid' if _backend(connection) == 'sqlite' else 'project_id'
+    connection.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE {column} = :id"), {'id': project_id})
+
+
+def index_all_projects(connection):
+    """Indexer tous les projets (table d'index supposée vide)"""
+    if _backend(connection) == 'postgresql':
+        document = POSTGRES_DOCUMENT.format(title='title', technologies='technologies',
+                                            description='description')
+        connection.execute(text(f"INSERT INTO {SEARCH_TABLE} (project_id, document) "
+                                f"SELECT id, {document} FROM pfaprojects"))
+        return
+
+    projects = PFAProject.__table__.c
+    rows = [{'id': project_id, 'title': analyze(title), 'technologies': analyze(technologies),
+             'description': analyze(description)}
+            for project_id, title, description, technologies in connection.execute(
+                select(projects.id, projects.title, projects.description, projects.technologies))]
+    if rows:
+        connection.execute(
+            text(f"INSERT INTO {SEARCH_TABLE} (rowid, title, technologies, description) "
+                 f"VALUES (:id, :title, :technologies, :description)"),
+            rows
+        )
+
+
+def rebuild_search_index():
+    """Réindexer tous les projets"""
+    connection = db.session.connection()
+    create_search_index(connection)
+    if not is_available(connection):
+        return 0
+
+    connection.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+    index_all_projects(connection)
+    db.session.commit()
+    return PFAProject.query.count()
+
+
+@event.listens_for(PFAProject, 'after_insert')
+def _index_new_project(mapper, connection, target):
+    if is_available(connection):
+        index_project(connection, target.id, target.title, target.description, target.technologies)
+
+
+@event.listens_for(PFAProject, 'after_update')
+def _reindex_project(mapper, connection, target):
+    state = inspect(target)
+    if is_available(connection) and any(state.attrs[name].history.has_changes()
+                                        for name in ('title', 'description', 'technologies')):
+        index_project(connection, target.id, target.title, target.description, target.technologies)
+
+
+@event.listens_for(PFAProject, 'after_delete')
+def _unindex_project(mapper, connection, target):
+    if is_available(connection):
+        unindex_project(connection, target.id)
+
+
+# ----- Recherche -----
+
+def _ilike_clause(search_query):
+    return or_(
+        PFAProject.title.ilike(f'%{search_query}%'),
+        PFAProject.description.ilike(f'%{search_query}%'),
+        PFAProject.technologies.ilike(f'%{search_query}%')
+    )
+
+
+def _ranked_matches(backend, tokens):
+    """Sous-requête (project_id, rank), rank croissant = plus pertinent"""
+    if backend == 'sqlite':
+        # Tous les termes requis; le dernier peut être un mot complet ou en cours de saisie
+        terms = [f'"{stem_french(token)}"' for token in tokens[:-1]]
+        terms.append(f'("{stem_french(tokens[-1])}" OR "{tokens[-1]}"*)')
+        search_table = literal_column(SEARCH_TABLE)
+        return select(
+            literal_column('rowid').label('project_id'),
+            func.bm25(search_table, *BM25_WEIGHTS).label('rank')
+        ).select_from(text(SEARCH_TABLE)).where(search_table.op('MATCH')(' AND '.join(terms))).subquery()
+
+    ts_query = func.to_tsquery('fr_unaccent', ' & '.join(tokens[:-1] + [f'{tokens[-1]}:*']))
+    document = literal_column('document')
+    return select(
+        literal_column('project_id').label('project_id'),
+        (-func.ts_rank(document, ts_query)).label('rank')
+    ).select_from(text(SEARCH_TABLE)).where(document.op('@@')(ts_query)).subquery()
+
+
+def apply_search(query, search_query):
+    """Filtrer une requête PFAProject sur le texte saisi.
+
+    Retourne (requête, rang): le rang s'utilise dans order_by (croissant), il vaut
+    None quand l'index est indisponible et que la recherche retombe sur ilike.
+    """
+    tokens = tokenize(search_query)
+    connection = db.session.connection()
+    if not tokens or not is_available(connection):
+        return query.filter(_ilike_clause(search_query)), None
+
+    matches = _ranked_matches(_backend(connection), tokens)
+    return query.join(matches, matches.c.project_id == PFAProject.id), matches.c.rank
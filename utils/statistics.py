@@ -0,0 +1,120 @@
+# utils/statistics.py - STATISTIQUES GLOBALES PRÉCALCULÉES (CACHE + INVALIDATION)
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session, object_session
+
+from models import db, User, Comment, PFAProject
+
+# Colonnes dont la modification change les statistiques globales
+# (une vue de projet ne doit pas vider le cache)
+TRACKED_ATTRIBUTES = {
+    PFAProject: ('status', 'student_id', 'created_at'),
+    Comment: ('is_public', 'recommendations', 'jury_id', 'created_at'),
+    User: ('role', 'is_active'),
+}
+
+_SESSION_FLAG = 'global_statistics_dirty'
+
+
+def compute_global_statistics():
+    """Statistiques globales en deux requêtes (agrégats + répartition des rôles)"""
+    last_week = datetime.utcnow() - timedelta(days=7)
+
+    totals = db.session.execute(select(
+        select(func.count(PFAProject.id))
+            .where(PFAProject.status == 'published')
+            .scalar_subquery().label('total_projects'),
+        select(func.count(Comment.id))
+            .where(Comment.is_public == True)
+            .scalar_subquery().label('total_comments'),
+        select(func.sum(Comment.recommendations)).scalar_subquery().label('total_recommendations'),
+        select(func.avg(Comment.recommendations)).scalar_subquery().label('avg_project_rating'),
+        select(func.count(PFAProject.student_id.distinct()))
+            .join(User, User.id == PFAProject.student_id)
+            .where(User.role == 'student', PFAProject.created_at >= last_week)
+            .scalar_subquery().label('active_students'),
+        select(func.count(Comment.jury_id.distinct()))
+            .join(User, User.id == Comment.jury_id)
+            .where(User.role == 'jury', Comment.created_at >= last_week)
+            .scalar_subquery().label('active_juries'),
+    )).one()
+
+    roles = dict(db.session.query(User.role, func.count(User.id))
+                 .filter(User.is_active == True)
+                 .group_by(User.role).all())
+
+    return {
+        'total_projects': totals.total_projects,
+        'total_students': roles.get('student', 0),
+        'total_juries': roles.get('jury', 0),
+        'total_comments': totals.total_comments,
+        'total_recommendations': totals.total_recommendations or 0,
+        'avg_project_rating': totals.avg_project_rating or 0,
+        'active_this_week': totals.active_students + totals.active_juries
+    }
+
+
+class StatisticsSnapshot:
+    """Instantané des statistiques globales, recalculé après invalidation ou expiration du TTL"""
+
+    def __init__(self):
+        self._data = None
+        self._computed_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        # Le TTL borne aussi la fraîcheur entre processus et la fenêtre "cette semaine"
+        ttl = current_app.config.get('STATS_CACHE_TTL', 300)
+        with self._lock:
+            if self._data is None or time.monotonic() - self._computed_at > ttl:
+                self._data = compute_global_statistics()
+                self._computed_at = time.monotonic()
+            return dict(self._data)
+
+    def invalidate(self):
+        with self._lock:
+            self._data = None
+
+
+statistics_snapshot = StatisticsSnapshot()
+
+
+def get_global_statistics():
+    """Statistiques globales de la plateforme (depuis le cache)"""
+    return statistics_snapshot.get()
+
+
+# ----- Invalidation par événements du modèle -----
+
+def _mark_dirty(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info[_SESSION_FLAG] = True
+
+
+def _mark_dirty_if_tracked(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in TRACKED_ATTRIBUTES[type(target)]):
+        _mark_dirty(mapper, connection, target)
+
+
+for _model in TRACKED_ATTRIBUTES:
+    event.listen(_model, 'after_insert', _mark_dirty)
+    event.listen(_model, 'after_delete', _mark_dirty)
+    event.listen(_model, 'after_update', _mark_dirty_if_tracked)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    # Invalider après le commit: un recalcul concurrent ne voit jamais de données non validées
+    if session.info.pop(_SESSION_FLAG, False):
+        statistics_snapshot.invalidate()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop(_SESSION_FLAG, None)
@@ -0,0 +1,171 @@
+# utils/technology_index.py - INDEX DES TECHNOLOGIES DES PROJETS
+import re
+from collections import Counter
+
+from sqlalchemy import event, func, insert, inspect, select, delete
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import db, PFAProject, ProjectTechnology, TechnologyCount
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+MAX_NAME_LENGTH = 100
+
+project_technologies = ProjectTechnology.__table__
+technology_counts = TechnologyCount.__table__
+
+
+def normalize_technology(name):
+    """(slug, nom affiché) d'une technologie saisie, None si vide"""
+    name = WHITESPACE_PATTERN.sub(' ', name or '').strip()[:MAX_NAME_LENGTH]
+    if not name:
+        return None
+    return name.lower(), name
+
+
+def parse_technologies(technologies):
+    """{slug: nom} des technologies d'un champ "React, Flask, SQL" (sans doublons)"""
+    parsed = {}
+    for raw in (technologies or '').split(','):
+        normalized = normalize_technology(raw)
+        if normalized and normalized[0] not in parsed:
+            parsed[normalized[0]] = normalized[1]
+    return parsed
+
+
+def sync_project_technologies(connection, project_id, technologies, published):
+    """Remplacer les lignes d'un projet et reporter la différence sur les compteurs"""
+    old_rows = connection.execute(
+        select(project_technologies.c.slug, project_technologies.c.published)
+        .where(project_technologies.c.project_id == project_id)
+    ).all()
+    new_tags = parse_technologies(technologies) if technologies is not None else {}
+
+    connection.execute(delete(project_technologies).where(project_technologies.c.project_id == project_id))
+    if new_tags:
+        connection.execute(insert(project_technologies), [
+            {'project_id': project_id, 'slug': slug, 'name': name, 'published': published}
+            for slug, name in new_tags.items()
+        ])
+
+    deltas = Counter()
+    for slug, was_published in old_rows:
+        if was_published:
+            deltas[slug] -= 1
+    if published:
+        for slug in new_tags:
+            deltas[slug] += 1
+
+    _apply_count_deltas(connection, deltas, new_tags)
+
+
+def _upsert(connection):
+    """INSERT ... ON CONFLICT du dialecte (SQLite et PostgreSQL)"""
+    dialect = postgresql if connection.dialect.name == 'postgresql' else sqlite
+    return dialect.insert(technology_counts)
+
+
+def _apply_count_deltas(connection, deltas, names):
+    counts = technology_counts.c
+    rows = [
+        {'slug': slug, 'name': names.get(slug, slug), 'projects_count': delta}
+        for slug, delta in deltas.items() if delta != 0
+    ]
+    if not rows:
+        return
+
+    # Une seule instruction par technologie, sans course entre deux workers
+    statement = _upsert(connection)
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=[counts.slug],
+        set_={'projects_count': counts.projects_count + statement.excluded.projects_count}
+    ), rows)
+
+    emptied = [row['slug'] for row in rows if row['projects_count'] < 0]
+    if emptied:
+        connection.execute(delete(technology_counts).where(
+            counts.slug.in_(emptied), counts.projects_count <= 0
+        ))
+
+
+def get_technology_cloud(limit=20):
+    """Technologies les plus utilisées par les projets publiés: [(nom, nombre)]"""
+    rows = db.session.query(TechnologyCount.name, TechnologyCount.projects_count)\
+        .order_by(TechnologyCount.projects_count.desc(), TechnologyCount.slug)\
+        .limit(limit).all()
+    return [(name, count) for name, count in rows]
+
+
+def technology_filter(technology):
+    """Condition sur l'index: projets dont une technologie commence par la saisie
+    ("react" trouve "React" et "React Native", pas "Preact")"""
+    normalized = normalize_technology(technology)
+    if normalized is None:
+        return None
+    prefix = normalized[0]
+    # Intervalle [préfixe, préfixe suivant) plutôt que LIKE: sous SQLite, LIKE n'utilise pas
+    # l'index (collation BINARY); sous PostgreSQL, l'index idx_project_technologies_slug_c
+    slug = ProjectTechnology.slug
+    if db.engine.dialect.name == 'postgresql':
+        slug = slug.collate('C')
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    # IN (sous-requête) plutôt qu'EXISTS corrélé: parcours de l'index sur slug, pas des projets
+    return PFAProject.id.in_(
+        select(ProjectTechnology.project_id).where(slug >= prefix, slug < upper)
+    )
+
+
+def rebuild_technology_index(connection=None):
+    """Reconstruire entièrement l'index et les compteurs depuis pfaprojects.
+
+    Sans connexion: dans la session, validée à la fin; avec une connexion
+    (migration): dans la transaction de l'appelant.
+    """
+    if connection is None:
+        rows = rebuild_technology_index(db.session.connection())
+        db.session.commit()
+        return rows
+
+    connection.execute(delete(technology_counts))
+    connection.execute(delete(project_technologies))
+
+    rows = []
+    projects = connection.execute(
+        select(PFAProject.id, PFAProject.technologies, PFAProject.status)
+        .where(PFAProject.technologies.isnot(None))
+    )
+    for project_id, technologies, status in projects:
+        rows.extend(
+            {'project_id': project_id, 'slug': slug, 'name': name, 'published': status == 'published'}
+            for slug, name in parse_technologies(technologies).items()
+        )
+    if rows:
+        connection.execute(insert(project_technologies), rows)
+
+    connection.execute(insert(technology_counts).from_select(
+        ['slug', 'name', 'projects_count'],
+        select(project_technologies.c.slug,
+               func.min(project_technologies.c.name),
+               func.count(project_technologies.c.project_id))
+        .where(project_technologies.c.published == True)
+        .group_by(project_technologies.c.slug)
+    ))
+    return len(rows)
+
+
+# ----- Synchronisation par événements du modèle -----
+
+@event.listens_for(PFAProject, 'after_insert')
+def _index_new_project(mapper, connection, target):
+    sync_project_technologies(connection, target.id, target.technologies, target.status == 'published')
+
+
+@event.listens_for(PFAProject, 'after_update')
+def _reindex_project(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.technologies.history.has_changes() or state.attrs.status.history.has_changes():
+        sync_project_technologies(connection, target.id, target.technologies, target.status == 'published')
+
+
+@event.listens_for(PFAProject, 'after_delete')
+def _unindex_project(mapper, connection, target):
+    sync_project_technologies(connection, target.id, None, False)
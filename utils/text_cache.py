@@ -0,0 +1,150 @@
+# utils/text_cache.py - CACHE DISQUE DU TEXTE EXTRAIT DES PDF
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from config import Config
+
+HASH_CHUNK_SIZE = 1024 * 1024
+# L'éviction descend sous cette fraction de max_bytes: pas de nouvelle éviction à chaque écriture
+EVICT_TARGET_RATIO = 0.9
+# Recomptage complet du dossier (écritures des autres processus), en secondes
+RESCAN_INTERVAL = 300
+
+
+def file_digest(file_path):
+    """SHA-256 du contenu du fichier, lu par blocs"""
+    sha = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class TextCache:
+    """Cache adressé par contenu (SHA-256 du fichier) avec éviction LRU par taille.
+
+    La taille totale est tenue à jour à chaque écriture; le dossier n'est parcouru
+    qu'au premier appel, toutes les RESCAN_INTERVAL secondes et lors d'une éviction.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total = None
+        self._scanned_at = 0
+
+    def _entry_path(self, digest, namespace):
+        return os.path.join(self.cache_dir, digest[:2], f'{digest}.{namespace}.json')
+
+    def get(self, digest, namespace):
+        """Lire une entrée; None si absente ou illisible"""
+        path = self._entry_path(digest, namespace)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # La date de modification sert d'horodatage LRU
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return data
+
+    def set(self, digest, namespace, data):
+        """Écrire une entrée de façon atomique puis appliquer la limite de taille"""
+        path = self._entry_path(digest, namespace)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if self._total is None or time.monotonic() - self._scanned_at > RESCAN_INTERVAL:
+                self._scan()
+            else:
+                self._total += size - replaced
+            over = self._total > self.max_bytes
+        if over:
+            self.evict()
+
+    def get_or_extract(self, file_path, namespace, extractor):
+        """Retourner l'entrée en cache, sinon appeler extractor(file_path) et la stocker"""
+        digest = file_digest(file_path)
+        data = self.get(digest, namespace)
+        if data is None:
+            data = extractor(file_path)
+            try:
+                self.set(digest, namespace, data)
+            except OSError as e:
+                print(f"⚠️ Cache texte non écrit: {e}")
+        return data
+
+    def _scan(self):
+        """[(mtime, taille, chemin)] des entrées; met à jour le total (verrou tenu)"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        self._total = sum(size for _, size, _ in entries)
+        self._scanned_at = time.monotonic()
+        return entries
+
+    def evict(self):
+        """Au-delà de max_bytes, supprimer les entrées les moins récemment utilisées
+        jusqu'à EVICT_TARGET_RATIO de max_bytes"""
+        with self._lock:
+            entries = self._scan()
+            if self._total <= self.max_bytes:
+                return
+
+            target = self.max_bytes * EVICT_TARGET_RATIO
+            entries.sort()
+            for _, size, path in entries:
+                if self._total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    self._total -= size
+                except OSError:
+                    continue
+
+    def clear(self):
+        """Vider complètement le cache"""
+        with self._lock:
+            self._total = 0
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    try:
+                        os.remove(os.path.join(root, name))
+                    except OSError:
+                        continue
+
+
+# Instance globale (utilisable sans contexte d'application, y compris dans les workers)
+text_cache = TextCache(Config.TEXT_CACHE_DIR, Config.TEXT_CACHE_MAX_BYTES)
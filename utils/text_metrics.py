@@ -0,0 +1,97 @@
+# utils/text_metrics.py - MÉTRIQUES TEXTUELLES CALCULÉES EN UNE SEULE PASSE
+import math
+import re
+
+TECHNICAL_TERMS_PATTERN = re.compile(
+    r'\b(html|css|javascript|python|react|vue|angular|flask|django|tensorflow|pytorch|machine learning|deep learning|android|ios|react native|flutter|pandas|numpy|sql|database|api|rest|graphql)\b'
+)
+INLINE_MATH_PATTERN = re.compile(r'\$[^$]+\$')
+EQUATION_PATTERN = re.compile(r'[a-zA-Z]\s*=\s*[^\\n]+')
+SENTENCE_SEPARATOR_PATTERN = re.compile(r'[.!?]+')
+PARAGRAPH_SEPARATOR_PATTERN = re.compile(r'\n\s*\n')
+
+SECTIONS = ['introduction', 'methodologie', 'resultats', 'conclusion', 'bibliographie']
+SECTION_PATTERNS = {
+    'introduction': r'introduction|contexte|problématique|objectif',
+    'methodologie': r'méthodologie|méthode|approche|implémentation',
+    'resultats': r'résultat|expérimentation|test|performance',
+    'conclusion': r'conclusion|perspective|recommandation|bilan',
+    'bibliographie': r'bibliographie|référence|source'
+}
+COMPILED_SECTION_PATTERNS = {section: re.compile(pattern) for section, pattern in SECTION_PATTERNS.items()}
+
+TRANSITION_WORDS = ['premièrement', 'deuxièmement', 'ensuite', 'en conclusion', 'par conséquent']
+
+
+class TextMetrics:
+    """Toutes les mesures utilisées par le scoring, calculées une seule fois par texte"""
+
+    def __init__(self, content):
+        lowered = content.lower()
+
+        words = content.split()
+        self.word_count = len(words)
+        self.total_word_length = sum(len(word) for word in words)
+        self.sentence_count = sum(1 for _ in SENTENCE_SEPARATOR_PATTERN.finditer(content)) + 1
+        self.paragraph_count = sum(1 for _ in PARAGRAPH_SEPARATOR_PATTERN.finditer(content)) + 1
+
+        self.technical_terms = list(set(TECHNICAL_TERMS_PATTERN.findall(lowered)))
+        self.math_elements = (
+            sum(1 for _ in INLINE_MATH_PATTERN.finditer(content)) +
+            sum(1 for _ in EQUATION_PATTERN.finditer(content))
+        )
+        self.transition_count = sum(1 for word in TRANSITION_WORDS if word in lowered)
+        self.sections = [section for section in SECTIONS
+                         if COMPILED_SECTION_PATTERNS[section].search(lowered)]
+
+    @property
+    def avg_sentence_length(self):
+        return self.word_count / self.sentence_count
+
+    @property
+    def avg_word_length(self):
+        return self.total_word_length / self.word_count
+
+    # ----- Scores dérivés (mêmes formules que routes/ai_routes.py) -----
+
+    @property
+    def structural_score(self):
+        return min(100, len(self.sections) * 20)
+
+    @property
+    def technical_score(self):
+        if not self.technical_terms:
+            return 30
+        return min(100, len(self.technical_terms) * 10)
+
+    @property
+    def mathematical_complexity(self):
+        if self.math_elements > 0:
+            complexity = math.log2(self.math_elements + 1) * 10
+        else:
+            complexity = 10
+        return min(100, complexity)
+
+    @property
+    def structure_complexity(self):
+        sections = len(self.sections)
+        if self.paragraph_count > 0 and sections > 0:
+            return math.log(self.paragraph_count * sections) / math.log(10)
+        return 1.0
+
+    @property
+    def readability(self):
+        if self.sentence_count == 0 or self.word_count == 0:
+            return 50
+        readability = 206.835 - (1.015 * self.avg_sentence_length) - (84.6 * self.avg_word_length / 100)
+        return max(0, min(100, readability))
+
+    @property
+    def coherence(self):
+        section_score = min(1.0, len(self.sections) / 5)
+        transition_score = min(0.5, self.transition_count * 0.1)
+        return (section_score + transition_score) * 50
+
+    @property
+    def quality_score(self):
+        return (self.readability + self.coherence) / 2
@@ -0,0 +1,252 @@
+# utils/typeahead.py - INDEX DE PRÉFIXES POUR L'AUTOCOMPLÉTION
+import bisect
+import os
+import threading
+
+from flask import current_app
+from sqlalchemy import event, inspect, or_
+from sqlalchemy.orm import Session, object_session
+
+from models import db, User, PFAProject
+from utils.search import tokenize
+from utils.technology_index import parse_technologies
+
+DESCRIPTION_LENGTH = 120
+
+# Colonnes affichées ou indexées: leur modification rafraîchit le projet
+PROJECT_ATTRIBUTES = ('title', 'description', 'technologies', 'domain', 'status', 'student_id')
+USER_ATTRIBUTES = ('first_name', 'last_name', 'username')
+
+_SESSION_PROJECTS = 'typeahead_projects'
+_SESSION_STUDENTS = 'typeahead_students'
+
+
+class PrefixIndex:
+    """Tableau trié de (terme, id de projet) interrogé par bisect.
+
+    Les termes sont les mots du titre, des technologies et du nom de l'étudiant,
+    sans accents. Les projets modifiés sont réindexés un par un au prochain appel;
+    la reconstruction complète (modifications des autres processus) tourne dans
+    un thread de fond et remplace l'index d'un coup, sans bloquer les requêtes.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._terms_by_project = {}
+        self._projects = {}
+        self._folded_titles = {}
+        self._pending_projects = set()
+        self._pending_students = set()
+        self._built = False
+        self._lock = threading.Lock()
+        self._app = None
+        self._pid = None
+        self._stop = threading.Event()
+
+    def init_app(self, app):
+        self._app = app
+
+    # ----- Construction -----
+
+    def _load(self, project_ids=None, student_ids=None):
+        """(projet, nom de l'étudiant) des projets publiés demandés (tous par défaut)"""
+        query = db.session.query(PFAProject.id, PFAProject.title, PFAProject.description,
+                                 PFAProject.technologies, PFAProject.domain,
+                                 User.first_name, User.last_name, User.username)\
+            .join(User, User.id == PFAProject.student_id)\
+            .filter(PFAProject.status == 'published')
+        if project_ids is not None or student_ids is not None:
+            query = query.filter(or_(PFAProject.id.in_(project_ids or []),
+                                     PFAProject.student_id.in_(student_ids or [])))
+        rows = []
+        for row in query:
+            student_name = f"{row.first_name} {row.last_name}" if row.first_name and row.last_name else row.username
+            rows.append((row, student_name))
+        return rows
+
+    def _entry(self, project, student_name):
+        description = project.description or ''
+        if len(description) > DESCRIPTION_LENGTH:
+            description = description[:DESCRIPTION_LENGTH] + '...'
+        return {
+            'id': project.id,
+            'title': project.title,
+            'description': description,
+            'domain': project.domain,
+            'student_name': student_name
+        }
+
+    def _terms(self, project, student_name):
+        terms = set(tokenize(project.title))
+        terms.update(tokenize(student_name))
+        for slug in parse_technologies(project.technologies):
+            terms.update(tokenize(slug))
+        return terms
+
+    def _remove(self, project_id):
+        for term in self._terms_by_project.pop(project_id, ()):
+            position = bisect.bisect_left(self._keys, (term, project_id))
+            if position < len(self._keys) and self._keys[position] == (term, project_id):
+                del self._keys[position]
+        self._projects.pop(project_id, None)
+        self._folded_titles.pop(project_id, None)
+
+    def _add(self, project, student_name):
+        terms = self._terms(project, student_name)
+        for term in terms:
+            bisect.insort(self._keys, (term, project.id))
+        self._terms_by_project[project.id] = terms
+        self._projects[project.id] = self._entry(project, student_name)
+        self._folded_titles[project.id] = ' '.join(tokenize(project.title))
+
+    def _build(self):
+        """Index complet construit hors verrou: (clés triées, termes, entrées, titres)"""
+        terms_by_project, projects, folded_titles, entries = {}, {}, {}, []
+        for project, student_name in self._load():
+            terms = self._terms(project, student_name)
+            entries.extend((term, project.id) for term in terms)
+            terms_by_project[project.id] = terms
+            projects[project.id] = self._entry(project, student_name)
+            folded_titles[project.id] = ' '.join(tokenize(project.title))
+        return sorted(entries), terms_by_project, projects, folded_titles
+
+    def _swap(self, built):
+        # Les projets marqués pendant la construction restent en attente: réappliqués au prochain appel
+        self._keys, self._terms_by_project, self._projects, self._folded_titles = built
+        self._built = True
+
+    def _refresh_pending(self):
+        project_ids = set(self._pending_projects)
+        student_ids = set(self._pending_students)
+        self._pending_projects.clear()
+        self._pending_students.clear()
+
+        # Les projets modifiés qui ne sont plus publiés (ou supprimés) ne reviennent pas
+        rows = self._load(project_ids, student_ids)
+        project_ids.update(project.id for project, _ in rows)
+        for project_id in project_ids:
+            self._remove(project_id)
+        for project, student_name in rows:
+            self._add(project, student_name)
+
+    def ensure_fresh(self):
+        """Construire l'index au premier appel du processus, puis appliquer les modifications en attente"""
+        self._ensure_started()
+        with self._lock:
+            if not self._built:
+                self._swap(self._build())
+            elif self._pending_projects or self._pending_students:
+                self._refresh_pending()
+
+    # ----- Reconstruction périodique en arrière-plan -----
+
+    def _ensure_started(self):
+        # Un thread par processus (les workers forkés ne l'héritent pas)
+        interval = current_app.config.get('TYPEAHEAD_REBUILD_INTERVAL', 300)
+        if self._pid == os.getpid() or interval <= 0:
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            app = self._app or current_app._get_current_object()
+            threading.Thread(target=self._run, args=(app, interval), name='typeahead-rebuild', daemon=True).start()
+
+    def _run(self, app, interval):
+        # La reconstruction rattrape les modifications faites par les autres processus
+        while not self._stop.wait(interval):
+            try:
+                with app.app_context():
+                    built = self._build()
+                    db.session.remove()
+                with self._lock:
+                    self._swap(built)
+            except Exception as e:
+                print(f"⚠️ Erreur reconstruction de l'index d'autocomplétion: {e}")
+
+    def stop(self):
+        self._stop.set()
+
+    def mark_stale(self, project_ids=(), student_ids=()):
+        with self._lock:
+            self._pending_projects.update(project_ids)
+            self._pending_students.update(student_ids)
+
+    # ----- Recherche -----
+
+    def _prefix_matches(self, prefix):
+        ids = set()
+        position = bisect.bisect_left(self._keys, (prefix,))
+        while position < len(self._keys) and self._keys[position][0].startswith(prefix):
+            ids.add(self._keys[position][1])
+            position += 1
+        return ids
+
+    def search(self, query, limit=8):
+        """Projets dont chaque mot saisi préfixe un terme indexé"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self._lock:
+            matches = None
+            for token in sorted(set(tokens), key=len, reverse=True):
+                ids = self._prefix_matches(token)
+                matches = ids if matches is None else matches & ids
+                if not matches:
+                    return []
+            # Titres commençant par la saisie en premier, puis ordre alphabétique
+            folded_query = ' '.join(tokens)
+            ranked = sorted(matches, key=lambda project_id: (
+                not self._folded_titles[project_id].startswith(folded_query),
+                self._folded_titles[project_id]
+            ))
+            return [dict(self._projects[project_id]) for project_id in ranked[:limit]]
+
+
+typeahead_index = PrefixIndex()
+
+
+# ----- Invalidation par événements du modèle -----
+
+def _remember(target, key, value):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(key, set()).add(value)
+
+
+def _changed(target, attributes):
+    state = inspect(target)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+@event.listens_for(PFAProject, 'after_insert')
+@event.listens_for(PFAProject, 'after_delete')
+def _project_changed(mapper, connection, target):
+    _remember(target, _SESSION_PROJECTS, target.id)
+
+
+@event.listens_for(PFAProject, 'after_update')
+def _project_updated(mapper, connection, target):
+    if _changed(target, PROJECT_ATTRIBUTES):
+        _remember(target, _SESSION_PROJECTS, target.id)
+
+
+@event.listens_for(User, 'after_update')
+def _student_updated(mapper, connection, target):
+    if _changed(target, USER_ATTRIBUTES):
+        _remember(target, _SESSION_STUDENTS, target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _refresh_after_commit(session):
+    project_ids = session.info.pop(_SESSION_PROJECTS, None)
+    student_ids = session.info.pop(_SESSION_STUDENTS, None)
+    if project_ids or student_ids:
+        typeahead_index.mark_stale(project_ids or (), student_ids or ())
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop(_SESSION_PROJECTS, None)
+    session.info.pop(_SESSION_STUDENTS, None)